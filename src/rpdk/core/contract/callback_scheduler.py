@@ -0,0 +1,53 @@
+import logging
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class CallbackScheduler:
+    """Waits between IN_PROGRESS re-invocations of a handler.
+
+    By default, the ``callbackDelaySeconds`` requested by the handler are slept
+    in full. If ``max_delay`` is set, the scheduler fast-forwards instead: at most
+    ``max_delay`` seconds are actually slept (``0`` skips the wait entirely), and
+    the remainder is added to a virtual clock. Durations of whole operations
+    should use :meth:`time`, so they are the same as in a real run. Handler
+    timeouts apply to single invocations, which the clock does not change.
+
+    >>> scheduler = CallbackScheduler(max_delay=0)
+    >>> scheduler.sleep(30)
+    >>> scheduler.sleep(5)
+    >>> scheduler.requested_delays
+    [30, 5]
+    >>> scheduler.skipped_seconds
+    35
+    """
+
+    def __init__(self, max_delay=None):
+        if max_delay is not None and max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self.max_delay = max_delay
+        self.requested_delays = []
+        self.skipped_seconds = 0
+
+    @property
+    def fast_forward(self):
+        return self.max_delay is not None
+
+    def time(self):
+        """The current time on the virtual clock (wall time plus skipped delays)."""
+        return time.time() + self.skipped_seconds
+
+    def sleep(self, delay):
+        self.requested_delays.append(delay)
+        if not self.fast_forward or delay <= self.max_delay:
+            time.sleep(delay)
+            return
+
+        LOG.debug(
+            "Fast-forwarding callback delay of %ss (sleeping %ss)",
+            delay,
+            self.max_delay,
+        )
+        time.sleep(self.max_delay)
+        self.skipped_seconds += delay - self.max_delay
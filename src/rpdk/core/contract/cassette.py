@@ -0,0 +1,150 @@
+"""Record and replay handler invocations.
+
+A cassette is a directory holding one JSON file per distinct (normalized)
+request, with the responses the handler returned for it in invocation order,
+and a ``cassette.json`` file with the metadata needed to rebuild requests
+(e.g. the account ID) without any AWS calls.
+"""
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+
+from ..exceptions import CassetteError
+
+LOG = logging.getLogger(__name__)
+
+METADATA_FILE = "cassette.json"
+REDACTED = "<redacted>"
+# credentials are never written to disk
+CREDENTIAL_KEYS = ("callerCredentials", "providerCredentials")
+# per-invocation tokens, which would make every request unique
+TOKEN_KEYS = (
+    "bearerToken",
+    "clientRequestToken",
+    "stackId",
+    "logicalResourceId",
+    "targetLogicalId",
+)
+
+
+def normalize_request(payload):
+    """Redact credentials and invocation tokens from a handler request.
+
+    >>> normalize_request({
+    ...     "bearerToken": "4f7a",
+    ...     "requestData": {"callerCredentials": {"accessKeyId": "AKIA"}, "a": 1},
+    ... })
+    {'bearerToken': '<redacted>', 'requestData': {'callerCredentials': '<redacted>', 'a': 1}}
+    """
+    if isinstance(payload, dict):
+        return {
+            key: REDACTED
+            if key in CREDENTIAL_KEYS + TOKEN_KEYS and value is not None
+            else normalize_request(value)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [normalize_request(item) for item in payload]
+    return payload
+
+
+def request_key(payload):
+    """A stable key for a handler request, independent of credentials, tokens
+    and key order.
+
+    >>> request_key({"a": 1, "bearerToken": "x"}) == request_key(
+    ...     {"bearerToken": "y", "a": 1}
+    ... )
+    True
+    """
+    encoded = json.dumps(
+        normalize_request(payload), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class Cassette:
+    RECORD = "record"
+    REPLAY = "replay"
+
+    def __init__(self, directory, mode):
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.metadata = {}
+        self._interactions = {}
+        self._replayed = defaultdict(int)
+        if self.replaying:
+            self._load()
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def replaying(self):
+        return self.mode == self.REPLAY
+
+    @property
+    def account(self):
+        return self.metadata.get("account")
+
+    @account.setter
+    def account(self, value):
+        self.metadata["account"] = value
+        self._write(self.directory / METADATA_FILE, self.metadata)
+
+    def _load(self):
+        try:
+            with (self.directory / METADATA_FILE).open("r", encoding="utf-8") as f:
+                self.metadata = json.load(f)
+        except FileNotFoundError as e:
+            raise CassetteError(
+                f"'{self.directory}' is not a cassette. Record one with --record"
+            ) from e
+
+        for path in self.directory.glob("*.json"):
+            if path.name == METADATA_FILE:
+                continue
+            with path.open("r", encoding="utf-8") as f:
+                self._interactions[path.stem] = json.load(f)
+        LOG.debug(
+            "Loaded %d recorded requests from '%s'",
+            len(self._interactions),
+            self.directory,
+        )
+
+    @staticmethod
+    def _write(path, document):
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    def record(self, payload, response):
+        key = request_key(payload)
+        interaction = self._interactions.setdefault(
+            key, {"request": normalize_request(payload), "responses": []}
+        )
+        interaction["responses"].append(response)
+        self._write(self.directory / f"{key}.json", interaction)
+
+    def replay(self, payload):
+        key = request_key(payload)
+        try:
+            responses = self._interactions[key]["responses"]
+        except KeyError:
+            LOG.debug(
+                "No recorded request matches\n%s",
+                json.dumps(normalize_request(payload), indent=2),
+            )
+            raise CassetteError(
+                f"No recorded response for request '{key}' in '{self.directory}'. "
+                "Re-record the cassette if the requests have changed"
+            ) from None
+
+        index = self._replayed[key]
+        # a request repeated more often than recorded gets the last response again
+        response = responses[min(index, len(responses) - 1)]
+        self._replayed[key] = index + 1
+        return json.loads(json.dumps(response))
@@ -12,6 +12,21 @@ class ContractPlugin:
 
         self._plugin_clients = plugin_clients
 
+    def pytest_report_header(self):
+        seeds = sorted({client.seed for client in self._plugin_clients.values()})
+        return [
+            f"example seed: {seed} (reproduce with --seed {seed})" for seed in seeds
+        ]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for client in self._plugin_clients.values():
+            coverage = getattr(client, "coverage", None)
+            if coverage:
+                terminalreporter.write_line(coverage.summary())
+            generation_stats = getattr(client, "generation_stats", None)
+            if generation_stats:
+                terminalreporter.write_line(generation_stats.table())
+
     @pytest.fixture(scope="module")
     def resource_client(self):
         try:
@@ -0,0 +1,104 @@
+"""Keep the models that handlers accepted, to try them again in later runs.
+
+Randomly generated models are often rejected by the real service, which makes
+for slow, failed handler calls. The corpus stores every create and update model
+a handler succeeded with, along with how long the handler took, in one JSON
+file per schema (so a schema change starts a new corpus). Later runs replay
+the stored models, fastest first, and then mutations of them, before
+generating new ones.
+
+Clients store the values of properties that may be secrets (e.g. write-only
+or overridden properties) as ``<redacted>``, and draw new ones on replay.
+"""
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+
+from ..jsonutils.utils import schema_hash
+from .interface import Action
+
+LOG = logging.getLogger(__name__)
+
+CORPUS_DIRECTORY = ".rpdk-corpus"
+ACTIONS = (Action.CREATE, Action.UPDATE)
+# per action, so the file and the number of replays per run stay small
+MAX_ENTRIES = 20
+
+
+class ExampleCorpus:
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.entries = {action: [] for action in ACTIONS}
+        # models replayed this run, by action
+        self._replayed = {action: set() for action in ACTIONS}
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            LOG.debug("No example corpus at '%s', starting a new one", self.path)
+        except json.JSONDecodeError as e:
+            LOG.warning("Ignoring invalid example corpus '%s': %s", self.path, e)
+        else:
+            for action in ACTIONS:
+                self.entries[action] = stored.get(action.value, [])
+
+    @classmethod
+    def for_schema(cls, root, schema):
+        """The corpus of a project for the current version of its schema."""
+        return cls(Path(root) / CORPUS_DIRECTORY / f"{schema_hash(schema)}.json")
+
+    def replay(self, action):
+        """A stored model that was not replayed yet for the action, or ``None``
+        when all were."""
+        replayed = self._replayed[action]
+        for entry in self.entries[action]:
+            key = schema_hash(entry["model"])
+            if key not in replayed:
+                replayed.add(key)
+                LOG.debug("Replaying %s model from the example corpus", action)
+                return copy.deepcopy(entry["model"])
+        return None
+
+    def sample(self, action, random):
+        """A random stored model for the action, or ``None`` if there are none."""
+        entries = self.entries[action]
+        if not entries:
+            return None
+        return copy.deepcopy(random.choice(entries)["model"])
+
+    def record(self, action, model, status, duration):
+        """Store a model the handler succeeded with, and save the corpus."""
+        key = schema_hash(model)
+        entries = [
+            entry
+            for entry in self.entries[action]
+            if schema_hash(entry["model"]) != key
+        ]
+        entries.append(
+            {
+                "model": copy.deepcopy(model),
+                "status": status.value,
+                "duration": round(duration, 3),
+            }
+        )
+        entries.sort(key=lambda entry: entry["duration"])
+        self.entries[action] = entries[: self.max_entries]
+        # the models replayed this run are kept, since they were just used
+        self._replayed[action].add(key)
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".partial")
+        with partial.open("w", encoding="utf-8") as f:
+            json.dump(
+                {action.value: entries for action, entries in self.entries.items()},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        # so an interrupted run never leaves a truncated corpus behind
+        os.replace(partial, self.path)
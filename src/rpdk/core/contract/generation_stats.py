@@ -0,0 +1,111 @@
+"""Measure how expensive each part of a schema is to generate examples for.
+
+When enabled, the strategy compiled for each property and array item is
+wrapped to count draws, draws that were abandoned (rejected by a filter or too
+large to finish), the time spent, and the size of the values drawn. Paths are
+locations in the schema, such as ``/definitions/Rule/properties/Status``, so a
+definition that is used in several places is reported once.
+"""
+import json
+from time import perf_counter
+
+from ..jsonutils.pointer import fragment_encode
+
+DEFAULT_TOP = 10
+
+
+class PathStats:
+    def __init__(self):
+        self.draws = 0
+        self.rejections = 0
+        # excluding time spent drawing nested properties, which have their own
+        self.time = 0.0
+        self.size = 0
+
+    @property
+    def rejection_rate(self):
+        if not self.draws:
+            return 0.0
+        return self.rejections / self.draws
+
+    @property
+    def average_size(self):
+        accepted = self.draws - self.rejections
+        if not accepted:
+            return 0.0
+        return self.size / accepted
+
+
+class GenerationStats:
+    def __init__(self):
+        self.paths = {}
+        # time spent in nested draws, for each draw in progress
+        self._nested_time = []
+
+    def __getitem__(self, path):
+        try:
+            return self.paths[path]
+        except KeyError:
+            stats = self.paths[path] = PathStats()
+            return stats
+
+    def measure(self, path, draw):
+        """Call ``draw`` and record it against the path.
+
+        >>> stats = GenerationStats()
+        >>> stats.measure(("properties", "Name"), lambda: "abc")
+        'abc'
+        >>> stats[("properties", "Name")].draws
+        1
+        """
+        stats = self[path]
+        stats.draws += 1
+        self._nested_time.append(0.0)
+        start = perf_counter()
+        try:
+            value = draw()
+        except BaseException:
+            stats.rejections += 1
+            raise
+        else:
+            stats.size += len(json.dumps(value, default=str))
+            return value
+        finally:
+            elapsed = perf_counter() - start
+            stats.time += elapsed - self._nested_time.pop()
+            if self._nested_time:
+                self._nested_time[-1] += elapsed
+
+    def ranked(self):
+        """Paths and their stats, most expensive first."""
+        return sorted(self.paths.items(), key=lambda item: item[1].time, reverse=True)
+
+    def table(self, top=DEFAULT_TOP):
+        """A table of the ``top`` most expensive paths.
+
+        >>> stats = GenerationStats()
+        >>> stats.measure(("properties", "Name"), lambda: "abc")
+        'abc'
+        >>> print(stats.table())  # doctest: +ELLIPSIS
+        generation cost by schema path (top 10 of 1)
+        path              draws  rejected  time (ms)  avg size
+        /properties/Name      1      0.0%        ...       5.0
+        """
+        rows = [
+            (
+                fragment_encode(path, prefix=""),
+                str(stats.draws),
+                f"{stats.rejection_rate:.1%}",
+                f"{stats.time * 1000:.1f}",
+                f"{stats.average_size:.1f}",
+            )
+            for path, stats in self.ranked()[:top]
+        ]
+        header = ("path", "draws", "rejected", "time (ms)", "avg size")
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(5)]
+        lines = [f"generation cost by schema path (top {top} of {len(self.paths)})"]
+        for row in [header] + rows:
+            cells = [row[0].ljust(widths[0])]
+            cells.extend(cell.rjust(width) for cell, width in zip(row[1:], widths[1:]))
+            lines.append("  ".join(cells).rstrip())
+        return "\n".join(lines)
@@ -2,16 +2,16 @@
 # pylint: disable=R0904
 # have to skip B404, import_subprocess is required for executing typescript
 # have to skip B60*, to allow typescript code to be executed using subprocess
+import copy
 import fnmatch
 import json
 import logging
+import random
 import re
 import time
 from uuid import uuid4
 
 import docker
-from botocore import UNSIGNED
-from botocore.config import Config
 from jinja2 import Environment, PackageLoader, select_autoescape
 
 from rpdk.core.boto_helpers import (
@@ -20,12 +20,16 @@ from rpdk.core.boto_helpers import (
     get_account,
     get_temporary_credentials,
 )
+from rpdk.core.contract.callback_scheduler import CallbackScheduler
+from rpdk.core.contract.cassette import REDACTED
 from rpdk.core.contract.interface import (
     HandlerErrorCode,
     HookInvocationPoint,
     HookStatus,
 )
-from rpdk.core.contract.resource_client import override_properties, prune_properties
+from rpdk.core.contract.lambda_http_client import LambdaHttpClient
+from rpdk.core.contract.resource_client import override_properties
+from rpdk.core.contract.target_sampling import sample_targets
 from rpdk.core.contract.type_configuration import TypeConfiguration
 from rpdk.core.exceptions import InvalidProjectError
 from rpdk.core.utils.handler_utils import generate_handler_name
@@ -62,38 +66,37 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
         executable_entrypoint=None,
         target_info=None,
         profile=None,
+        max_callback_delay=None,
+        cassette=None,
+        local_handler=None,
+        seed=None,
+        generation_stats=None,
+        target_example_cache=None,
+        target_sample=None,
     ):  # pylint: disable=too-many-arguments,too-many-locals
         self._schema = schema
-        self._session = create_sdk_session(region, profile)
         self._role_arn = role_arn
         self._type_name = type_name
         self._log_group_name = log_group_name
         self._log_role_arn = log_role_arn
         self.region = region
         self._headers = headers
-        self.account = get_account(
-            self._session,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, role_arn, headers
-            ),
-        )
         self._function_name = function_name
-        if endpoint.startswith("http://"):
-            self._client = self._session.client(
-                "lambda",
-                endpoint_url=endpoint,
-                use_ssl=False,
-                verify=False,
-                config=Config(
-                    signature_version=UNSIGNED,
-                    # needs to be long if docker is running on a slow machine
-                    read_timeout=5 * 60,
-                    retries={"max_attempts": 0},
-                    region_name=self._session.region_name,
-                ),
-            )
+        self._cassette = cassette
+        self._local_handler = local_handler
+        if cassette and cassette.replaying:
+            # replayed handler calls never reach AWS
+            self._session = None
+            self._client = None
+            self.account = cassette.account
         else:
-            self._client = self._session.client("lambda", endpoint_url=endpoint)
+            self._session = create_sdk_session(region, profile)
+            self.account = get_account(
+                self._session, self._get_temporary_credentials(role_arn)
+            )
+            self._client = self._create_lambda_client(endpoint)
+            if cassette:
+                cassette.account = self.account
 
         self._schema = None
         self._configuration_schema = None
@@ -102,11 +105,32 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
         self._inputs = inputs
         self._timeout_in_seconds = int(timeout_in_seconds)
         self._docker_image = docker_image
-        self._docker_client = docker.from_env() if self._docker_image else None
+        self._docker_client = (
+            docker.from_env() if self._docker_image and self._session else None
+        )
         self._executable_entrypoint = executable_entrypoint
         self._target_info = self._setup_target_info(target_info)
         self._resolved_targets = {}
         self._typeconfig = typeconfig
+        self._callback_scheduler = CallbackScheduler(max_callback_delay)
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self._example_random = random.Random(self.seed)
+        self.generation_stats = generation_stats
+        self._target_example_cache = target_example_cache
+        self._target_sample = target_sample
+
+    def _create_lambda_client(self, endpoint):
+        if endpoint.startswith("http://"):
+            # needs to be long if docker is running on a slow machine
+            return LambdaHttpClient(endpoint, read_timeout=5 * 60)
+        return self._session.client("lambda", endpoint_url=endpoint)
+
+    def _get_temporary_credentials(self, role_arn):
+        if self._session is None:
+            return dict.fromkeys(LOWER_CAMEL_CRED_KEYS, REDACTED)
+        return get_temporary_credentials(
+            self._session, LOWER_CAMEL_CRED_KEYS, role_arn, self._headers
+        )
 
     @staticmethod
     def _properties_to_paths(schema, key):
@@ -121,14 +145,11 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
         for target, info in target_info.items():
             LOG.debug("Setting up target info for '%s'", target)
 
-            # make a copy so the original schema is never modified
-            target_schema = json.loads(json.dumps(info["Schema"]))
-
             info["readOnlyProperties"] = HookClient._properties_to_paths(
-                target_schema, "readOnlyProperties"
+                info["Schema"], "readOnlyProperties"
             )
             info["createOnlyProperties"] = HookClient._properties_to_paths(
-                target_schema, "createOnlyProperties"
+                info["Schema"], "createOnlyProperties"
             )
 
         return target_info
@@ -156,8 +177,8 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
         for target_name in handler.get("targetNames", []):
             if self._contains_wildcard(target_name):
                 if target_name not in self._resolved_targets:
-                    self._resolved_targets[target_name] = fnmatch.filter(
-                        self._target_info.keys(), target_name
+                    self._resolved_targets[target_name] = self._resolve_wildcard(
+                        target_name
                     )
                 targets.update(self._resolved_targets[target_name])
             else:
@@ -165,6 +186,27 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
 
         return sorted(targets)
 
+    def _resolve_wildcard(self, target_name):
+        targets = fnmatch.filter(self._target_info.keys(), target_name)
+        if not self._target_sample:
+            return targets
+
+        # seeded per target name, so the sample does not depend on the order
+        # target names are resolved in
+        sample = sample_targets(
+            targets,
+            self._target_info,
+            self._target_sample,
+            random.Random(f"{self.seed}:{target_name}"),
+        )
+        LOG.info(
+            "Testing a sample of %d of the %d targets matching '%s'",
+            len(sample),
+            len(targets),
+            target_name,
+        )
+        return sample
+
     @staticmethod
     def _contains_wildcard(pattern):
         return pattern and ("*" in pattern or "?" in pattern)
@@ -255,26 +297,64 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
             )
         return request_body
 
+    def generate_example(self, strategy):
+        """Draw an example from a strategy. For the same seed and sequence of
+        draws, the examples are the same."""
+        # imported here to avoid hypothesis being loaded before pytest is loaded
+        from .resource_generator import generate_examples
+
+        return generate_examples(strategy, 1, self._example_random.getrandbits(32))[0]
+
+    def prepare_target_examples(self, targets):
+        """Generate examples for all of the targets at once, in parallel and
+        cached on disk, instead of one at a time when requests are made."""
+        if self._inputs or self.generation_stats or not self._target_info:
+            # generation is only measured in this process
+            return
+
+        # imported here to avoid hypothesis being loaded before pytest is loaded
+        from .target_examples import prepare_target_examples
+
+        jobs = {}
+        # seeds are drawn in a fixed order, so they do not depend on the order
+        # (e.g. of a set) the targets are given in
+        for target in sorted(targets):
+            info = self._target_info.get(target)
+            if info and "Examples" not in info:
+                jobs[target] = (
+                    info["Schema"],
+                    info["readOnlyProperties"],
+                    info["createOnlyProperties"],
+                    self._example_random.getrandbits(32),
+                )
+        if not jobs:
+            return
+        examples = prepare_target_examples(jobs, self._target_example_cache)
+        for target, target_examples in examples.items():
+            self._target_info[target]["Examples"] = target_examples
+
+    def _prepared_example(self, info, kind):
+        return copy.deepcopy(self._example_random.choice(info["Examples"][kind]))
+
     def _generate_target_example(self, target):
         LOG.debug("Generating example for target '%s'", target)
         if not self._target_info or not self._target_info.get(target):
             return {}
 
         info = self._target_info.get(target)
+        if "Examples" in info:
+            return self._prepared_example(info, "create")
         if not info.get("SchemaStrategy"):  # pragma: no cover
             # imported here to avoid hypothesis being loaded before pytest is loaded
-            from .resource_generator import ResourceGenerator
+            from .resource_generator import get_schema_strategy
 
-            # make a copy so the original schema is never modified
-            target_schema = json.loads(json.dumps(info["Schema"]))
-
-            prune_properties(target_schema, info["readOnlyProperties"])
-
-            info["SchemaStrategy"] = ResourceGenerator(
-                target_schema
-            ).generate_schema_strategy(target_schema)
+            info["SchemaStrategy"] = get_schema_strategy(
+                info["Schema"],
+                info["readOnlyProperties"],
+                stats=self.generation_stats,
+            )
 
-        return info.get("SchemaStrategy").example()
+        return self.generate_example(info.get("SchemaStrategy"))
 
     def _generate_target_update_example(self, target, model):
         LOG.debug("Generating update example for target '%s'", target)
@@ -282,21 +362,20 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
             return {}
 
         info = self._target_info.get(target)
+        if "Examples" in info:
+            return {**model, **self._prepared_example(info, "update")}
         if not info.get("UpdateSchemaStrategy"):  # pragma: no cover
             # imported here to avoid hypothesis being loaded before pytest is loaded
-            from .resource_generator import ResourceGenerator
+            from .resource_generator import get_schema_strategy
 
-            # make a copy so the original schema is never modified
-            target_schema = json.loads(json.dumps(info["Schema"]))
-
-            prune_properties(target_schema, info["readOnlyProperties"])
-            prune_properties(target_schema, info["createOnlyProperties"])
-
-            info["UpdateSchemaStrategy"] = ResourceGenerator(
-                target_schema
-            ).generate_schema_strategy(target_schema)
+            info["UpdateSchemaStrategy"] = get_schema_strategy(
+                info["Schema"],
+                info["readOnlyProperties"],
+                info["createOnlyProperties"],
+                stats=self.generation_stats,
+            )
 
-        example = info.get("UpdateSchemaStrategy").example()
+        example = self.generate_example(info.get("UpdateSchemaStrategy"))
         return {**model, **example}
 
     def _generate_target_model(self, target, invocation_point):
@@ -355,19 +434,30 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
         return invocation_point, target, target_model
 
     def generate_request_examples(self, invocation_point):
+        targets = self.get_handler_targets(invocation_point)
+        self.prepare_target_examples(targets)
         return [
             self.generate_request_example(target, invocation_point)
-            for target in self.get_handler_targets(invocation_point)
+            for target in targets
         ]
 
     def generate_invalid_request_examples(self, invocation_point):
+        targets = self.get_handler_targets(invocation_point)
+        self.prepare_target_examples(targets)
         return [
             self.generate_invalid_request_example(target, invocation_point)
-            for target in self.get_handler_targets(invocation_point)
+            for target in targets
         ]
 
     def generate_all_request_examples(self):
         examples = {}
+        self.prepare_target_examples(
+            {
+                target
+                for invoke_point in HookInvocationPoint
+                for target in self.get_handler_targets(invoke_point)
+            }
+        )
         for invoke_point in HookInvocationPoint:
             examples[invoke_point] = self.generate_request_examples(invoke_point)
         return examples
@@ -399,13 +489,9 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
             self.get_hook_type_name(),
             self.account,
             invocation_point,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, self._role_arn, self._headers
-            ),
+            self._get_temporary_credentials(self._role_arn),
             self._log_group_name,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, self._log_role_arn, self._headers
-            ),
+            self._get_temporary_credentials(self._log_role_arn),
             self.generate_token(),
             target_model,
             type_configuration=type_configuration,
@@ -429,6 +515,18 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
             "Sending request\n%s",
             json.dumps(payload_to_log, ensure_ascii=False, indent=2),
         )
+        if self._cassette and self._cassette.replaying:
+            response = self._cassette.replay(payload)
+        else:
+            response = self._invoke_handler(payload)
+            if self._cassette:
+                self._cassette.record(payload, response)
+        LOG.debug("Received response\n%s", json.dumps(response, indent=2))
+        return response
+
+    def _invoke_handler(self, payload):
+        if self._local_handler:
+            return self._local_handler.invoke(payload)
         payload = json.dumps(payload, ensure_ascii=False, indent=2)
         if self._docker_image:
             if not self._executable_entrypoint:
@@ -463,7 +561,6 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
                     "Handler Output is not a valid JSON document"
                 ) from json_error
 
-        LOG.debug("Received response\n%s", json.dumps(payload, indent=2))
         return payload
 
     # pylint: disable=R0913
@@ -509,7 +606,7 @@ class HookClient:  # pylint: disable=too-many-instance-attributes
 
         while status == HookStatus.IN_PROGRESS:
             callback_delay_seconds = self.assert_in_progress(status, response, target)
-            time.sleep(callback_delay_seconds)
+            self._callback_scheduler.sleep(callback_delay_seconds)
 
             request["requestContext"]["callbackContext"] = response.get(
                 "callbackContext"
@@ -0,0 +1,117 @@
+"""A minimal Lambda Invoke API client for local, unsigned ``http://`` endpoints,
+such as ``sam local start-lambda`` or ``cfn serve``.
+
+The payload is posted as-is over a pool of keep-alive connections, skipping
+botocore's request pipeline (serialization, event hooks, signing, response
+parsing), which dominates the cost of an invocation against a local endpoint.
+The ``invoke`` method mirrors the subset of the boto3 Lambda client used by the
+contract test clients.
+"""
+import io
+import json
+import logging
+import queue
+import select
+from http.client import HTTPConnection
+from urllib.parse import quote, urlsplit
+
+from botocore.exceptions import ClientError
+
+LOG = logging.getLogger(__name__)
+
+# same as botocore's default max_pool_connections
+DEFAULT_MAX_CONNECTIONS = 10
+INVOKE_PATH = "/2015-03-31/functions/{}/invocations"
+
+
+def _is_dropped(connection):
+    """A pooled connection is unusable if the server has closed it while idle
+    (the socket is readable, i.e. at EOF, without a pending request)."""
+    if connection.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class LambdaHttpClient:
+    def __init__(self, endpoint, read_timeout, max_connections=None):
+        url = urlsplit(endpoint)
+        if url.scheme != "http":
+            raise ValueError(f"Only http:// endpoints are supported, got '{endpoint}'")
+        self._host = url.hostname
+        self._port = url.port
+        self._base_path = url.path.rstrip("/")
+        self._read_timeout = read_timeout
+        self._connections = queue.LifoQueue(
+            maxsize=max_connections or DEFAULT_MAX_CONNECTIONS
+        )
+
+    def _get_connection(self):
+        try:
+            connection = self._connections.get_nowait()
+        except queue.Empty:
+            return HTTPConnection(self._host, self._port, timeout=self._read_timeout)
+        if _is_dropped(connection):
+            connection.close()
+        return connection
+
+    def _put_connection(self, connection):
+        try:
+            self._connections.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def invoke(self, FunctionName, Payload):  # pylint: disable=invalid-name
+        path = self._base_path + INVOKE_PATH.format(quote(FunctionName, safe=""))
+        connection = self._get_connection()
+        try:
+            connection.request(
+                "POST",
+                path,
+                body=Payload,
+                headers={"Content-Type": "application/json"},
+            )
+            response = connection.getresponse()
+            body = response.read()
+        except Exception:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._put_connection(connection)
+
+        if response.status >= 300:
+            raise self._client_error(response, body)
+        result = {"StatusCode": response.status, "Payload": io.BytesIO(body)}
+        function_error = response.getheader("X-Amz-Function-Error")
+        if function_error:
+            result["FunctionError"] = function_error
+        return result
+
+    @staticmethod
+    def _client_error(response, body):
+        # e.g. "ResourceNotFoundException:http://internal.amazon.com/coral/..."
+        code = (response.getheader("x-amzn-ErrorType") or "").split(":", 1)[0]
+        try:
+            document = json.loads(body)
+            message = document.get("message") or document.get("Message", "")
+        except (ValueError, AttributeError):
+            message = body.decode("utf-8", errors="replace")
+        return ClientError(
+            {
+                "Error": {"Code": code or str(response.status), "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": response.status},
+            },
+            "Invoke",
+        )
+
+    def close(self):
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
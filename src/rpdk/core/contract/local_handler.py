@@ -0,0 +1,164 @@
+"""Run the handler of a Python-based provider locally, without Lambda or Docker.
+
+The handler entrypoint from ``.rpdk-config`` (e.g. ``my_type.handlers.resource``)
+is imported from the project sources and called with the request dictionary,
+either in the current process or in worker subprocesses.
+"""
+import copy
+import importlib
+import logging
+import multiprocessing
+import queue
+import sys
+from uuid import uuid4
+
+from ..exceptions import InvalidProjectError
+
+LOG = logging.getLogger(__name__)
+
+TRANSPORT_LAMBDA = "lambda"
+TRANSPORT_IN_PROCESS = "in-process"
+TRANSPORT_SUBPROCESS = "subprocess"
+TRANSPORTS = (TRANSPORT_LAMBDA, TRANSPORT_IN_PROCESS, TRANSPORT_SUBPROCESS)
+
+# remaining time reported to the handler, same as the maximum Lambda timeout
+REMAINING_TIME_IN_MILLIS = 15 * 60 * 1000
+
+# the handler loaded in a worker subprocess
+_worker_handler = None
+
+
+class LocalContext:
+    """A minimal stand-in for the Lambda context object."""
+
+    def __init__(self, function_name):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = function_name
+        self.memory_limit_in_mb = 256
+        self.aws_request_id = str(uuid4())
+
+    @staticmethod
+    def get_remaining_time_in_millis():
+        return REMAINING_TIME_IN_MILLIS
+
+
+def load_handler(entrypoint, search_paths=()):
+    """Import the handler named by a dotted entrypoint.
+
+    >>> load_handler("json.dumps")([1])
+    '[1]'
+    """
+    module_name, _, attribute = entrypoint.rpartition(".")
+    if not module_name:
+        raise InvalidProjectError(
+            f"Entrypoint '{entrypoint}' is not of the form 'module.handler'"
+        )
+    for path in reversed([str(path) for path in search_paths]):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    try:
+        return getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise InvalidProjectError(
+            f"Could not load handler entrypoint '{entrypoint}'. "
+            "Have you run cfn generate?"
+        ) from e
+
+
+def _init_worker(entrypoint, search_paths):
+    global _worker_handler  # pylint: disable=global-statement
+    _worker_handler = load_handler(entrypoint, search_paths)
+
+
+def _invoke_worker(payload, function_name):
+    return _worker_handler(payload, LocalContext(function_name))
+
+
+class InProcessHandler:
+    """Calls the handler directly in this process."""
+
+    def __init__(self, entrypoint, search_paths=(), function_name="TypeFunction"):
+        self._handler = load_handler(entrypoint, search_paths)
+        self._function_name = function_name
+
+    def invoke(self, payload):
+        # the handler owns its request, as it would after deserializing it
+        return self._handler(copy.deepcopy(payload), LocalContext(self._function_name))
+
+    def close(self):
+        pass
+
+
+class SubprocessHandler:
+    """Calls the handler in a pool of worker subprocesses, which import the
+    handler once and are reused across invocations. This keeps module state and
+    crashes of the handler out of the test process. A worker that times out is
+    replaced, since it is still running the handler.
+    """
+
+    def __init__(
+        self,
+        entrypoint,
+        search_paths=(),
+        function_name="TypeFunction",
+        processes=1,
+        timeout=None,
+    ):  # pylint: disable=too-many-arguments
+        self._function_name = function_name
+        self._timeout = timeout
+        self._initargs = (entrypoint, [str(path) for path in search_paths])
+        # a pool of one process per worker, so a hung worker can be replaced
+        # without interrupting the invocations of the others
+        self._workers = queue.Queue()
+        for _ in range(processes):
+            self._workers.put(self._start_worker())
+
+    def _start_worker(self):
+        # spawn, so workers don't inherit the state (e.g. locks, mocks) of this process
+        return multiprocessing.get_context("spawn").Pool(
+            1, initializer=_init_worker, initargs=self._initargs
+        )
+
+    def invoke(self, payload):
+        worker = self._workers.get()
+        try:
+            result = worker.apply_async(_invoke_worker, (payload, self._function_name))
+            try:
+                return result.get(self._timeout)
+            except multiprocessing.TimeoutError as e:
+                # the handler is still running, replace the worker
+                worker.terminate()
+                worker.join()
+                worker = self._start_worker()
+                raise TimeoutError(
+                    f"Handler did not respond within {self._timeout} seconds"
+                ) from e
+        finally:
+            self._workers.put(worker)
+
+    def close(self):
+        while not self._workers.empty():
+            worker = self._workers.get()
+            worker.terminate()
+            worker.join()
+
+
+def create_local_handler(transport, project, function_name, **kwargs):
+    """Create the local handler for a transport, or ``None`` if the handler is
+    invoked through Lambda (or Docker)."""
+    if transport == TRANSPORT_LAMBDA:
+        return None
+    if not (project.runtime or "").startswith("python"):
+        raise InvalidProjectError(
+            f"The '{transport}' transport only supports Python handlers, "
+            f"but the project runtime is '{project.runtime}'"
+        )
+    if not project.entrypoint:
+        raise InvalidProjectError("entrypoint not set in .rpdk-config")
+
+    search_paths = (project.root / "src", project.root)
+    LOG.debug("Loading handler '%s' for %s execution", project.entrypoint, transport)
+    if transport == TRANSPORT_IN_PROCESS:
+        return InProcessHandler(project.entrypoint, search_paths, function_name)
+    return SubprocessHandler(project.entrypoint, search_paths, function_name, **kwargs)
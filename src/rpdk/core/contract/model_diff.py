@@ -0,0 +1,141 @@
+"""Find how the model returned by a handler differs from the request model.
+
+All properties of the request model must be in the returned model, with the
+same values. Arrays are compared in order, unless their schema sets
+``insertionOrder`` to false, in which case they are compared as multisets.
+Values are compared, and unordered arrays matched, the same way as
+:mod:`~rpdk.core.jsonutils.diff` does to patch models, so the two never
+disagree on whether properties changed.
+
+Nothing is built while the models match. Each difference is recorded with the
+JSON pointer of the property, and the message is rendered once, from all of
+them, when there are any.
+"""
+import json
+from collections import namedtuple
+
+from ..jsonutils.diff import json_equal, multiset_difference
+from ..jsonutils.pointer import fragment_encode
+
+MISSING = "missing"
+MISMATCH = "mismatch"
+LENGTH = "length"
+UNORDERED = "unordered"
+
+MESSAGE = (
+    "All properties specified in the request MUST be present in the model"
+    " returned, and they MUST match exactly, with the exception of properties"
+    " defined as writeOnlyProperties in the resource schema"
+)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class Difference(namedtuple("Difference", ("kind", "path", "expected", "actual"))):
+    """A difference at ``path`` in the returned model. For unordered arrays,
+    ``expected`` are the members that are missing, and ``actual`` the ones
+    that were not in the request."""
+
+    __slots__ = ()
+
+    @property
+    def pointer(self):
+        return fragment_encode(self.path, prefix="")
+
+    def render(self):
+        """
+        >>> Difference(MISMATCH, ("Tags", 0, "Key"), "a", "b").render()
+        'Value for property /Tags/0/Key in Request Model ("a") and Response Model ("b") does not match'
+        """  # noqa: B950
+        if self.kind == MISSING:
+            return (
+                f"Property {self.pointer} in Request Model ({_dumps(self.expected)})"
+                " is missing from Response Model"
+            )
+        if self.kind == LENGTH:
+            return (
+                f"Property {self.pointer} has {self.expected} members in Request"
+                f" Model, but {self.actual} in Response Model"
+            )
+        if self.kind == UNORDERED:
+            return (
+                f"Members of property {self.pointer} do not match, missing from"
+                f" Response Model: {_dumps(self.expected)}, not in Request Model:"
+                f" {_dumps(self.actual)}"
+            )
+        return (
+            f"Value for property {self.pointer} in Request Model"
+            f" ({_dumps(self.expected)}) and Response Model ({_dumps(self.actual)})"
+            " does not match"
+        )
+
+
+def _unordered_differences(inputs, outputs, path):
+    # matched the same way as unordered arrays are patched
+    removed, unexpected = multiset_difference(inputs, outputs)
+    if removed or unexpected:
+        missing = [inputs[index] for index in removed]
+        yield Difference(UNORDERED, path, missing, unexpected)
+
+
+def list_differences(inputs, outputs, is_ordered, path=(), schema_path=()):
+    """Differences between an array of the request model and the returned one."""
+    if not isinstance(outputs, list):
+        yield Difference(MISMATCH, path, inputs, outputs)
+    elif not is_ordered(schema_path):
+        yield from _unordered_differences(inputs, outputs, path)
+    elif len(inputs) != len(outputs):
+        yield Difference(LENGTH, path, len(inputs), len(outputs))
+    else:
+        for index, (expected, actual) in enumerate(zip(inputs, outputs)):
+            # members of arrays in arrays are compared as values
+            if isinstance(expected, dict):
+                yield from model_differences(
+                    expected, actual, is_ordered, path + (index,), schema_path
+                )
+            elif not json_equal(expected, actual):
+                yield Difference(MISMATCH, path + (index,), expected, actual)
+
+
+def model_differences(inputs, outputs, is_ordered, path=(), schema_path=()):
+    """Differences between the request model and the returned model.
+
+    :param is_ordered: takes the path of an array property (without indices)
+        and returns whether the order of its members matters
+
+    >>> list(model_differences({"a": 1, "b": [1]}, {"b": [2]}, lambda path: True))
+    [Difference(kind='missing', path=('a',), expected=1, actual=None), \
+Difference(kind='mismatch', path=('b', 0), expected=1, actual=2)]
+    """
+    if not isinstance(inputs, dict):
+        if not json_equal(inputs, outputs):
+            yield Difference(MISMATCH, path, inputs, outputs)
+        return
+    if not isinstance(outputs, dict):
+        yield Difference(MISMATCH, path, inputs, outputs)
+        return
+    for key, expected in inputs.items():
+        if key not in outputs:
+            yield Difference(MISSING, path + (key,), expected, None)
+            continue
+        actual = outputs[key]
+        if isinstance(expected, dict):
+            yield from model_differences(
+                expected, actual, is_ordered, path + (key,), schema_path + (key,)
+            )
+        elif isinstance(expected, list):
+            yield from list_differences(
+                expected, actual, is_ordered, path + (key,), schema_path + (key,)
+            )
+        elif not json_equal(expected, actual):
+            yield Difference(MISMATCH, path + (key,), expected, actual)
+
+
+def render_differences(differences, inputs, outputs):
+    lines = [MESSAGE]
+    lines.extend(f"  {difference.render()}" for difference in differences)
+    lines.append(f"Request Model : {_dumps(inputs)}")
+    lines.append(f"Returned Model : {_dumps(outputs)}")
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+"""Derive new examples from a valid model instead of generating them anew.
+
+Generating a whole model from a strategy is slow for large schemas, and an
+update model generated that way changes every property at once, which makes
+for slow handler updates. Mutations change one top-level property of a model
+that is known to be valid:
+
+* a changed value keeps the model valid. Simple values are tweaked (another
+  enum value, a flipped boolean, a number or string changed within its
+  bounds). Others are drawn from a strategy for just that property.
+* a violation breaks exactly one constraint of the schema (type, enum, length,
+  bounds, item count, required or additional properties), or sets a read-only
+  property. Candidates are checked with the schema validator, so a violation
+  adds exactly one validation error.
+"""
+import copy
+import logging
+
+from jsonschema import Draft7Validator
+
+from ..jsonutils.pointer import fragment_decode
+
+LOG = logging.getLogger(__name__)
+
+# one value of each JSON type, to violate "type"
+TYPE_VALUES = ("", 0, 0.5, True, {}, [], None)
+UNKNOWN_PROPERTY = "UnknownPropertyAddedByContractTests"
+# markers for violations that remove a property, or draw a value for it
+REMOVE = object()
+DRAW = object()
+
+
+class CannotTweak(Exception):
+    pass
+
+
+def _tweak_enum(schema, value):
+    others = [item for item in schema["enum"] if item != value]
+    if not others:
+        raise CannotTweak("single enum value")
+    return others[0]
+
+
+def _tweak_number(schema, value):
+    """
+    >>> _tweak_number({"maximum": 3}, 3)
+    2
+    """
+    for step in (1, -1):
+        tweaked = value + step
+        if schema.get("minimum", tweaked) <= tweaked <= schema.get("maximum", tweaked):
+            if schema.get(
+                "exclusiveMinimum", tweaked - 1
+            ) < tweaked and tweaked < schema.get("exclusiveMaximum", tweaked + 1):
+                return tweaked
+    raise CannotTweak("no room within bounds")
+
+
+def _tweak_string(schema, value):
+    """
+    >>> _tweak_string({"maxLength": 3}, "abc")
+    'abx'
+    """
+    if any(key in schema for key in ("pattern", "format")):
+        raise CannotTweak("constrained string")
+    if len(value) < schema.get("maxLength", len(value) + 1):
+        return value + "x"
+    if value:
+        return value[:-1] + ("x" if value[-1] != "x" else "y")
+    raise CannotTweak("empty string")
+
+
+def tweak(schema, value):
+    """A different value, that is valid if the value was, or raise
+    :class:`CannotTweak`.
+
+    >>> tweak({"type": "boolean"}, True)
+    False
+    >>> tweak({"enum": ["A", "B"]}, "A")
+    'B'
+    """
+    if "const" in schema:
+        raise CannotTweak("const")
+    if "enum" in schema:
+        return _tweak_enum(schema, value)
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, int) and not schema.get("multipleOf"):
+        return _tweak_number(schema, value)
+    if isinstance(value, str):
+        return _tweak_string(schema, value)
+    raise CannotTweak(type(value).__name__)
+
+
+def _enum_violations(values):
+    if all(isinstance(item, str) for item in values):
+        yield "enum", max(values, key=len) + "x"
+    elif all(isinstance(item, (int, float)) for item in values):
+        yield "enum", max(values) + 1
+
+
+def _bound_violations(schema, value):
+    if "enum" in schema:
+        yield from _enum_violations(schema["enum"])
+    if "maxLength" in schema:
+        yield "maxLength", "x" * (schema["maxLength"] + 1)
+    if schema.get("minLength", 0) > 0:
+        yield "minLength", ""
+    if "maximum" in schema:
+        yield "maximum", schema["maximum"] + 1
+    if "minimum" in schema:
+        yield "minimum", schema["minimum"] - 1
+    if isinstance(value, list) and value:
+        if "maxItems" in schema:
+            yield "maxItems", value + [value[-1]] * (
+                schema["maxItems"] + 1 - len(value)
+            )
+        if schema.get("minItems", 0) > 0:
+            yield "minItems", []
+
+
+def value_violations(schema, value):
+    """Values that may violate a constraint of the schema, and which one."""
+    for type_value in TYPE_VALUES:
+        if type(type_value) is not type(value):  # pylint: disable=C0123
+            yield "type", type_value
+            break
+    yield from _bound_violations(schema, value)
+
+
+class ModelMutator:
+    def __init__(self, schema, draw, random):
+        self._schema = schema
+        # draws a value for a top-level property, from its own strategy
+        self._draw = draw
+        self._random = random
+        self._validator = Draft7Validator(schema)
+
+    def property_schema(self, prop):
+        schema = self._schema.get("properties", {}).get(prop, {})
+        seen = set()
+        while "$ref" in schema and schema["$ref"] not in seen:
+            seen.add(schema["$ref"])
+            target = self._schema
+            for part in fragment_decode(schema["$ref"]):
+                target = target.get(part, {})
+            schema = {**target, **{k: v for k, v in schema.items() if k != "$ref"}}
+        return schema
+
+    def mutate(self, model, properties):
+        """A copy of the model with one of the properties changed."""
+        model = copy.deepcopy(model)
+        if not properties:
+            return model
+        prop = self._random.choice(sorted(properties))
+        try:
+            model[prop] = tweak(self.property_schema(prop), model[prop])
+        except (CannotTweak, KeyError, TypeError) as e:
+            LOG.debug("Drawing a new value for '%s' (%s)", prop, e)
+            model[prop] = self._draw(prop)
+        return model
+
+    def _error_count(self, model):
+        return sum(1 for _error in self._validator.iter_errors(model))
+
+    def _violations(self, model, properties):
+        # (description, property, value)
+        for prop in properties:
+            if prop in model:
+                schema = self.property_schema(prop)
+                for constraint, value in value_violations(schema, model[prop]):
+                    yield f"{constraint} of '{prop}'", prop, value
+        for prop in self._schema.get("required", ()):
+            if prop in model:
+                yield f"required '{prop}'", prop, REMOVE
+        if self._schema.get("additionalProperties") is False:
+            yield "additionalProperties", UNKNOWN_PROPERTY, ""
+
+    def violate(self, model, properties, read_only_properties=()):
+        """A copy of the model that violates exactly one constraint of the
+        schema, with the constraint. A read-only property that is not in the
+        model is set, or one of the properties is changed. ``None`` if no
+        constraint can be violated."""
+        candidates = [
+            (f"readOnlyProperties '{prop}'", prop, DRAW)
+            for prop in read_only_properties
+            if prop not in model
+        ]
+        candidates.extend(self._violations(model, properties))
+        self._random.shuffle(candidates)
+
+        expected_errors = self._error_count(model) + 1
+        for description, prop, value in candidates:
+            violated = copy.deepcopy(model)
+            if value is DRAW:
+                violated[prop] = self._draw(prop)
+                return violated, description
+            if value is REMOVE:
+                del violated[prop]
+            else:
+                violated[prop] = value
+            if self._error_count(violated) == expected_errors:
+                return violated, description
+        return None, None
@@ -0,0 +1,182 @@
+# pylint: disable=import-error
+"""Strategies for strings matching a regular expression.
+
+Hypothesis' ``from_regex`` supports any pattern, but is slow to draw from for
+long patterns. Most schema patterns are simple: anchored sequences of literals
+and character classes with bounded repetition, optional groups and literal
+alternations, e.g. ``^[a-zA-Z0-9-]{1,64}$`` or ``^arn:aws(-(cn|gov))?:...$``.
+These are compiled directly into text and tuple strategies. Any other pattern
+falls back to ``from_regex``.
+"""
+import logging
+import re
+import string
+from functools import lru_cache
+
+from hypothesis.strategies import (
+    from_regex,
+    just,
+    lists,
+    one_of,
+    sampled_from,
+    text,
+    tuples,
+)
+
+try:  # pragma: no cover
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+LOG = logging.getLogger(__name__)
+
+# characters matched by "." and negated classes. a valid subset of what the
+# pattern matches, and safe to pass around (no control characters)
+PRINTABLE = "".join(chr(code) for code in range(0x20, 0x7F))
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_NOT_DIGIT: "".join(
+        c for c in PRINTABLE if c not in string.digits
+    ),
+    sre_constants.CATEGORY_WORD: string.ascii_letters + string.digits + "_",
+    sre_constants.CATEGORY_NOT_WORD: "".join(
+        c for c in PRINTABLE if not (c.isalnum() or c == "_")
+    ),
+    sre_constants.CATEGORY_SPACE: " \t\n\r\f\v",
+    sre_constants.CATEGORY_NOT_SPACE: PRINTABLE.replace(" ", ""),
+}
+START_ANCHORS = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+END_ANCHORS = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+# flags that change what the sampler would have to generate
+UNSUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+
+class UnsupportedPattern(Exception):
+    pass
+
+
+def _class_characters(items):
+    characters = set()
+    negate = False
+    for opcode, value in items:
+        if opcode == sre_constants.NEGATE:
+            negate = True
+        elif opcode == sre_constants.LITERAL:
+            characters.add(chr(value))
+        elif opcode == sre_constants.RANGE:
+            low, high = value
+            characters.update(chr(code) for code in range(low, high + 1))
+        elif opcode == sre_constants.CATEGORY and value in CATEGORIES:
+            characters.update(CATEGORIES[value])
+        else:
+            raise UnsupportedPattern(opcode)
+    if negate:
+        characters = set(PRINTABLE) - characters
+    if not characters:
+        raise UnsupportedPattern("empty character class")
+    return "".join(sorted(characters))
+
+
+def _characters(opcode, value):
+    """The characters a single-character item matches, or ``None``."""
+    if opcode == sre_constants.IN:
+        return _class_characters(value)
+    if opcode == sre_constants.NOT_LITERAL:
+        return PRINTABLE.replace(chr(value), "")
+    if opcode == sre_constants.ANY:
+        return PRINTABLE
+    return None
+
+
+def _item_strategy(opcode, value):
+    characters = _characters(opcode, value)
+    if characters is not None:
+        return sampled_from(characters)
+    if opcode == sre_constants.LITERAL:
+        return just(chr(value))
+    if opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        min_size, max_size, items = value
+        max_size = None if max_size == sre_constants.MAXREPEAT else max_size
+        if len(items) == 1:
+            characters = _characters(*items[0])
+            if characters is not None:
+                return text(alphabet=characters, min_size=min_size, max_size=max_size)
+        return lists(
+            _sequence_strategy(items), min_size=min_size, max_size=max_size
+        ).map("".join)
+    if opcode == sre_constants.SUBPATTERN:
+        _group, add_flags, del_flags, items = value
+        if add_flags or del_flags:
+            raise UnsupportedPattern("inline flags")
+        return _sequence_strategy(items)
+    if opcode == sre_constants.BRANCH:
+        _, alternatives = value
+        literals = [_literal(items) for items in alternatives]
+        if None not in literals:
+            return sampled_from(literals)
+        return one_of(*(_sequence_strategy(items) for items in alternatives))
+    raise UnsupportedPattern(opcode)
+
+
+def _literal(items):
+    """The string a sequence of literals matches, or ``None``."""
+    if all(opcode == sre_constants.LITERAL for opcode, _value in items):
+        return "".join(chr(value) for _opcode, value in items)
+    return None
+
+
+def _sequence_strategy(items):
+    # adjacent literals are drawn as one string
+    parts = []
+    literal = []
+    for opcode, value in items:
+        if opcode == sre_constants.LITERAL:
+            literal.append(chr(value))
+            continue
+        if literal:
+            parts.append(just("".join(literal)))
+            literal = []
+        parts.append(_item_strategy(opcode, value))
+    if literal:
+        parts.append(just("".join(literal)))
+
+    if not parts:
+        return just("")
+    if len(parts) == 1:
+        return parts[0]
+    return tuples(*parts).map("".join)
+
+
+def _direct_strategy(pattern):
+    parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    if pattern.flags & UNSUPPORTED_FLAGS:
+        raise UnsupportedPattern("flags")
+    items = list(parsed)
+    if not (
+        len(items) >= 2
+        and items[0][0] == sre_constants.AT
+        and items[0][1] in START_ANCHORS
+        and items[-1][0] == sre_constants.AT
+        and items[-1][1] in END_ANCHORS
+    ):
+        # unanchored patterns allow any surrounding text, leave that to from_regex
+        raise UnsupportedPattern("not anchored")
+    return _sequence_strategy(items[1:-1])
+
+
+@lru_cache(maxsize=None)
+def regex_strategy(regex, flags=re.ASCII):
+    """A strategy for strings matching the pattern, shared by every schema that
+    uses it.
+
+    >>> strategy = regex_strategy(r"^[a-z]{2}-[0-9]{1,3}$")
+    >>> regex_strategy(r"^[a-z]{2}-[0-9]{1,3}$") is strategy
+    True
+    """
+    pattern = re.compile(regex, flags)
+    try:
+        return _direct_strategy(pattern)
+    except (UnsupportedPattern, re.error) as e:
+        LOG.debug("using from_regex for pattern '%s' (%s)", regex, e)
+        return from_regex(pattern)
@@ -4,18 +4,27 @@
 import copy
 import json
 import logging
+import random
 import re
 import sys
 import time
-from time import sleep
+import warnings
 from typing import Any, Dict, Tuple
 from uuid import uuid4
 
 import docker
-from botocore import UNSIGNED
-from botocore.config import Config
 
+from rpdk.core.contract.callback_scheduler import CallbackScheduler
+from rpdk.core.contract.cassette import REDACTED
 from rpdk.core.contract.interface import Action, HandlerErrorCode, OperationStatus
+from rpdk.core.contract.lambda_http_client import LambdaHttpClient
+from rpdk.core.contract.model_diff import (
+    list_differences,
+    model_differences,
+    render_differences,
+)
+from rpdk.core.contract.model_mutator import ModelMutator
+from rpdk.core.contract.schema_coverage import SchemaCoverage
 from rpdk.core.contract.type_configuration import TypeConfiguration
 from rpdk.core.exceptions import InvalidProjectError
 
@@ -25,62 +34,26 @@ from ..boto_helpers import (
     get_account,
     get_temporary_credentials,
 )
+from ..jsonutils.diff import IdentifierChangedError, make_patch
 from ..jsonutils.pointer import fragment_decode, fragment_list
-from ..jsonutils.utils import (
-    UNPACK_SEQUENCE_IDENTIFIER,
-    item_hash,
-    traverse,
-    traverse_path_for_sequence_members,
-    traverse_raw_schema,
-)
+from ..jsonutils.schema_index import SchemaIndex
+from ..jsonutils.utils import PathTrie, traverse
 
 LOG = logging.getLogger(__name__)
-LOOKUP_ERROR_MESSAGE_FORMAT = (
-    "Caught LookupError when pruning properties for document %s and path %s"
-)
 
 
 def prune_properties(document, paths):
     """Prune given properties from a document.
 
     This assumes properties will always have an object (dict) as a parent.
+    The paths may be a compiled :class:`PathTrie`, which saves compiling them
+    again for every document.
     The function modifies the document in-place, but also returns the document
     for convenience. (The return value may be ignored.)
     """
-    for path in paths:
-        # if '*' is in path, we need to prune more than one property (prune property for all members of array)
-        if UNPACK_SEQUENCE_IDENTIFIER in path:
-            document = _prune_properties_for_all_sequence_members(document, path)
-            continue
-        try:
-            _prop, resolved_path, parent = traverse(document, path)
-        except LookupError:
-            # not found means nothing to delete
-            LOG.info(LOOKUP_ERROR_MESSAGE_FORMAT, document, path)
-        else:
-            key = resolved_path[-1]
-            del parent[key]
-    return document
-
-
-def _prune_properties_for_all_sequence_members(document: dict, path: list) -> dict:
-    try:
-        # this returns multiple paths
-        _prop, resolved_paths = traverse_path_for_sequence_members(document, path)
-    except LookupError:
-        # not found means nothing to delete
-        # LOG.info(LOOKUP_ERROR_MESSAGE_FORMAT, document, path)
-        pass
-    else:
-        # paths with indices are gathered in increasing order, but we need to prune in reverse order
-        resolved_paths = resolved_paths[::-1]
-        for resolved_path in resolved_paths:
-            new_doc = document
-            for key in resolved_path[: len(resolved_path) - 1]:
-                new_doc = new_doc[key]
-            key = resolved_path[-1]
-            del new_doc[key]
-    return document
+    if not isinstance(paths, PathTrie):
+        paths = PathTrie(paths)
+    return paths.prune(document)
 
 
 def prune_properties_if_not_exist_in_path(output_model, input_model, paths):
@@ -177,74 +150,125 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
         typeconfig=None,
         executable_entrypoint=None,
         profile=None,
+        max_callback_delay=None,
+        cassette=None,
+        local_handler=None,
+        seed=None,
+        coverage_candidates=None,
+        generation_stats=None,
+        corpus=None,
     ):  # pylint: disable=too-many-arguments
-        self._session = create_sdk_session(region, profile)
         self._role_arn = role_arn
         self._type_name = type_name
         self._log_group_name = log_group_name
         self._log_role_arn = log_role_arn
         self.region = region
         self._headers = headers
-        self.account = get_account(
-            self._session,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, role_arn, headers
-            ),
-        )
         self._function_name = function_name
-        if endpoint.startswith("http://"):
-            self._client = self._session.client(
-                "lambda",
-                endpoint_url=endpoint,
-                use_ssl=False,
-                verify=False,
-                config=Config(
-                    signature_version=UNSIGNED,
-                    # needs to be long if docker is running on a slow machine
-                    read_timeout=15 * 60,
-                    retries={"max_attempts": 0},
-                    region_name=self._session.region_name,
-                ),
-            )
+        self._cassette = cassette
+        self._local_handler = local_handler
+        if cassette and cassette.replaying:
+            # replayed handler calls never reach AWS
+            self._session = None
+            self._client = None
+            self.account = cassette.account
         else:
-            self._client = self._session.client("lambda", endpoint_url=endpoint)
+            self._session = create_sdk_session(region, profile)
+            self.account = get_account(
+                self._session, self._get_temporary_credentials(role_arn)
+            )
+            self._client = self._create_lambda_client(endpoint)
+            if cassette:
+                cassette.account = self.account
 
         self._schema = None
         self._strategy = None
         self._update_strategy = None
         self._invalid_strategy = None
+        self._property_strategies = {}
+        self._mutator = None
+        self._coverage_candidates = coverage_candidates
+        self.coverage = None
+        self.generation_stats = generation_stats
+        self._corpus = corpus
         self._overrides = overrides
         self._update_schema(schema)
         self._inputs = inputs
         self._timeout_in_seconds = int(timeout_in_seconds)
         self._docker_image = docker_image
-        self._docker_client = docker.from_env() if self._docker_image else None
+        self._docker_client = (
+            docker.from_env() if self._docker_image and self._session else None
+        )
         self._executable_entrypoint = executable_entrypoint
         self._typeconfig = typeconfig
+        self._callback_scheduler = CallbackScheduler(max_callback_delay)
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self._example_random = random.Random(self.seed)
+
+    def _create_lambda_client(self, endpoint):
+        if endpoint.startswith("http://"):
+            # needs to be long if docker is running on a slow machine
+            return LambdaHttpClient(endpoint, read_timeout=15 * 60)
+        return self._session.client("lambda", endpoint_url=endpoint)
+
+    def _get_temporary_credentials(self, role_arn):
+        if self._session is None:
+            return dict.fromkeys(LOWER_CAMEL_CRED_KEYS, REDACTED)
+        return get_temporary_credentials(
+            self._session, LOWER_CAMEL_CRED_KEYS, role_arn, self._headers
+        )
 
     def _properties_to_paths(self, key):
         return {fragment_decode(prop, prefix="") for prop in self._schema.get(key, [])}
 
+    @staticmethod
+    def _key_paths(paths):
+        return [fragment_list(path, "properties", output=tuple) for path in paths]
+
     def _update_schema(self, schema):
         # TODO: resolve $ref
         self._schema = schema
         self._strategy = None
         self._update_strategy = None
         self._invalid_strategy = None
+        self._property_strategies = {}
+        self._mutator = None
 
         self.primary_identifier_paths = self._properties_to_paths("primaryIdentifier")
         self.read_only_paths = self._properties_to_paths("readOnlyProperties")
         self.write_only_paths = self._properties_to_paths("writeOnlyProperties")
         self.create_only_paths = self._properties_to_paths("createOnlyProperties")
+        # compiled once, since these are pruned from models on every call
+        self._write_only_trie = PathTrie(self.write_only_paths)
+        self._not_updatable_trie = PathTrie(
+            self.read_only_paths | self.create_only_paths
+        )
         self.properties_without_insertion_order = self.get_metadata()
-        self.property_transform_keys = self._properties_to_paths("propertyTransform")
+        # looked up for every array compared, so resolved once
+        self._schema_index = SchemaIndex(schema)
         self.property_transform = self._schema.get("propertyTransform")
+        self._property_transform_script = None
+        if self._coverage_candidates:
+            # the same properties as the create strategy can generate
+            self.coverage = SchemaCoverage(
+                prune_properties(json.loads(json.dumps(schema)), self.read_only_paths)
+            )
 
         additional_identifiers = self._schema.get("additionalIdentifiers", [])
         self._additional_identifiers_paths = [
             {fragment_decode(prop, prefix="") for prop in identifier}
             for identifier in additional_identifiers
         ]
+        # checked for every key of a model, so indexed by top-level property
+        identifier_paths = self.primary_identifier_paths.union(
+            *self._additional_identifiers_paths
+        )
+        self._identifier_properties = {
+            key_path[0] for key_path in self._key_paths(identifier_paths) if key_path
+        }
+        self._create_only_primary_key_paths = self._key_paths(
+            self.primary_identifier_paths & self.create_only_paths
+        )
 
     def transform_model(self, input_model):
         if not self.property_transform:
@@ -256,27 +280,51 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
                 "Property transform not available with contract tests on Windows OS"
             )
 
-        import pyjq
-
-        transformed_input_model = copy.deepcopy(input_model)
-        for key in self.property_transform_keys:
-            path = "/" + "/".join(key)
-            expression = self.property_transform[path]
-            transformed_value = pyjq.first(expression, transformed_input_model)
-            # key is a tuple like ("properties", "A", "B")
-            # input model is like: {"A": {"B": "valueB"}}
-            # use key[1:] here to remove "properties"
-            transformed_input_model = self.update_property(
-                transformed_input_model, transformed_value, key[1:]
-            )
+        # the input model is not modified, so it does not need to be copied
+        return self._compile_property_transform().first(input_model)
+
+    def _compile_property_transform(self):
+        """Compile all transforms into one jq program, once per schema.
 
-        return transformed_input_model
+        Each transform sets its property to the first value of its expression
+        (or null), in the order of the schema, so later expressions see the
+        values set by earlier ones.
+        """
+        if self._property_transform_script is None:
+            import pyjq
+
+            setters = []
+            for pointer, expression in self.property_transform.items():
+                # pointers are like /properties/A/B, models like {"A": {"B": 1}}
+                path = json.dumps(fragment_decode(pointer, prefix="")[1:])
+                setters.append(f"setpath({path}; [({expression})][0])")
+            self._property_transform_script = pyjq.compile(" | ".join(setters))
+        return self._property_transform_script
+
+    @property
+    def property_transform_keys(self):
+        """Deprecated, transforms are compiled by ``transform_model``."""
+        warnings.warn(
+            "property_transform_keys is deprecated and will be removed",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._properties_to_paths("propertyTransform")
 
     def update_property(
         self, model: Dict[str, Any], value: Any, path: Tuple[str, ...]
     ) -> Dict[str, Any]:
+        """Deprecated, transforms are compiled by ``transform_model``."""
+        warnings.warn(
+            "update_property is deprecated and will be removed",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._update_property(model, value, path)
+
+    def _update_property(self, model, value, path):
         if len(path) > 1:
-            model[path[0]] = self.update_property(model[path[0]], value, path[1:])
+            model[path[0]] = self._update_property(model[path[0]], value, path[1:])
         elif len(path) == 1:
             model[path[0]] = value
         return model
@@ -320,14 +368,11 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             return self._strategy
 
         # imported here to avoid hypothesis being loaded before pytest is loaded
-        from .resource_generator import ResourceGenerator
+        from .resource_generator import get_schema_strategy
 
-        # make a copy so the original schema is never modified
-        schema = json.loads(json.dumps(self._schema))
-
-        prune_properties(schema, self.read_only_paths)
-
-        self._strategy = ResourceGenerator(schema).generate_schema_strategy(schema)
+        self._strategy = get_schema_strategy(
+            self._schema, self.read_only_paths, stats=self.generation_stats
+        )
         return self._strategy
 
     @property
@@ -337,13 +382,10 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             return self._invalid_strategy
 
         # imported here to avoid hypothesis being loaded before pytest is loaded
-        from .resource_generator import ResourceGenerator
-
-        # make a copy so the original schema is never modified
-        schema = json.loads(json.dumps(self._schema))
+        from .resource_generator import get_schema_strategy
 
-        self._invalid_strategy = ResourceGenerator(schema).generate_schema_strategy(
-            schema
+        self._invalid_strategy = get_schema_strategy(
+            self._schema, stats=self.generation_stats
         )
         return self._invalid_strategy
 
@@ -354,46 +396,205 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             return self._update_strategy
 
         # imported here to avoid hypothesis being loaded before pytest is loaded
-        from .resource_generator import ResourceGenerator
+        from .resource_generator import get_schema_strategy
 
-        # make a copy so the original schema is never modified
-        schema = json.loads(json.dumps(self._schema))
+        self._update_strategy = get_schema_strategy(
+            self._schema,
+            self.read_only_paths,
+            self.create_only_paths,
+            stats=self.generation_stats,
+        )
+        return self._update_strategy
+
+    def generate_example(self, strategy):
+        """Draw an example from a strategy. For the same seed and sequence of
+        draws, the examples are the same."""
+        # imported here to avoid hypothesis being loaded before pytest is loaded
+        from .resource_generator import generate_examples
 
-        prune_properties(schema, self.read_only_paths)
-        prune_properties(schema, self.create_only_paths)
+        return generate_examples(strategy, 1, self._example_random.getrandbits(32))[0]
 
-        self._update_strategy = ResourceGenerator(schema).generate_schema_strategy(
-            schema
+    def _generate_covering_example(self, strategy):
+        if not self.coverage:
+            return self.generate_example(strategy)
+
+        # imported here to avoid hypothesis being loaded before pytest is loaded
+        from .resource_generator import generate_examples
+
+        candidates = generate_examples(
+            strategy, self._coverage_candidates, self._example_random.getrandbits(32)
         )
-        return self._update_strategy
+        return self.coverage.select(candidates)
+
+    @property
+    def mutator(self):
+        if self._mutator is None:
+            self._mutator = ModelMutator(
+                self._schema, self._draw_property, self._example_random
+            )
+        return self._mutator
+
+    def _draw_property(self, prop):
+        """Draw a value for a single top-level property, which is much faster
+        than drawing a whole model for large schemas."""
+        try:
+            strategy = self._property_strategies[prop]
+        except KeyError:
+            # imported here to avoid hypothesis being loaded before pytest is loaded
+            from .resource_generator import get_schema_strategy
+
+            schema = {
+                "definitions": self._schema.get("definitions", {}),
+                "properties": {prop: self._schema["properties"][prop]},
+            }
+            # nested read-only properties are never set, but the property
+            # itself may be, to make an invalid model
+            paths = {path for path in self.read_only_paths if path[1:] != (prop,)}
+            strategy = get_schema_strategy(schema, paths, stats=self.generation_stats)
+            self._property_strategies[prop] = strategy
+        return self.generate_example(strategy)[prop]
+
+    def _top_level_properties(self, paths):
+        return {path[1] for path in paths if len(path) == 2}
+
+    def _create_properties(self):
+        properties = set(self._schema.get("properties", {}))
+        return properties - self._top_level_properties(self.read_only_paths)
+
+    def _update_properties(self):
+        # changing a property with create-only properties nested in it could
+        # change those too
+        create_only = {path[1] for path in self.create_only_paths if len(path) > 1}
+        return self._create_properties() - create_only
+
+    def _draw_write_only_properties(self, model, properties):
+        """Values for the write-only properties a model returned by a handler
+        lacks. Required ones are drawn, and ones with write-only properties
+        nested in them are drawn again, so the example stays valid."""
+        required = set(self._schema.get("required", ()))
+        top_level = self._top_level_properties(self.write_only_paths)
+        nested = {path[1] for path in self.write_only_paths if len(path) > 2}
+        return {
+            prop: self._draw_property(prop)
+            for prop in sorted(properties)
+            if (prop in top_level and prop in required and prop not in model)
+            or (prop in nested and prop in model)
+        }
+
+    def _mutate_covering_example(self, model, properties):
+        if not self.coverage:
+            return self.mutator.mutate(model, properties)
+        candidates = [
+            self.mutator.mutate(model, properties)
+            for _ in range(self._coverage_candidates)
+        ]
+        return self.coverage.select(candidates)
+
+    def _violate(self, model, properties):
+        example, constraint = self.mutator.violate(
+            model, properties, self._top_level_properties(self.read_only_paths)
+        )
+        if example is not None:
+            LOG.debug("Generated invalid example, violating %s", constraint)
+        return example
+
+    def _redact_secrets(self, model, overridden=True):
+        """The model to store on disk, without the values of write-only (and
+        overridden) properties, which may be secrets."""
+        secrets = {path[1] for path in self.write_only_paths if len(path) > 1}
+        if overridden:
+            for overrides in self._overrides.values():
+                secrets.update(path[0] for path in overrides if path)
+        return {
+            key: REDACTED if key in secrets else value for key, value in model.items()
+        }
+
+    def _redact_cassette_request(self, payload):
+        request_data = dict(payload["requestData"])
+        for key in ("resourceProperties", "previousResourceProperties"):
+            if request_data.get(key):
+                request_data[key] = self._redact_secrets(request_data[key])
+        return {**payload, "requestData": request_data}
+
+    def _redact_cassette_response(self, response):
+        # overridden values are returned as they were sent, and must still
+        # match the request when replayed
+        if not isinstance(response.get("resourceModel"), dict):
+            return response
+        return {
+            **response,
+            "resourceModel": self._redact_secrets(
+                response["resourceModel"], overridden=False
+            ),
+        }
+
+    def _restore_corpus_model(self, model):
+        """Draw new values for the properties redacted from a stored model."""
+        for key, value in model.items():
+            if value == REDACTED:
+                model[key] = self._draw_property(key)
+        return model
+
+    def _replay_corpus_example(self, action):
+        if not self._corpus:
+            return None
+        example = self._corpus.replay(action)
+        if example is None:
+            return None
+        example = self._restore_corpus_model(example)
+        if self.coverage:
+            self.coverage.record(example)
+        return example
+
+    def _mutate_corpus_example(self):
+        if not self._corpus:
+            return None
+        model = self._corpus.sample(Action.CREATE, self._example_random)
+        if model is None:
+            return None
+        model = self._restore_corpus_model(model)
+        # change the identifiers if possible, so the new model does not
+        # refer to the same resource
+        properties = self._create_properties()
+        identifiers = properties & self._top_level_properties(
+            self.primary_identifier_paths
+        )
+        return self._mutate_covering_example(model, identifiers or properties)
 
     def generate_create_example(self):
         if self._inputs:
             return self._inputs["CREATE"]
-        example = self.strategy.example()
+        example = self._replay_corpus_example(Action.CREATE)
+        if example is None:
+            example = self._mutate_corpus_example()
+        if example is None:
+            example = self._generate_covering_example(self.strategy)
         return override_properties(example, self._overrides.get("CREATE", {}))
 
     def generate_invalid_create_example(self):
         if self._inputs:
             return self._inputs["INVALID"]
-        example = self.invalid_strategy.example()
-        return override_properties(example, self._overrides.get("CREATE", {}))
+        example = override_properties(
+            self.generate_example(self.strategy), self._overrides.get("CREATE", {})
+        )
+        invalid_example = self._violate(example, self._create_properties())
+        if invalid_example is None:
+            # e.g. a schema without any constraints to violate
+            invalid_example = override_properties(
+                self.generate_example(self.invalid_strategy),
+                self._overrides.get("CREATE", {}),
+            )
+        return invalid_example
 
     def get_unique_keys_for_model(self, create_model):
         return {
-            k: v
-            for k, v in create_model.items()
-            if self.is_property_in_path(k, self.primary_identifier_paths)
-            or any(
-                self.is_property_in_path(k, additional_identifier_paths)
-                for additional_identifier_paths in self._additional_identifiers_paths
-            )
+            k: v for k, v in create_model.items() if k in self._identifier_properties
         }
 
     @staticmethod
     def is_property_in_path(key, paths):
         for path in paths:
-            prop = fragment_list(path, "properties")[0]
+            prop = fragment_list(path, "properties", output=tuple)[0]
             if prop == key:
                 return True
         return False
@@ -408,19 +609,17 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
         return model[key_path]
 
     def validate_update_example_keys(self, unique_identifiers, update_example):
-        for primary_identifier in self.primary_identifier_paths:
-            if primary_identifier in self.create_only_paths:
-                primary_key_path = fragment_list(primary_identifier, "properties")
-                update_example_pk_value = self.get_value_by_key_path(
-                    update_example, primary_key_path
-                )
-                unique_identifiers_pk_value = self.get_value_by_key_path(
-                    unique_identifiers, primary_key_path
-                )
-                assert update_example_pk_value == unique_identifiers_pk_value, (
-                    "Any createOnlyProperties specified in update handler input "
-                    "MUST NOT be different from their previous state"
-                )
+        for primary_key_path in self._create_only_primary_key_paths:
+            update_example_pk_value = self.get_value_by_key_path(
+                update_example, primary_key_path
+            )
+            unique_identifiers_pk_value = self.get_value_by_key_path(
+                unique_identifiers, primary_key_path
+            )
+            assert update_example_pk_value == unique_identifiers_pk_value, (
+                "Any createOnlyProperties specified in update handler input "
+                "MUST NOT be different from their previous state"
+            )
 
     def generate_update_example(self, create_model):
         if self._inputs:
@@ -437,14 +636,58 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             return {**create_model_with_read_only_properties, **update_example}
 
         overrides = self._overrides.get("UPDATE", self._overrides.get("CREATE", {}))
-        example = override_properties(self.update_strategy.example(), overrides)
-        return {**create_model, **example}
+        example = self._replay_corpus_example(Action.UPDATE)
+        if example is None:
+            # change a single property, so the update handler has less to do
+            properties = self._update_properties()
+            mutated = self._mutate_covering_example(create_model, properties)
+            example = {k: v for k, v in mutated.items() if k in properties}
+            example.update(self._draw_write_only_properties(mutated, properties))
+        else:
+            # the stored model was an update of a different resource, only its
+            # updatable properties apply to this one
+            prune_properties_from_model(example, self._not_updatable_trie)
+        example = override_properties(example, overrides)
+        update_example = {**create_model, **example}
+        if LOG.isEnabledFor(logging.DEBUG):
+            self._log_update_patch(create_model, update_example)
+        return update_example
+
+    def _log_update_patch(self, current_model, update_model):
+        try:
+            patch = self.update_patch(current_model, update_model)
+        except IdentifierChangedError as e:
+            LOG.debug("Update example replaces the resource: %s", e)
+        else:
+            LOG.debug("Update example patch\n%s", json.dumps(patch, indent=2))
+
+    def update_patch(self, current_model, update_model):
+        """The JSON patch from the current model to the update model. Arrays
+        without insertion order are patched as multisets.
+
+        :raises IdentifierChangedError: a create-only primary identifier differs
+        """
+        return make_patch(
+            current_model,
+            update_model,
+            self._is_ordered,
+            identifier_paths=[
+                path[1:]
+                for path in self.primary_identifier_paths
+                if path in self.create_only_paths
+            ],
+        )
 
     def generate_invalid_update_example(self, create_model):
         if self._inputs:
             return self._inputs["INVALID"]
         overrides = self._overrides.get("UPDATE", self._overrides.get("CREATE", {}))
-        example = override_properties(self.invalid_strategy.example(), overrides)
+        invalid_example = self._violate(create_model, self._update_properties())
+        if invalid_example is not None:
+            return invalid_example
+        example = override_properties(
+            self.generate_example(self.invalid_strategy), overrides
+        )
         return {**create_model, **example}
 
     def compare(self, inputs, outputs):
@@ -457,70 +700,37 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             else:
                 raise exception
 
+    def _is_ordered(self, path):
+        node = self._schema_index[path]
+        return node.insertion_order if node else True
+
+    def _assert_no_differences(self, differences, inputs, outputs):
+        differences = list(differences)
+        if differences:
+            raise AssertionError(render_differences(differences, inputs, outputs))
+
     def compare_model(self, inputs, outputs, path=()):
-        assertion_error_message = (
-            "All properties specified in the request MUST be present in the model"
-            " returned, and they MUST match exactly, with the exception of properties"
-            " defined as writeOnlyProperties in the resource schema \n Request Model :"
-            f" {inputs} \n Returned Model : {outputs} \n"  # noqa: E203
+        self._assert_no_differences(
+            model_differences(inputs, outputs, self._is_ordered, schema_path=path),
+            inputs,
+            outputs,
         )
-        try:
-            if isinstance(inputs, dict):
-                for key in inputs:
-                    new_path = path + (key,)
-                    if isinstance(inputs[key], dict):
-                        self.compare_model(
-                            inputs[key],
-                            outputs[key],
-                            new_path,
-                        )
-                    elif isinstance(inputs[key], list):
-                        assert len(inputs[key]) == len(outputs[key])
-
-                        is_ordered = traverse_raw_schema(self._schema, new_path).get(
-                            "insertionOrder", True
-                        )
-
-                        self.compare_collection(
-                            inputs[key],
-                            outputs[key],
-                            is_ordered,
-                            new_path,
-                        )
-                    else:
-                        if inputs[key] != outputs[key]:
-                            assertion_error_message = (
-                                f"{assertion_error_message} Value for property {key} in"
-                                f" Request Model({inputs[key]}) and Response"
-                                f" Model({outputs[key]}) does not match"
-                            )
-                        assert inputs[key] == outputs[key], assertion_error_message
-            else:
-                assert inputs == outputs, assertion_error_message
-        except Exception as exception:
-            assertion_error_message += ", inputs: " + json.dumps(inputs)
-            assertion_error_message += ", outputs: " + json.dumps(outputs)
-            raise AssertionError(assertion_error_message) from exception
 
     def compare_collection(self, inputs, outputs, is_ordered, path):
-        if is_ordered:
-            for index in range(len(inputs)):  # pylint: disable=C0200
-                self.compare_model(
-                    inputs[index],
-                    outputs[index],
-                    path,
-                )
-            return
-
-        assert {item_hash(item) for item in inputs} == {
-            item_hash(item) for item in outputs
-        }
+        self._assert_no_differences(
+            list_differences(
+                inputs, outputs, lambda _path: is_ordered, path, schema_path=path
+            ),
+            inputs,
+            outputs,
+        )
 
     @staticmethod
     def key_error_safe_traverse(resource_model, write_only_property):
         try:
             return traverse(
-                resource_model, fragment_list(write_only_property, "properties")
+                resource_model,
+                fragment_list(write_only_property, "properties", output=tuple),
             )[0]
         except KeyError:
             return None
@@ -619,7 +829,8 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
         try:
             assert all(
                 traverse(
-                    resource_model, fragment_list(primary_identifier, "properties")
+                    resource_model,
+                    fragment_list(primary_identifier, "properties", output=tuple),
                 )[0]
                 for primary_identifier in primary_identifier_paths
             ), "Every returned model MUST include the primaryIdentifier"
@@ -653,9 +864,9 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
         try:
             pid_list = []
             for primary_identifier in primary_identifier_path:
-                data = traverse(model, fragment_list(primary_identifier, "properties"))[
-                    0
-                ]
+                data = traverse(
+                    model, fragment_list(primary_identifier, "properties", output=tuple)
+                )[0]
                 pid_list.append(data)
             return pid_list
         except KeyError as e:
@@ -678,46 +889,63 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             self.region,
             self.account,
             action,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, self._role_arn, self._headers
-            ),
+            self._get_temporary_credentials(self._role_arn),
             self._type_name,
             self._log_group_name,
-            get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, self._log_role_arn, self._headers
-            ),
+            self._get_temporary_credentials(self._log_role_arn),
             self.generate_token(),
             type_configuration=type_configuration,
             **kwargs,
         )
 
-    def _call(self, payload):
-        request_without_write_properties = prune_properties(
-            payload["requestData"]["resourceProperties"], self.write_only_paths
-        )
+    def _without_write_only_properties(self, model):
+        if not model:
+            return model
+        return prune_properties_from_model(copy.deepcopy(model), self._write_only_trie)
 
-        previous_request_without_write_properties = None
-        if payload["requestData"]["previousResourceProperties"]:
-            previous_request_without_write_properties = prune_properties(
-                payload["requestData"]["previousResourceProperties"],
-                self.write_only_paths,
-            )
-        payload_to_log = {
+    def _payload_to_log(self, payload):
+        request_data = payload["requestData"]
+        return {
             "callbackContext": payload["callbackContext"],
             "action": payload["action"],
             "requestData": {
-                "resourceProperties": request_without_write_properties,
-                "previousResourceProperties": previous_request_without_write_properties,
-                "logicalResourceId": payload["requestData"]["logicalResourceId"],
+                "resourceProperties": self._without_write_only_properties(
+                    request_data["resourceProperties"]
+                ),
+                "previousResourceProperties": self._without_write_only_properties(
+                    request_data["previousResourceProperties"]
+                ),
+                "logicalResourceId": request_data["logicalResourceId"],
             },
             "region": payload["region"],
             "awsAccountId": payload["awsAccountId"],
             "bearerToken": payload["bearerToken"],
         }
-        LOG.debug(
-            "Sending request\n%s",
-            json.dumps(payload_to_log, ensure_ascii=False, indent=2),
-        )
+
+    def _call(self, payload):
+        # write-only properties are only left out of the log, the handler needs
+        # them. Copying and pruning the request is skipped unless it is logged,
+        # as this runs again for every IN_PROGRESS re-invocation
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(
+                "Sending request\n%s",
+                json.dumps(self._payload_to_log(payload), ensure_ascii=False, indent=2),
+            )
+        if self._cassette and self._cassette.replaying:
+            response = self._cassette.replay(self._redact_cassette_request(payload))
+        else:
+            response = self._invoke_handler(payload)
+            if self._cassette:
+                self._cassette.record(
+                    self._redact_cassette_request(payload),
+                    self._redact_cassette_response(response),
+                )
+        LOG.debug("Received response\n%s", response)
+        return response
+
+    def _invoke_handler(self, payload):
+        if self._local_handler:
+            return self._local_handler.invoke(payload)
         payload = json.dumps(payload, ensure_ascii=False, indent=2)
         if self._docker_image:
             if not self._executable_entrypoint:
@@ -750,7 +978,6 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
                 raise ValueError(
                     "Handler Output is not a valid JSON document"
                 ) from json_error
-        LOG.debug("Received response\n%s", payload)
         return payload
 
     def call_and_assert(
@@ -777,9 +1004,12 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             TypeConfiguration.get_type_configuration(self._typeconfig),
             **kwargs,
         )
-        start_time = time.time()
+        # the timeout applies to each invocation, the virtual clock to the
+        # whole operation, including the callback delays it skipped
+        start_time = self._callback_scheduler.time()
+        invoke_time = time.time()
         response = self._call(request)
-        self.assert_time(start_time, time.time(), action)
+        self.assert_time(invoke_time, time.time(), action)
 
         # this throws a KeyError if status isn't present, or if it isn't a valid status
         status = OperationStatus[response["status"]]
@@ -793,14 +1023,14 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
             self.assert_primary_identifier(
                 self.primary_identifier_paths, response.get("resourceModel")
             )
-            sleep(callback_delay_seconds)
+            self._callback_scheduler.sleep(callback_delay_seconds)
 
             request["requestData"]["resourceProperties"] = response.get("resourceModel")
             request["callbackContext"] = response.get("callbackContext")
             # refresh credential for every handler invocation
-            request["requestData"]["callerCredentials"] = get_temporary_credentials(
-                self._session, LOWER_CAMEL_CRED_KEYS, self._role_arn, self._headers
-            )
+            request["requestData"][
+                "callerCredentials"
+            ] = self._get_temporary_credentials(self._role_arn)
 
             response = self._call(request)
             status = OperationStatus[response["status"]]
@@ -809,6 +1039,18 @@ class ResourceClient:  # pylint: disable=too-many-instance-attributes
         if "resourceModel" in response.keys() and status == OperationStatus.SUCCESS:
             self.assert_write_only_property_does_not_exist(response["resourceModel"])
 
+        if (
+            self._corpus
+            and not self._inputs
+            and action in (Action.CREATE, Action.UPDATE)
+            and status == OperationStatus.SUCCESS
+        ):
+            self._corpus.record(
+                action,
+                self._redact_secrets(current_model),
+                status,
+                self._callback_scheduler.time() - start_time,
+            )
         return status, response
 
     def has_update_handler(self):
@@ -1,15 +1,20 @@
 # pylint: disable=import-error
+import copy
+import json
 import logging
-import re
+from collections import Counter
 from collections.abc import Sequence
+from contextvars import ContextVar
+from itertools import chain
 
+from hypothesis import HealthCheck, Phase, given, seed as seed_examples, settings
 from hypothesis.strategies import (
     booleans,
     builds,
     characters,
+    composite,
     fixed_dictionaries,
     floats,
-    from_regex,
     integers,
     just,
     lists,
@@ -20,7 +25,10 @@ from hypothesis.strategies import (
 )
 from jsonschema import RefResolver  # pylint: disable=no-name-in-module
 
-from ..jsonutils.utils import schema_merge
+from ..jsonutils.pointer import fragment_decode
+from ..jsonutils.utils import PathTrie, schema_hash, schema_merge
+from .regex_strategy import regex_strategy
+from .resource_client import prune_properties
 
 LOG = logging.getLogger(__name__)
 
@@ -45,6 +53,15 @@ STRING_FORMATS = {
 NEG_INF = float("-inf")
 POS_INF = float("inf")
 
+# how often a $ref may be expanded within itself, e.g. for nested rule trees
+DEFAULT_MAX_REF_DEPTH = 3
+
+# compiled strategies, shared by all clients in this process
+_STRATEGY_CACHE = {}
+# the stats of the client drawing from a measured strategy, so the compiled
+# strategy can be shared by clients with different stats
+_ACTIVE_STATS = ContextVar("generation_stats", default=None)
+
 
 def terminate_regex(regex):
     if regex.startswith("^"):
@@ -54,9 +71,111 @@ def terminate_regex(regex):
     return regex
 
 
+def get_schema_strategy(
+    schema, *pruned_paths, max_ref_depth=DEFAULT_MAX_REF_DEPTH, stats=None
+):
+    """The strategy for a schema, with the properties of each set of paths
+    pruned from it.
+
+    Strategies are compiled once per process for each distinct schema and set of
+    pruned paths, and shared by every client that asks for the same one. The
+    schema passed in is never modified. If ``stats`` are given, the strategy
+    records the cost of generating each property in them. The measured strategy
+    is compiled once as well, only the wrapper that records into ``stats`` is
+    created per call.
+    """
+    measured = stats is not None
+    key = (
+        schema_hash(schema),
+        tuple(frozenset(tuple(path) for path in paths) for paths in pruned_paths),
+        max_ref_depth,
+        measured,
+    )
+    try:
+        strategy = _STRATEGY_CACHE[key]
+    except KeyError:
+        # make a copy so the original schema is never modified
+        schema = json.loads(json.dumps(schema))
+        # all groups of paths are pruned in a single traversal
+        prune_properties(schema, PathTrie(chain.from_iterable(pruned_paths)))
+        strategy = ResourceGenerator(
+            schema, max_ref_depth, measured
+        ).generate_schema_strategy(schema)
+        _STRATEGY_CACHE[key] = strategy
+    if not measured:
+        return strategy
+    return _recorded(strategy, stats)
+
+
+@composite
+def _recorded(draw, strategy, stats):
+    token = _ACTIVE_STATS.set(stats)
+    try:
+        return draw(strategy)
+    finally:
+        _ACTIVE_STATS.reset(token)
+
+
+def generate_examples(strategy, count, seed=None):
+    """Draw ``count`` examples from a strategy in one batch.
+
+    Unlike ``strategy.example()``, which draws and discards a batch of
+    candidates for every call, this runs a single generation pass and is
+    deterministic for a given seed, so failures can be reproduced. If the
+    strategy has fewer distinct examples than requested, they are repeated.
+
+    >>> generate_examples(just(1), 3, seed=0)
+    [1, 1, 1]
+    """
+    examples = []
+
+    @settings(
+        database=None,
+        deadline=None,
+        # the first generated example is always the simplest one, which would
+        # make every single-example batch identical. it is dropped below
+        max_examples=count + 1,
+        phases=[Phase.generate],
+        suppress_health_check=list(HealthCheck),
+    )
+    @given(strategy)
+    def collect(example):
+        examples.append(example)
+
+    if seed is not None:
+        collect = seed_examples(seed)(collect)
+    collect()
+    if len(examples) > count:
+        examples = examples[1:]
+    return [examples[i % len(examples)] for i in range(count)]
+
+
 class ResourceGenerator:
-    def __init__(self, schema):
+    """Compiles schemas into Hypothesis strategies.
+
+    A ``$ref`` that refers back to itself (directly or through other
+    definitions) is expanded at most ``max_ref_depth`` times. Beyond that, it
+    compiles to an empty strategy, and the properties, array items and
+    ``oneOf``/``anyOf`` branches that would need it are left out, so recursive
+    schemas produce finite examples. Each definition is compiled once per
+    context, so definitions shared by many properties are not recompiled.
+
+    If ``measured``, the strategy of each property and array item is measured
+    into the stats of the client drawing from it (see
+    :func:`get_schema_strategy` and :class:`~.generation_stats.GenerationStats`).
+    """
+
+    def __init__(self, schema, max_ref_depth=DEFAULT_MAX_REF_DEPTH, measured=False):
         self.resolver = RefResolver.from_schema(schema)
+        self.max_ref_depth = max_ref_depth
+        self.measured = measured
+        # the location in the schema being compiled, which stats are keyed by
+        self._location = ()
+        # number of times each $ref is being expanded in the current context
+        self._ref_stack = Counter()
+        self._ref_strategies = {}
+        # set when a cycle is cut, since the strategy then depends on the context
+        self._ref_cut = False
 
     def generate_schema_strategy(self, schema):
         if "allOf" in schema:
@@ -66,9 +185,72 @@ class ResourceGenerator:
         if "anyOf" in schema:
             return self.generate_one_of_strategy(schema, "anyOf")
         if "$ref" in schema:
-            return self.generate_schema_strategy(self.resolve_ref(schema))
+            return self.generate_ref_strategy(schema["$ref"])
         return self.generate_primitive_strategy(schema)
 
+    def generate_ref_strategy(self, ref):
+        if self._ref_stack[ref] >= self.max_ref_depth:
+            LOG.debug("'%s' is nested more than %d times", ref, self.max_ref_depth)
+            self._ref_cut = True
+            return nothing()
+
+        # strategies without cut cycles are the same in any context
+        try:
+            return self._ref_strategies[ref]
+        except KeyError:
+            pass
+        try:
+            strategy = self._ref_strategies[(ref, frozenset(self._ref_stack.items()))]
+        except KeyError:
+            pass
+        else:
+            self._ref_cut = True
+            return strategy
+
+        outer_cut, self._ref_cut = self._ref_cut, False
+        outer_location, self._location = self._location, fragment_decode(ref)
+        self._ref_stack[ref] += 1
+        try:
+            # compiling modifies the schema, and the definition may be used again
+            strategy = self.generate_schema_strategy(
+                copy.deepcopy(self.resolve_ref({"$ref": ref}))
+            )
+        finally:
+            self._location = outer_location
+            self._ref_stack[ref] -= 1
+            if not self._ref_stack[ref]:
+                del self._ref_stack[ref]
+
+        if self._ref_cut:
+            self._ref_strategies[(ref, frozenset(self._ref_stack.items()))] = strategy
+        else:
+            self._ref_strategies[ref] = strategy
+        self._ref_cut = self._ref_cut or outer_cut
+        return strategy
+
+    def generate_nested_strategy(self, schema, *location):
+        """The strategy for a sub-schema at a location relative to the current
+        one, measured if stats are being collected."""
+        outer_location = self._location
+        self._location = outer_location + location
+        try:
+            strategy = self.generate_schema_strategy(schema)
+        finally:
+            self._location = outer_location
+        if not self.measured or strategy.is_empty:
+            return strategy
+
+        path = outer_location + location
+
+        @composite
+        def measured(draw):
+            stats = _ACTIVE_STATS.get()
+            if stats is None:
+                return draw(strategy)
+            return stats.measure(path, lambda: draw(strategy))
+
+        return measured()
+
     def generate_one_of_strategy(self, schema, combiner):
         one_of_schemas = schema.pop(combiner)
         strategies = [
@@ -116,32 +298,37 @@ class ResourceGenerator:
         except KeyError:
             return builds(dict)
 
+        strategies = {
+            prop: self.generate_nested_strategy(sub_schema, "properties", prop)
+            for prop, sub_schema in props.items()
+        }
+        # e.g. a property that would nest a recursive definition too deeply
         return fixed_dictionaries(
             {
-                prop: self.generate_schema_strategy(sub_schema)
-                for prop, sub_schema in props.items()
+                prop: strategy
+                for prop, strategy in strategies.items()
+                if not strategy.is_empty
             }
         )
 
     def generate_array_strategy(self, schema):
         min_items = schema.get("minItems", 0)
         max_items = schema.get("maxItems", None)
+        keyword = "items" if "items" in schema else "contains"
         try:
-            item_schemas = schema["items"]
+            item_schemas = schema[keyword]
         except KeyError:
-            try:
-                item_schemas = schema["contains"]
-            except KeyError:
-                return lists(nothing())
+            return lists(nothing())
         if isinstance(item_schemas, Sequence):
             item_strategy = [
-                self.generate_schema_strategy(schema) for schema in item_schemas
+                self.generate_nested_strategy(schema, keyword, index)
+                for index, schema in enumerate(item_schemas)
             ]
             # tuples let you define multiple strategies to generate elements.
             # When more than one schema for an item
             # is present, we should try to generate both
             return tuples(*item_strategy)
-        item_strategy = self.generate_schema_strategy(item_schemas)
+        item_strategy = self.generate_nested_strategy(item_schemas, keyword)
         return lists(item_strategy, min_size=min_items, max_size=max_items)
 
     @staticmethod
@@ -259,7 +446,7 @@ class ResourceGenerator:
             if "maxLength" in schema:  # pragma: no cover
                 LOG.warning("found maxLength used with pattern")
 
-            return from_regex(re.compile(terminate_regex(regex), re.ASCII))
+            return regex_strategy(terminate_regex(regex))
 
         if "pattern" in schema:  # pragma: no cover
             LOG.warning("found pattern used with format")
@@ -268,5 +455,4 @@ class ResourceGenerator:
         if "maxLength" in schema:  # pragma: no cover
             LOG.warning("found maxLength used with format")
 
-        regex = STRING_FORMATS[string_format]
-        return from_regex(re.compile(regex, re.ASCII))
+        return regex_strategy(STRING_FORMATS[string_format])
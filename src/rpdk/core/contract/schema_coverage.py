@@ -0,0 +1,189 @@
+"""Track which features of a schema generated examples have exercised.
+
+The features of a schema are its properties, enum values, ``oneOf``/``anyOf``
+branches and array sizes (empty, one item, several items), each at a model
+path such as ``("Rules", "*", "Status")``. This is used to pick, out of a few
+candidate examples, the one that exercises the most new features, so fewer
+handler invocations are needed to exercise the whole schema.
+"""
+import json
+import logging
+
+import referencing.exceptions
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import (  # pylint: disable=no-name-in-module
+    RefResolutionError,
+)
+
+from ..jsonutils.pointer import fragment_decode
+
+LOG = logging.getLogger(__name__)
+
+ITEMS = "*"
+ARRAY_SIZES = ("empty", "one", "many")
+
+
+def _array_size(length):
+    """
+    >>> [_array_size(n) for n in range(3)]
+    ['empty', 'one', 'many']
+    """
+    return ARRAY_SIZES[min(length, 2)]
+
+
+def _feasible_array_sizes(schema):
+    """
+    >>> _feasible_array_sizes({"minItems": 1, "maxItems": 1})
+    ['one']
+    """
+    min_items = schema.get("minItems", 0)
+    max_items = schema.get("maxItems")
+    sizes = []
+    if min_items == 0:
+        sizes.append("empty")
+    if min_items <= 1 and (max_items is None or max_items >= 1):
+        sizes.append("one")
+    if max_items is None or max_items >= 2:
+        sizes.append("many")
+    return sizes
+
+
+class SchemaCoverage:
+    def __init__(self, schema):
+        self._schema = schema
+        self._definitions = schema.get("definitions", {})
+        self._validators = {}
+        self.features = set()
+        self.covered = set()
+        self._add_schema_features(schema, (), ())
+
+    def _resolve(self, schema):
+        ref = schema.get("$ref", "")
+        if ref.startswith("#/definitions/"):
+            _definitions, name = fragment_decode(ref)
+            return ref, self._definitions.get(name, {})
+        return None, schema
+
+    def _add_schema_features(self, schema, path, refs):
+        ref, schema = self._resolve(schema)
+        if ref:
+            if ref in refs:
+                # recursive definitions are only counted once
+                return
+            refs = refs + (ref,)
+
+        for sub_schema in schema.get("allOf", ()):
+            self._add_schema_features(sub_schema, path, refs)
+        for combiner in ("oneOf", "anyOf"):
+            for index, sub_schema in enumerate(schema.get(combiner, ())):
+                self.features.add(("branch", path, index))
+                self._add_schema_features(sub_schema, path, refs)
+        for value in schema.get("enum", ()):
+            self.features.add(("enum", path, json.dumps(value, sort_keys=True)))
+        for prop, sub_schema in schema.get("properties", {}).items():
+            self.features.add(("property", path + (prop,)))
+            self._add_schema_features(sub_schema, path + (prop,), refs)
+        items = schema.get("items")
+        if isinstance(items, dict):
+            for size in _feasible_array_sizes(schema):
+                self.features.add(("array", path, size))
+            self._add_schema_features(items, path + (ITEMS,), refs)
+
+    def _matches(self, sub_schema, value):
+        key = id(sub_schema)
+        try:
+            validator = self._validators[key]
+        except KeyError:
+            # keep the definitions, so references in the branch resolve
+            validator = Draft7Validator(
+                {"definitions": self._definitions, **sub_schema}
+            )
+            self._validators[key] = validator
+        try:
+            return validator.is_valid(value)
+        except (
+            RefResolutionError,
+            referencing.exceptions.Unresolvable,
+        ):  # pragma: no cover
+            return False
+
+    def _add_branch_features(self, schema, value, path, features):
+        for combiner in ("oneOf", "anyOf"):
+            for index, sub_schema in enumerate(schema.get(combiner, ())):
+                if self._matches(sub_schema, value):
+                    features.add(("branch", path, index))
+                    self._add_example_features(sub_schema, value, path, features)
+
+    def _add_example_features(self, schema, value, path, features):
+        _ref, schema = self._resolve(schema)
+
+        for sub_schema in schema.get("allOf", ()):
+            self._add_example_features(sub_schema, value, path, features)
+        self._add_branch_features(schema, value, path, features)
+        if "enum" in schema:
+            features.add(("enum", path, json.dumps(value, sort_keys=True)))
+        if isinstance(value, dict):
+            for prop, sub_schema in schema.get("properties", {}).items():
+                if prop in value:
+                    features.add(("property", path + (prop,)))
+                    self._add_example_features(
+                        sub_schema, value[prop], path + (prop,), features
+                    )
+        items = schema.get("items")
+        if isinstance(value, list) and isinstance(items, dict):
+            features.add(("array", path, _array_size(len(value))))
+            for item in value:
+                self._add_example_features(items, item, path + (ITEMS,), features)
+
+    def example_features(self, example):
+        """The schema features an example exercises.
+
+        >>> coverage = SchemaCoverage({"properties": {"a": {"enum": [1, 2]}}})
+        >>> sorted(coverage.example_features({"a": 2}))
+        [('enum', ('a',), '2'), ('property', ('a',))]
+        """
+        features = set()
+        self._add_example_features(self._schema, example, (), features)
+        return features & self.features
+
+    def gain(self, example):
+        """The number of features an example exercises that none before did."""
+        return len(self.example_features(example) - self.covered)
+
+    def record(self, example):
+        self.covered |= self.example_features(example)
+
+    def select(self, candidates):
+        """Record and return the candidate that exercises the most new features.
+
+        >>> coverage = SchemaCoverage({"properties": {"a": {}, "b": {}}})
+        >>> coverage.select([{"a": 1}, {"a": 1, "b": 2}])
+        {'a': 1, 'b': 2}
+        >>> coverage.percent
+        100.0
+        """
+        gains = [self.gain(candidate) for candidate in candidates]
+        best = gains.index(max(gains))
+        LOG.debug(
+            "Selected candidate %d of %d, exercising %d new features",
+            best + 1,
+            len(candidates),
+            gains[best],
+        )
+        self.record(candidates[best])
+        return candidates[best]
+
+    @property
+    def percent(self):
+        if not self.features:
+            return 100.0
+        return 100.0 * len(self.covered) / len(self.features)
+
+    def uncovered(self):
+        return sorted(self.features - self.covered, key=repr)
+
+    def summary(self):
+        return (
+            f"schema coverage: {self.percent:.1f}% "
+            f"({len(self.covered)}/{len(self.features)} features)"
+        )
@@ -99,9 +99,13 @@ def test_hook_unsupported_target(hook_client, invocation_point):
         UNSUPPORTED_TARGET_SCHEMA
     ).generate_schema_strategy(UNSUPPORTED_TARGET_SCHEMA)
 
-    target_model = {"resourceProperties": unsupported_target.example()}
+    target_model = {
+        "resourceProperties": hook_client.generate_example(unsupported_target)
+    }
     if HookClient.is_update_invocation_point(invocation_point):
-        target_model["previousResourceProperties"] = unsupported_target.example()
+        target_model["previousResourceProperties"] = hook_client.generate_example(
+            unsupported_target
+        )
         target_model["previousResourceProperties"]["id"] = target_model[
             "resourceProperties"
         ]["id"]
@@ -109,9 +113,9 @@ def test_hook_unsupported_target(hook_client, invocation_point):
     _response, error_code = test_hook_failed(
         hook_client,
         invocation_point,
-        ResourceGenerator.generate_string_strategy(
-            {"pattern": TARGET_NAME_REGEX}
-        ).example(),
+        hook_client.generate_example(
+            ResourceGenerator.generate_string_strategy({"pattern": TARGET_NAME_REGEX})
+        ),
         target_model,
     )
 
@@ -0,0 +1,117 @@
+"""Generate the target examples of a hook for many targets at once.
+
+Hooks with wildcard target names may target hundreds of resource types.
+Compiling each target schema into a strategy and drawing examples from it one
+by one makes setting up hook contract tests slow. Instead, a batch of create
+and update examples is generated for each target in worker processes.
+
+If asked to, the examples are also stored on disk by target schema and seed, so
+later runs with the same seed (and other hooks with the same targets) reuse
+them until the schema changes. Since the seed is part of the key, the examples
+are the same with or without the cache.
+"""
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..jsonutils.utils import schema_hash
+
+LOG = logging.getLogger(__name__)
+
+TARGET_EXAMPLES_DIRECTORY = ".rpdk-target-examples"
+EXAMPLES_PER_TARGET = 5
+# starting worker processes takes longer than generating a few targets
+MIN_PARALLEL_TARGETS = 8
+
+
+def generate_target_examples(schema, read_only_paths, create_only_paths, seed):
+    """Create and update examples for a target schema. This runs in worker
+    processes, so it only takes and returns plain data."""
+    # imported here to avoid hypothesis being loaded before pytest is loaded
+    from .resource_generator import generate_examples, get_schema_strategy
+
+    create_strategy = get_schema_strategy(schema, read_only_paths)
+    update_strategy = get_schema_strategy(schema, read_only_paths, create_only_paths)
+    return {
+        "create": generate_examples(create_strategy, EXAMPLES_PER_TARGET, seed),
+        "update": generate_examples(update_strategy, EXAMPLES_PER_TARGET, seed),
+    }
+
+
+class TargetExampleCache:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, schema, seed):
+        return self.directory / f"{schema_hash(schema)}-{seed}.json"
+
+    def get(self, schema, seed):
+        try:
+            with self._path(schema, seed).open("r", encoding="utf-8") as f:
+                examples = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            LOG.warning("Ignoring invalid target examples for a schema: %s", e)
+            return None
+        if len(examples.get("create", ())) < EXAMPLES_PER_TARGET:
+            return None
+        return examples
+
+    def put(self, schema, seed, examples):
+        path = self._path(schema, seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        with partial.open("w", encoding="utf-8") as f:
+            json.dump(examples, f)
+        os.replace(partial, path)
+
+
+def _generate_all(jobs, workers):
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) < MIN_PARALLEL_TARGETS or workers == 1:
+        return {target: generate_target_examples(*job) for target, job in jobs.items()}
+
+    LOG.debug("Generating examples for %d targets in parallel", len(jobs))
+    # spawn, so workers don't inherit the state (e.g. locks, mocks) of this process
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            target: executor.submit(generate_target_examples, *job)
+            for target, job in jobs.items()
+        }
+        return {target: future.result() for target, future in futures.items()}
+
+
+def prepare_target_examples(jobs, cache=None, workers=None):
+    """Examples for each target, from the cache if possible.
+
+    ``jobs`` maps each target name to the arguments of
+    :func:`generate_target_examples`.
+    """
+    examples = {}
+    pending = {}
+    for target, job in jobs.items():
+        schema, _read_only, _create_only, seed = job
+        cached = cache.get(schema, seed) if cache else None
+        if cached is None:
+            pending[target] = job
+        else:
+            examples[target] = cached
+
+    generated = _generate_all(pending, workers)
+    for target, target_examples in generated.items():
+        if cache:
+            schema, _read_only, _create_only, seed = jobs[target]
+            cache.put(schema, seed, target_examples)
+        examples[target] = target_examples
+    LOG.debug(
+        "Prepared examples for %d targets (%d from cache)",
+        len(examples),
+        len(examples) - len(generated),
+    )
+    return examples
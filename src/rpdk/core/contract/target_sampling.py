@@ -0,0 +1,86 @@
+"""Sample the targets a wildcard target name of a hook resolves to.
+
+A target name like ``AWS::*`` matches every resource type in the registry, and
+testing the handler against all of them takes long. A sample covers as many
+service namespaces (``AWS::S3``, ``AWS::EC2``, ...) as possible, and within a
+namespace, as many schema shapes (number of properties, nesting) as possible.
+"""
+import logging
+from collections import defaultdict
+
+LOG = logging.getLogger(__name__)
+
+# property counts up to which a schema is small, or medium sized
+SHAPE_SIZES = ((5, "small"), (20, "medium"))
+
+
+def namespace(target_name):
+    """
+    >>> namespace("AWS::S3::Bucket")
+    'AWS::S3'
+    """
+    return "::".join(target_name.split("::")[:2])
+
+
+def schema_shape(schema):
+    """
+    >>> schema_shape({"properties": {"a": {"type": "object"}}})
+    ('small', True)
+    """
+    properties = schema.get("properties", {})
+    size = "large"
+    for limit, name in SHAPE_SIZES:
+        if len(properties) <= limit:
+            size = name
+            break
+    nested = any(
+        "$ref" in prop or prop.get("type") in ("object", "array")
+        for prop in properties.values()
+    )
+    return size, nested
+
+
+def _round_robin(groups):
+    """Take one item of each group in turn, until all are taken.
+
+    >>> list(_round_robin([[1, 2, 3], [4], [5, 6]]))
+    [1, 4, 5, 2, 6, 3]
+    """
+    iterators = [iter(group) for group in groups]
+    while iterators:
+        remaining = []
+        for iterator in iterators:
+            try:
+                yield next(iterator)
+            except StopIteration:
+                continue
+            remaining.append(iterator)
+        iterators = remaining
+
+
+def sample_targets(targets, target_info, count, random):
+    """A sample of ``count`` targets, spread across service namespaces and
+    schema shapes. For the same random state, the sample is the same."""
+    if len(targets) <= count:
+        return sorted(targets)
+
+    strata = defaultdict(lambda: defaultdict(list))
+    for target in sorted(targets):
+        schema = target_info.get(target, {}).get("Schema", {})
+        strata[namespace(target)][schema_shape(schema)].append(target)
+
+    namespaces = []
+    for name in sorted(strata):
+        shapes = [strata[name][shape] for shape in sorted(strata[name])]
+        for shape_targets in shapes:
+            random.shuffle(shape_targets)
+        random.shuffle(shapes)
+        namespaces.append(list(_round_robin(shapes)))
+    random.shuffle(namespaces)
+
+    sample = []
+    for target in _round_robin(namespaces):
+        sample.append(target)
+        if len(sample) == count:
+            break
+    return sorted(sample)
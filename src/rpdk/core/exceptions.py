@@ -64,3 +64,7 @@ class InvalidFragmentFileError(RPDKBaseException):
 
 class InvalidTypeSchemaError(RPDKBaseException):
     pass
+
+
+class CassetteError(SysExitRecommendedError):
+    pass
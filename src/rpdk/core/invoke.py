@@ -11,6 +11,7 @@ from time import sleep
 
 from .contract.hook_client import HookClient
 from .contract.interface import Action, HookInvocationPoint, HookStatus, OperationStatus
+from .contract.local_handler import create_local_handler
 from .contract.resource_client import ResourceClient
 from .exceptions import SysExitRecommendedError
 from .project import ARTIFACT_TYPE_HOOK, ARTIFACT_TYPE_RESOURCE, Project
@@ -48,7 +49,7 @@ def get_payload_to_log(payload, artifact_type):
     }
 
 
-def get_contract_client(args, project):
+def get_contract_client(args, project, local_handler=None):
     if project.artifact_type == ARTIFACT_TYPE_HOOK:
         return HookClient(
             args.function_name,
@@ -59,6 +60,7 @@ def get_contract_client(args, project):
             executable_entrypoint=project.executable_entrypoint,
             docker_image=args.docker_image,
             profile=args.profile,
+            local_handler=local_handler,
         )
 
     return ResourceClient(
@@ -70,6 +72,7 @@ def get_contract_client(args, project):
         executable_entrypoint=project.executable_entrypoint,
         docker_image=args.docker_image,
         profile=args.profile,
+        local_handler=local_handler,
     )
 
 
@@ -87,13 +90,14 @@ def invoke(args):
     project = Project()
     project.load()
 
-    client = get_contract_client(args, project)
-
     try:
         request = json.load(args.request)
     except ValueError as e:
         raise SysExitRecommendedError(f"Invalid JSON: {e}") from e
 
+    local_handler = create_local_handler(args.transport, project, args.function_name)
+    client = get_contract_client(args, project, local_handler)
+
     if project.artifact_type == ARTIFACT_TYPE_HOOK:
         status_type = HookStatus
         in_progress_status = HookStatus.IN_PROGRESS
@@ -136,6 +140,9 @@ def invoke(args):
             prepare_payload_for_reinvocation(payload, response, project.artifact_type)
     except KeyboardInterrupt:
         pass
+    finally:
+        if local_handler:
+            local_handler.close()
 
 
 def _needs_reinvocation(max_reinvoke, current_invocation):
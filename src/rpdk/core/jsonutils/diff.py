@@ -0,0 +1,205 @@
+"""Compute JavaScript Object Notation (JSON) Patches as per
+`RFC-6902 <https://tools.ietf.org/html/rfc6902>`_ between two models.
+
+The patches are small: unchanged values are left out, objects are patched
+key by key, and ordered arrays are patched between their common prefix and
+suffix. Arrays whose members are in no particular order (``insertionOrder``
+is false) are patched as multisets, by the canonical hash of their members, so
+reordering them is not a change. Applying a patch (e.g. with ``jsonpatch``)
+gives the target, except for the order of members of such arrays.
+"""
+from collections import defaultdict
+
+from .pointer import JsonPointer
+from .utils import item_hash
+
+
+class IdentifierChangedError(ValueError):
+    """A patch would change the value of an identifier, so the target is a
+    different resource rather than an update of the source."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        pointers = ", ".join(
+            JsonPointer(path).encode(prefix="") for path in sorted(paths)
+        )
+        super().__init__(f"Identifiers cannot be changed by a patch: {pointers}")
+
+
+def json_equal(source, target):
+    """Whether two JSON values are equal. Unlike ``==``, booleans are never
+    equal to numbers.
+
+    >>> json_equal({"a": [1, 2.0]}, {"a": [1.0, 2]})
+    True
+    >>> json_equal({"a": [1]}, {"a": [True]})
+    False
+    """
+    if isinstance(source, dict):
+        return (
+            isinstance(target, dict)
+            and source.keys() == target.keys()
+            and all(json_equal(value, target[key]) for key, value in source.items())
+        )
+    if isinstance(source, list):
+        return (
+            isinstance(target, list)
+            and len(source) == len(target)
+            and all(map(json_equal, source, target))
+        )
+    return source == target and isinstance(source, bool) == isinstance(target, bool)
+
+
+def multiset_difference(source, target):
+    """Match the members of two arrays whose order does not matter, by their
+    canonical hash.
+
+    :return: the indices of the source members without a match in the target,
+        in ascending order, and the target members without a match in the
+        source
+
+    >>> multiset_difference(["a", "a", "b"], ["b", "a", "c"])
+    ([0], ['c'])
+    """
+    surplus = defaultdict(list)
+    for index, member in enumerate(source):
+        surplus[item_hash(member)].append(index)
+    added = []
+    for member in target:
+        indices = surplus.get(item_hash(member))
+        if indices:
+            indices.pop()
+        else:
+            added.append(member)
+    removed = sorted(index for indices in surplus.values() for index in indices)
+    return removed, added
+
+
+def _pointer(path):
+    return JsonPointer(path).encode(prefix="")
+
+
+def _always_ordered(_path):
+    return True
+
+
+class _PatchBuilder:
+    def __init__(self, is_ordered):
+        self.is_ordered = is_ordered
+        self.operations = []
+
+    def diff(self, source, target, path, schema_path):
+        if isinstance(source, dict) and isinstance(target, dict):
+            self._diff_objects(source, target, path, schema_path)
+        elif isinstance(source, list) and isinstance(target, list):
+            if self.is_ordered(schema_path):
+                self._diff_ordered(source, target, path, schema_path)
+            else:
+                self._diff_unordered(source, target, path)
+        elif not json_equal(source, target):
+            self.operations.append(
+                {"op": "replace", "path": _pointer(path), "value": target}
+            )
+
+    def _diff_objects(self, source, target, path, schema_path):
+        for key in source:
+            if key not in target:
+                self.operations.append(
+                    {"op": "remove", "path": _pointer(path + (key,))}
+                )
+        for key, value in target.items():
+            if key in source:
+                self.diff(source[key], value, path + (key,), schema_path + (key,))
+            else:
+                self.operations.append(
+                    {"op": "add", "path": _pointer(path + (key,)), "value": value}
+                )
+
+    def _diff_ordered(self, source, target, path, schema_path):
+        start = 0
+        shortest = min(len(source), len(target))
+        while start < shortest and json_equal(source[start], target[start]):
+            start += 1
+        source_end, target_end = len(source), len(target)
+        while (
+            source_end > start
+            and target_end > start
+            and json_equal(source[source_end - 1], target[target_end - 1])
+        ):
+            source_end -= 1
+            target_end -= 1
+
+        common = min(source_end, target_end) - start
+        for index in range(start, start + common):
+            # members are part of the array property, their index is not
+            self.diff(source[index], target[index], path + (index,), schema_path)
+        # removed from the end, so the indices of the others stay the same
+        for index in reversed(range(start + common, source_end)):
+            self.operations.append({"op": "remove", "path": _pointer(path + (index,))})
+        for index in range(start + common, target_end):
+            self.operations.append(
+                {"op": "add", "path": _pointer(path + (index,)), "value": target[index]}
+            )
+
+    def _diff_unordered(self, source, target, path):
+        removed, added = multiset_difference(source, target)
+        for index in reversed(removed):
+            self.operations.append({"op": "remove", "path": _pointer(path + (index,))})
+        for member in added:
+            self.operations.append(
+                {"op": "add", "path": _pointer(path + ("-",)), "value": member}
+            )
+
+
+def _changed_identifiers(source, target, identifier_paths):
+    missing = object()
+    changed = set()
+    for path in identifier_paths:
+        values = []
+        for document in (source, target):
+            for part in path:
+                try:
+                    document = document[part]
+                except (KeyError, IndexError, TypeError):
+                    document = missing
+                    break
+            values.append(document)
+        if not json_equal(*values):
+            changed.add(tuple(path))
+    return changed
+
+
+def make_patch(source, target, is_ordered=None, identifier_paths=()):
+    """The operations of a JSON patch from the source to the target.
+
+    :param is_ordered: takes the path of an array (without indices) and
+        returns whether the order of its members matters. By default, all
+        arrays are ordered.
+    :param identifier_paths: paths of values that identify the resource, which
+        must be the same in the source and the target
+    :raises IdentifierChangedError: an identifier differs
+
+    >>> make_patch({"a": 1, "b": [1, 2, 3]}, {"b": [1, 4, 3], "c": True})
+    [{'op': 'remove', 'path': '/a'}, \
+{'op': 'replace', 'path': '/b/1', 'value': 4}, \
+{'op': 'add', 'path': '/c', 'value': True}]
+    >>> make_patch({"b": [1, 2, 3]}, {"b": [3, 1, 2]}, is_ordered=lambda path: False)
+    []
+    """
+    changed = _changed_identifiers(source, target, identifier_paths)
+    if changed:
+        raise IdentifierChangedError(changed)
+    builder = _PatchBuilder(is_ordered or _always_ordered)
+    builder.diff(source, target, (), ())
+    return builder.operations
+
+
+def patched_paths(patch):
+    """The paths a patch changes, for example to check only those properties.
+
+    >>> patched_paths([{"op": "replace", "path": "/b/1", "value": 4}])
+    [('b', '1')]
+    """
+    return [
+        JsonPointer.parse(operation["path"], prefix="").parts for operation in patch
+    ]
@@ -4,6 +4,17 @@
 from itertools import chain
 from urllib.parse import quote, unquote
 
+# pointers interned, and strings parsed, before the oldest are evicted
+CACHE_SIZE = 4096
+
+
+def _cache(cache, key, value):
+    while cache and len(cache) >= CACHE_SIZE:
+        # dicts are in insertion order, so this is the oldest entry
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
 
 def part_encode(part):
     """Encode a part of a JSON pointer.
@@ -55,6 +66,110 @@ def part_decode(part):
     return part.replace("~1", "/").replace("~0", "~")
 
 
+class JsonPointer:
+    """An immutable, decoded JSON pointer.
+
+    Recently used pointers are interned, so there is usually a single instance
+    for each sequence of parts. Each caches the strings it was encoded to, and
+    the strings recently parsed are cached as well, so parsing or encoding the
+    same pointer again is a lookup.
+
+    >>> pointer = JsonPointer.parse("#/foo/b~1r")
+    >>> pointer.parts
+    ('foo', 'b/r')
+    >>> pointer is JsonPointer(["foo", "b/r"])
+    True
+    >>> pointer.encode(prefix="")
+    '/foo/b~1r'
+    >>> pointer.parts = ()
+    Traceback (most recent call last):
+    ...
+    AttributeError: JsonPointer is immutable
+    """
+
+    __slots__ = ("parts", "_encoded")
+
+    # (parts, types of the parts) -> JsonPointer
+    _interned = {}
+    # (pointer or segments, prefix) -> JsonPointer
+    _parsed = {}
+
+    def __new__(cls, parts=()):
+        parts = tuple(parts)
+        # e.g. 1, 1.0 and True are equal, but are encoded differently
+        key = (parts, tuple(map(type, parts)))
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        pointer = super().__new__(cls)
+        object.__setattr__(pointer, "parts", parts)
+        object.__setattr__(pointer, "_encoded", {})
+        return _cache(cls._interned, key, pointer)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("JsonPointer is immutable")
+
+    def __reduce__(self):
+        # intern again when unpickled, e.g. in a worker process
+        return (JsonPointer, (self.parts,))
+
+    def __eq__(self, other):
+        if isinstance(other, JsonPointer):
+            return self is other or (
+                self.parts == other.parts
+                and list(map(type, self.parts)) == list(map(type, other.parts))
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.parts)
+
+    def __repr__(self):
+        return f"JsonPointer({self.parts!r})"
+
+    @classmethod
+    def _decode(cls, segments, prefix, key):
+        decoded = (part_decode(unquote(segment)) for segment in segments)
+        actual = next(decoded)
+        if prefix != actual:
+            raise ValueError(f"Expected prefix '{prefix}', but was '{actual}'")
+        return _cache(cls._parsed, key, cls(decoded))
+
+    @classmethod
+    def parse(cls, pointer, prefix="#"):
+        """The pointer for the URI fragment identifier representation.
+
+        :raises ValueError: the pointer does not start with the prefix
+        """
+        try:
+            return cls._parsed[pointer, prefix]
+        except KeyError:
+            return cls._decode(pointer.split("/"), prefix, (pointer, prefix))
+
+    @classmethod
+    def from_segments(cls, segments, prefix="properties"):
+        """The pointer for encoded segments, the first of which is the prefix.
+
+        :raises ValueError: the first segment is not the prefix
+        """
+        segments = tuple(segments)
+        try:
+            return cls._parsed[segments, prefix]
+        except KeyError:
+            return cls._decode(segments, prefix, (segments, prefix))
+
+    def encode(self, prefix="#"):
+        """The URI fragment identifier representation of the pointer."""
+        try:
+            return self._encoded[prefix]
+        except KeyError:
+            pass
+        encoded = (quote(part_encode(part), safe="/~") for part in self.parts)
+        fragment = self._encoded[prefix] = "/".join(chain([prefix], encoded))
+        return fragment
+
+
 def fragment_encode(parts, prefix="#"):
     """Encode all parts of a JSON pointer into the URI fragment
     identifier representation.
@@ -68,8 +183,7 @@ def fragment_encode(parts, prefix="#"):
     >>> fragment_encode([0, " ", "~"])
     '#/0/%20/~0'
     """
-    encoded = (quote(part_encode(part), safe="/~") for part in parts)
-    return "/".join(chain([prefix], encoded))
+    return JsonPointer(parts).encode(prefix)
 
 
 def fragment_decode(pointer, prefix="#", output=tuple):
@@ -89,12 +203,8 @@ def fragment_decode(pointer, prefix="#", output=tuple):
     ...
     ValueError: Expected prefix '#', but was ''
     """
-    segments = pointer.split("/")
-    decoded = (part_decode(unquote(segment)) for segment in segments)
-    actual = next(decoded)
-    if prefix != actual:
-        raise ValueError(f"Expected prefix '{prefix}', but was '{actual}'")
-    return output(decoded)
+    parts = JsonPointer.parse(pointer, prefix).parts
+    return parts if output is tuple else output(parts)
 
 
 def fragment_list(segments, prefix="properties", output=list):
@@ -114,8 +224,5 @@ def fragment_list(segments, prefix="properties", output=list):
     ...
     ValueError: Expected prefix 'properties', but was 'foo'
     """
-    decoded = (part_decode(unquote(segment)) for segment in segments)
-    actual = next(decoded)
-    if prefix != actual:
-        raise ValueError(f"Expected prefix '{prefix}', but was '{actual}'")
-    return output(decoded)
+    parts = JsonPointer.from_segments(segments, prefix).parts
+    return parts if output is tuple else output(parts)
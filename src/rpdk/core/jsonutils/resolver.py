@@ -20,6 +20,11 @@ class ContainerType(Enum):
 
 
 class ResolvedType:
+    __slots__ = ("container", "type", "type_format")
+
+    # primitive types are the same for many properties, so they are shared
+    _primitives = {}
+
     def __init__(self, container, item_type, type_format=FORMAT_DEFAULT):
         self.container = container
         self.type = item_type
@@ -31,6 +36,22 @@ class ResolvedType:
     def __eq__(self, other):
         return self.container == other.container and self.type == other.type
 
+    @classmethod
+    def primitive(cls, item_type, type_format=FORMAT_DEFAULT):
+        """The shared primitive type. It must not be modified.
+
+        >>> ResolvedType.primitive("string") is ResolvedType.primitive("string")
+        True
+        """
+        key = (item_type, type_format)
+        try:
+            return cls._primitives[key]
+        except KeyError:
+            resolved = cls._primitives[key] = cls(
+                ContainerType.PRIMITIVE, item_type, type_format
+            )
+            return resolved
+
 
 class ModelResolver:
     """This class takes in a flattened schema map (output of the JsonSchemaFlattener),
@@ -47,14 +68,19 @@ class ModelResolver:
         self.flattened_schema_map = flattened_schema_map
         self._base_model_name = base_model_name
         self._models = {}
+        # the reverse of _models, to find name conflicts
+        self._ref_paths = {}
+        # by the id of the property schema
+        self._lang_types = {}
+        self._model_types = {}
         self._models_from_refs()
 
     def _models_from_refs(self):
         """Creates a model name for each ref_path in the flattened schema map."""
         for ref_path in self.flattened_schema_map.keys():
-            # cannot convert this into list comprehension as self._models is used
-            # during the loop
-            self._models[ref_path] = self._get_model_name_from_ref(ref_path)
+            class_name = self._get_model_name_from_ref(ref_path)
+            self._models[ref_path] = class_name
+            self._ref_paths.setdefault(class_name, ref_path)
 
     def _get_model_name_from_ref(self, ref_path):
         """Given a json schema ref, returns the best guess at a model name."""
@@ -63,10 +89,8 @@ class ModelResolver:
 
         class_name = base_class_from_ref(ref_path)
         try:
-            dupe_path = next(
-                path for path, name in self._models.items() if name == class_name
-            )
-        except StopIteration:
+            dupe_path = self._ref_paths[class_name]
+        except KeyError:
             return class_name
 
         raise ModelResolverError(
@@ -95,12 +119,31 @@ class ModelResolver:
 
         If the schema is a ref, the class is determined from ``_models``.
         """
+        try:
+            return self._lang_types[id(property_schema)][1]
+        except KeyError:
+            pass
+        resolved = self._resolve_lang_type(property_schema)
+        # the schema is kept, so its id is not reused while it is cached
+        self._lang_types[id(property_schema)] = (property_schema, resolved)
+        return resolved
+
+    def _get_model_lang_type(self, ref_path):
+        try:
+            return self._model_types[ref_path]
+        except KeyError:
+            resolved = self._model_types[ref_path] = ResolvedType(
+                ContainerType.MODEL, self._models[ref_path]
+            )
+            return resolved
+
+    def _resolve_lang_type(self, property_schema):
         try:
             ref_path = property_schema["$ref"]
         except KeyError:
             pass  # we are not dealing with a ref, move on
         else:
-            return ResolvedType(ContainerType.MODEL, self._models[ref_path])
+            return self._get_model_lang_type(ref_path)
 
         schema_type = property_schema.get("type", "object")
 
@@ -133,10 +176,8 @@ class ModelResolver:
 
     @staticmethod
     def _get_primitive_lang_type(schema_type, property_schema):
-        return ResolvedType(
-            ContainerType.PRIMITIVE,
-            schema_type,
-            property_schema.get("format", FORMAT_DEFAULT),
+        return ResolvedType.primitive(
+            schema_type, property_schema.get("format", FORMAT_DEFAULT)
         )
 
     def _get_array_lang_type(self, property_schema):
@@ -0,0 +1,129 @@
+"""Look up the schema of a property in a resource model by its path.
+
+Paths are the property names from the root of the model, such as
+``("Rules", "Tags")``. Members of arrays are not part of the path, so the
+properties of the items of an array are found under the path of the array.
+
+The index is built once for a schema. Each property schema is resolved (its
+``$ref`` followed) and becomes one node, so a definition that refers to itself
+makes a cycle instead of an endless tree. Looking up a path is then a
+dictionary lookup for each step the first time, and a single one afterwards.
+"""
+import logging
+from collections.abc import Mapping
+
+from .pointer import fragment_decode
+
+LOG = logging.getLogger(__name__)
+
+COMBINERS = ("allOf", "anyOf", "oneOf")
+
+
+class SchemaNode:
+    __slots__ = ("type", "insertion_order", "unique_items", "array_type", "children")
+
+    def __init__(self, schema):
+        self.type = schema.get("type")
+        self.insertion_order = schema.get("insertionOrder", True)
+        self.unique_items = schema.get("uniqueItems", False)
+        self.array_type = schema.get("arrayType")
+        self.children = {}
+
+    def __repr__(self):
+        return (
+            f"SchemaNode(type={self.type!r}, insertion_order="
+            f"{self.insertion_order!r}, children={sorted(self.children)!r})"
+        )
+
+
+class SchemaIndex:
+    """
+    >>> index = SchemaIndex({
+    ...     "definitions": {"Tags": {"type": "array", "insertionOrder": False}},
+    ...     "properties": {"Tags": {"$ref": "#/definitions/Tags"}},
+    ... })
+    >>> index[("Tags",)].insertion_order
+    False
+    >>> index[("Missing", "Tags")] is None
+    True
+    """
+
+    def __init__(self, schema):
+        self._schema = schema
+        # by the id of the unresolved schema, which is unique in the document
+        self._nodes = {}
+        root = self._node(schema) if isinstance(schema, Mapping) else None
+        self._paths = {(): root}
+
+    def __getitem__(self, path):
+        """The node for a model path, or ``None`` if the schema has no such
+        property."""
+        try:
+            return self._paths[path]
+        except KeyError:
+            pass
+        parent = self[path[:-1]]
+        node = parent.children.get(path[-1]) if parent else None
+        self._paths[path] = node
+        return node
+
+    def _lookup(self, ref):
+        target = self._schema
+        try:
+            for part in fragment_decode(ref):
+                target = target[part]
+        except (KeyError, TypeError, ValueError):
+            LOG.debug("Cannot resolve '%s', indexing it as an empty schema", ref)
+            return {}
+        return target
+
+    def _resolve(self, schema):
+        """The schema merged with the schemas it refers to."""
+        seen = set()
+        while isinstance(schema, Mapping) and "$ref" in schema:
+            ref = schema["$ref"]
+            if ref in seen:
+                break
+            seen.add(ref)
+            target = self._lookup(ref)
+            if not isinstance(target, Mapping):
+                target = {}
+            schema = {**target, **{k: v for k, v in schema.items() if k != "$ref"}}
+        return schema if isinstance(schema, Mapping) else {}
+
+    def _object_schemas(self, schema, seen):
+        """The resolved schema, and the schemas whose properties are found under
+        its path: array items, and subschemas of combiners."""
+        if id(schema) in seen:
+            return
+        seen.add(id(schema))
+        resolved = self._resolve(schema)
+        yield resolved
+        items = resolved.get("items")
+        if isinstance(items, Mapping):
+            yield from self._object_schemas(items, seen)
+        for combiner in COMBINERS:
+            for subschema in resolved.get(combiner, ()):
+                yield from self._object_schemas(subschema, seen)
+
+    def _node(self, schema):
+        try:
+            return self._nodes[id(schema)]
+        except KeyError:
+            pass
+        object_schemas = self._object_schemas(schema, set())
+        resolved = next(object_schemas)
+        # registered before its children, which may refer back to it
+        node = self._nodes[id(schema)] = SchemaNode(resolved)
+        self._add_children(node, resolved)
+        for object_schema in object_schemas:
+            self._add_children(node, object_schema)
+        return node
+
+    def _add_children(self, node, schema):
+        properties = schema.get("properties")
+        if not isinstance(properties, Mapping):
+            return
+        for name, subschema in properties.items():
+            if name not in node.children and isinstance(subschema, Mapping):
+                node.children[name] = self._node(subschema)
@@ -3,7 +3,7 @@ import hashlib
 import json
 import logging
 from collections.abc import Mapping, Sequence
-from typing import Any, List, Tuple
+from typing import Any, Iterator, List, Tuple
 
 from nested_lookup import nested_lookup
 from ordered_set import OrderedSet
@@ -22,18 +22,66 @@ class FlatteningError(Exception):
     pass
 
 
+def _canonical_chunks(item, chunks):
+    """Append a canonical encoding of a JSON value to ``chunks``. Object keys
+    are sorted, and the members of arrays are encoded by their sorted digests,
+    so neither order matters. Numbers that are equal encode the same."""
+    if isinstance(item, dict):
+        chunks.append(b"{")
+        for key in sorted(item):
+            encoded = str(key).encode("utf-8")
+            chunks.append(b"%d:" % len(encoded))
+            chunks.append(encoded)
+            _canonical_chunks(item[key], chunks)
+        chunks.append(b"}")
+    elif isinstance(item, (list, tuple)):
+        chunks.append(b"[")
+        chunks.extend(sorted(_digest(member) for member in item))
+        chunks.append(b"]")
+    elif isinstance(item, str):
+        encoded = item.encode("utf-8")
+        chunks.append(b"s%d:" % len(encoded))
+        chunks.append(encoded)
+    elif item is None or isinstance(item, bool):
+        chunks.append(b"n" if item is None else b"t" if item else b"f")
+    elif isinstance(item, float) and not item.is_integer():
+        chunks.append(b"d%r;" % item)
+    else:
+        chunks.append(b"i%d;" % item)
+
+
+def _digest(item):
+    chunks = []
+    _canonical_chunks(item, chunks)
+    return hashlib.blake2b(b"".join(chunks), digest_size=16).digest()
+
+
 def item_hash(
     item,
 ):  # assumption -> input is only json comparable type (dict/list/scalar)
-    """MD5 hash for an item (Dictionary/Iterable/Scalar)"""
-    dhash = hashlib.md5()  # nosec
-    if isinstance(item, dict):
-        item = {k: item_hash(v) for k, v in item.items()}
-    if isinstance(item, list):
-        item = [item_hash(i) for i in item].sort()
-    encoded = json.dumps(item, sort_keys=True).encode()
-    dhash.update(encoded)
-    return dhash.hexdigest()
+    """Hash for an item (Dictionary/Iterable/Scalar), which is the same for
+    items that are equal, except for the order of array members.
+
+    >>> item_hash({"a": [1, 2], "b": None}) == item_hash({"b": None, "a": [2, 1]})
+    True
+    >>> item_hash([[1], [2]]) == item_hash([[1], [3]])
+    False
+    >>> item_hash([1, 1]) == item_hash([1])
+    False
+    >>> item_hash(1) == item_hash(1.0) != item_hash(True)
+    True
+    """
+    return _digest(item).hex()
+
+
+def schema_hash(schema):
+    """A digest of the schema content, independent of key order.
+
+    >>> schema_hash({"a": 1, "b": 2}) == schema_hash({"b": 2, "a": 1})
+    True
+    """
+    encoded = json.dumps(schema, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
 
 
 def to_set(value: Any) -> OrderedSet:
@@ -244,90 +292,136 @@ def traverse_path_for_sequence_members(
     ...
     IndexError: list index out of range
     """
-    if path is None:
-        path = []
-    if not path_parts:
-        return [document], [tuple(path)]
-    path_parts = list(path_parts)
-    if not isinstance(document, Sequence):
-        return _handle_non_sequence_for_traverse(document, path_parts, path)
-    return _handle_sequence_for_traverse(document, path_parts, path)
+    documents = []
+    resolved_paths = []
+    for document, resolved_path in iter_path_for_sequence_members(
+        document, path_parts, path or ()
+    ):
+        documents.append(document)
+        resolved_paths.append(resolved_path)
+    return documents, resolved_paths
 
 
-def _handle_non_sequence_for_traverse(
-    current_document: dict, current_path_parts: list, current_path: list
-) -> Tuple[List[object], List[tuple]]:
-    """
-    Handling a non-sequence member for `traverse_path_for_sequence_members` is like the loop block in `traverse`:
+def _path_members(document, part, path: tuple) -> Iterator[Tuple[object, tuple]]:
+    if not isinstance(document, Sequence):
+        return iter([(document[part], path + (part,))])
+    if part == UNPACK_SEQUENCE_IDENTIFIER:
+        return ((member, path + (index,)) for index, member in enumerate(document))
+    # otherwise, the part should be a valid index
+    index = int(part)
+    return iter([(document[index], path + (index,))])
+
+
+def iter_path_for_sequence_members(
+    document, path_parts: Sequence, path: Sequence = ()
+) -> Iterator[Tuple[object, tuple]]:
+    """Like :func:`traverse_path_for_sequence_members`, but yield each document
+    and its resolved path as they are reached, so even sequences with many
+    members are traversed in linear time and constant memory. The document
+    must not be modified until the traversal is complete.
 
-    The next path part is the first part in the list of path parts.
-    The new document is obtained from the current document using the new path part as the key.
-    The next path part is added to the traversed path.
+    :raises ValueError, LookupError: the reference is invalid for this document
 
-    The traversal continues by recursively calling `traverse_path_for_sequence_members`
+    >>> document = {"foo": [{"bar": 1}, {"bar": 2}]}
+    >>> list(iter_path_for_sequence_members(document, ("foo", "*", "bar")))
+    [(1, ('foo', 0, 'bar')), (2, ('foo', 1, 'bar'))]
+    >>> list(iter_path_for_sequence_members(document, ("foo", "1", "bar")))
+    [(2, ('foo', 1, 'bar'))]
     """
-    part_to_handle = current_path_parts.pop(0)
-    current_document = current_document[part_to_handle]
-    current_path.append(part_to_handle)
-    return traverse_path_for_sequence_members(
-        current_document, current_path_parts, current_path
-    )
+    path_parts = tuple(path_parts)
+    # one iterator of (document, resolved path) for each part traversed so far
+    stack = [iter([(document, tuple(path))])]
+    while stack:
+        try:
+            document, resolved_path = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        depth = len(stack) - 1
+        if depth == len(path_parts):
+            yield document, resolved_path
+        else:
+            stack.append(_path_members(document, path_parts[depth], resolved_path))
 
 
-def _handle_sequence_for_traverse(
-    current_document: Sequence, current_path_parts: list, current_path: list
-) -> Tuple[List[object], List[tuple]]:
-    """
-    Check the new path part for the unpack sequence identifier (e.g. '*'), otherwise traverse index and continue:
+class _PathNode:
+    __slots__ = ("children", "terminal")
 
-    The new document is obtained from the current document (a sequence) using the new path part as the index.
-    The next path part is added to the traversed path
-    """
-    sequence_part = current_path_parts.pop(0)
-    if sequence_part == UNPACK_SEQUENCE_IDENTIFIER:
-        return _handle_unpack_sequence_for_traverse(
-            current_document, current_path_parts, current_path
-        )
-    # otherwise, sequence part should be a valid index
-    current_sequence_part = int(sequence_part)
-    current_document = current_document[current_sequence_part]
-    current_path.append(current_sequence_part)
-    return [current_document], [tuple(current_path)]
-
-
-def _handle_unpack_sequence_for_traverse(
-    current_document: Sequence, current_path_parts: list, current_path: list
-) -> Tuple[List[object], List[tuple]]:
-    """
-    When unpacking a sequence, we need to include multiple paths and multiple documents, one for each sequence member.
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
 
-    For each sequence member:
-    Append the traversed paths w/ the sequence index, and get the new document.
-    The new document is obtained by traversing the current document using the sequence index.
-    The new document is appended to the list of new documents.
 
-    For each new document:
-    The remaining document is traversed using the remaining path parts.
-    The list of traversed documents and traversed paths are returned.
+def _sequence_indices(sequence, part):
+    if part == UNPACK_SEQUENCE_IDENTIFIER:
+        return range(len(sequence))
+    try:
+        index = int(part)
+    except ValueError:
+        return ()
+    if -len(sequence) <= index < len(sequence):
+        return (index % len(sequence),)
+    return ()
+
+
+class PathTrie:
+    """Paths compiled into a prefix tree, so all of them can be pruned from a
+    document in a single traversal.
+
+    Like :func:`traverse`, parts of a path are keys of objects, or indices of
+    sequences. The unpack sequence identifier (``*``) matches every member of
+    a sequence. Parts that do not exist in the document are ignored.
+
+    >>> trie = PathTrie([("foo", "*", "bar"), ("spam",)])
+    >>> trie.prune({"foo": [{"bar": 1, "baz": 2}, {"bar": 3}], "spam": "eggs"})
+    {'foo': [{'baz': 2}, {}]}
+    >>> sorted(trie)
+    [('foo', '*', 'bar'), ('spam',)]
     """
-    documents = []
-    resolved_paths = []
-    new_documents = []
-    new_paths = []
-    for sequence_index in range(len(current_document)):
-        new_paths.append(current_path.copy() + [sequence_index])
-        new_document = traverse_path_for_sequence_members(
-            current_document, [sequence_index] + current_path_parts, current_path.copy()
-        )[0]
-        new_documents.extend(new_document)
-    for i in range(len(new_documents)):  # pylint: disable=consider-using-enumerate
-        new_document = new_documents[i]
-        newer_documents, newer_paths = traverse_path_for_sequence_members(
-            new_document, current_path_parts, new_paths[i]
-        )
-        documents.extend(newer_documents)
-        resolved_paths.extend(newer_paths)
-    return documents, resolved_paths
+
+    __slots__ = ("_paths", "_root")
+
+    def __init__(self, paths=()):
+        self._paths = frozenset(tuple(path) for path in paths)
+        self._root = _PathNode()
+        for path in self._paths:
+            node = self._root
+            for part in path:
+                node = node.children.setdefault(part, _PathNode())
+            node.terminal = True
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def prune(self, document):
+        """Remove all paths from the document. The document is modified in-place,
+        but also returned for convenience."""
+        self._prune(self._root, document)
+        return document
+
+    def _prune(self, node, document):
+        if isinstance(document, Mapping):
+            for part, child in node.children.items():
+                if part not in document:
+                    continue
+                if child.terminal:
+                    del document[part]
+                else:
+                    self._prune(child, document[part])
+        elif isinstance(document, list):
+            # all indices refer to the sequence before any member is removed
+            removed = set()
+            for part, child in node.children.items():
+                for index in _sequence_indices(document, part):
+                    if child.terminal:
+                        removed.add(index)
+                    else:
+                        self._prune(child, document[index])
+            for index in sorted(removed, reverse=True):
+                del document[index]
 
 
 def schema_merge(target, src, path):  # noqa: C901 # pylint: disable=R0912
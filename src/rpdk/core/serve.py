@@ -0,0 +1,295 @@
+"""This sub command serves the Lambda Invoke API locally, as a stand-in for
+'sam local start-lambda'. Invocations are dispatched to a pool of long-running
+handler workers, instead of starting a new container per invocation.
+
+Projects can be created via the 'init' sub command.
+"""
+import json
+import logging
+import queue
+import re
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import docker
+
+from .contract.local_handler import TRANSPORT_SUBPROCESS, create_local_handler
+from .exceptions import InvalidProjectError
+from .project import ARTIFACT_TYPE_HOOK, ARTIFACT_TYPE_MODULE, Project
+from .test import DEFAULT_ENDPOINT, DEFAULT_FUNCTION, DEFAULT_REGION, DEFAULT_TIMEOUT
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(DEFAULT_ENDPOINT.rsplit(":", 1)[1])
+DEFAULT_WORKERS = 4
+INVOKE_PATH = re.compile(r"^/2015-03-31/functions/(?P<function>[^/]+)/invocations$")
+HOOK_RESPONSE_PATTERN = re.compile(
+    r"__CFN_HOOK_START_RESPONSE__([\s\S]*)__CFN_HOOK_END_RESPONSE__"
+)
+RESOURCE_RESPONSE_PATTERN = re.compile(
+    r"__CFN_RESOURCE_START_RESPONSE__([\s\S]*)__CFN_RESOURCE_END_RESPONSE__"
+)
+
+
+class ContainerPool:
+    """Runs the executable entrypoint in a pool of long-running containers of
+    the handler image, so an invocation is a ``docker exec`` rather than a
+    container start."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, image, executable_entrypoint, size, timeout, response_pattern, region
+    ):
+        self._client = docker.from_env()
+        self._image = image
+        # the containers idle on ``sleep``, so the image's own entrypoint
+        # (e.g. ``java -cp handler.jar``) has to be part of each exec
+        config = self._client.images.get(image).attrs["Config"]
+        self._command = list(config.get("Entrypoint") or []) + shlex.split(
+            executable_entrypoint
+        )
+        self._timeout = timeout
+        self._response_pattern = response_pattern
+        self._environment = {"AWS_REGION": region}
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._containers = queue.Queue()
+        for _ in range(size):
+            self._containers.put(self._start_container())
+
+    def _start_container(self):
+        container = self._client.containers.run(
+            self._image,
+            entrypoint=["sleep"],
+            command=["infinity"],
+            environment=self._environment,
+            detach=True,
+            remove=True,
+        )
+        LOG.debug("Started handler container %s", container.short_id)
+        return container
+
+    def invoke(self, payload):
+        container = self._containers.get()
+        try:
+            future = self._executor.submit(
+                container.exec_run,
+                self._command + [json.dumps(payload, ensure_ascii=False)],
+                environment=self._environment,
+            )
+            try:
+                _exit_code, output = future.result(self._timeout)
+            except FutureTimeoutError as e:
+                # the handler is still running, replace the container
+                container.kill()
+                container = self._start_container()
+                raise TimeoutError(
+                    f"Handler did not respond within {self._timeout} seconds"
+                ) from e
+        finally:
+            self._containers.put(container)
+
+        result = output.decode().strip()
+        LOG.debug("=== Handler execution logs ===")
+        LOG.debug(result)
+        match = self._response_pattern.search(result)
+        if not match:
+            raise ValueError("Handler output does not contain a response")
+        return json.loads(match.group(1))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        while not self._containers.empty():
+            self._containers.get().kill()
+
+
+class LambdaInvokeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, address, backend, function_name, concurrency, timeout):
+        super().__init__(address, InvokeRequestHandler)
+        self.backend = backend
+        self.function_name = function_name
+        self.invoke_timeout = timeout
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+
+class InvokeRequestHandler(BaseHTTPRequestHandler):
+    # keep connections alive between invocations
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOG.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, document, headers=None):
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, error_type, message):
+        self._send_json(
+            status,
+            {"Type": "User", "message": message},
+            {"x-amzn-ErrorType": error_type},
+        )
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        match = INVOKE_PATH.match(self.path)
+        if not match:
+            self._send_error(
+                HTTPStatus.NOT_FOUND, "ResourceNotFoundException", "Unknown path"
+            )
+            return
+        function_name = match.group("function")
+        if function_name != self.server.function_name:
+            self._send_error(
+                HTTPStatus.NOT_FOUND,
+                "ResourceNotFoundException",
+                f"Function not found: {function_name}",
+            )
+            return
+        if not self.server.slots.acquire(timeout=self.server.invoke_timeout):
+            self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "TooManyRequestsException",
+                "Rate Exceeded.",
+            )
+            return
+        try:
+            response = self.server.backend.invoke(json.loads(body or b"{}"))
+        except Exception as e:  # pylint: disable=broad-except
+            LOG.debug("Handler invocation failed", exc_info=e)
+            # same as an unhandled error in a Lambda function
+            self._send_json(
+                HTTPStatus.OK,
+                {"errorType": type(e).__name__, "errorMessage": str(e)},
+                {"X-Amz-Function-Error": "Unhandled"},
+            )
+        else:
+            self._send_json(HTTPStatus.OK, response)
+        finally:
+            self.server.slots.release()
+
+
+def create_backend(args, project):
+    timeout = int(args.timeout)
+    if args.docker_image:
+        if not project.executable_entrypoint:
+            raise InvalidProjectError(
+                "executableEntrypoint not set in .rpdk-config. "
+                "Have you run cfn generate?"
+            )
+        return ContainerPool(
+            args.docker_image,
+            project.executable_entrypoint,
+            args.workers,
+            timeout,
+            HOOK_RESPONSE_PATTERN
+            if project.artifact_type == ARTIFACT_TYPE_HOOK
+            else RESOURCE_RESPONSE_PATTERN,
+            args.region,
+        )
+    if not (project.runtime or "").startswith("python"):
+        raise InvalidProjectError(
+            "Only Python handlers can be served without a Docker image. "
+            "Build one with 'cfn build-image' and pass it with --docker-image"
+        )
+    return create_local_handler(
+        TRANSPORT_SUBPROCESS,
+        project,
+        args.function_name,
+        processes=args.workers,
+        timeout=timeout,
+    )
+
+
+def serve(args):
+    project = Project()
+    project.load()
+    if project.artifact_type == ARTIFACT_TYPE_MODULE:
+        LOG.warning("The serve command is not supported in a module project")
+        return
+
+    backend = create_backend(args, project)
+    server = LambdaInvokeServer(
+        (args.host, args.port),
+        backend,
+        args.function_name,
+        args.workers,
+        int(args.timeout),
+    )
+    LOG.warning(
+        "Serving '%s' at http://%s:%s with %d workers",
+        args.function_name,
+        args.host,
+        server.server_address[1],
+        args.workers,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.close()
+
+
+def setup_subparser(subparsers, parents):
+    # see docstring of this file
+    parser = subparsers.add_parser("serve", description=__doc__, parents=parents)
+    parser.set_defaults(command=serve)
+
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"The address to listen on (Default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"The port to listen on (Default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--function-name",
+        default=DEFAULT_FUNCTION,
+        help=f"The function name to serve (Default: {DEFAULT_FUNCTION})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "The number of handler workers, i.e. the maximum number of concurrent "
+            f"invocations (Default: {DEFAULT_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--timeout",
+        default=DEFAULT_TIMEOUT,
+        help=f"Per-invocation timeout in seconds (Default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--docker-image",
+        help=(
+            "Handler image to run, e.g. built with 'cfn build-image'. Required for "
+            "handlers that are not written in Python"
+        ),
+    )
+    parser.add_argument(
+        "--region",
+        default=DEFAULT_REGION,
+        help=f"The region set for the handler (Default: {DEFAULT_REGION})",
+    )
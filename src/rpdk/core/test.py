@@ -6,7 +6,7 @@ import json
 import logging
 import os
 import re
-from argparse import SUPPRESS
+from argparse import SUPPRESS, ArgumentTypeError
 from collections import OrderedDict
 from contextlib import contextmanager
 from pathlib import Path
@@ -21,9 +21,14 @@ from rpdk.core.jsonutils.pointer import fragment_decode
 from rpdk.core.utils.handler_utils import generate_handler_name
 
 from .boto_helpers import create_sdk_session, get_temporary_credentials
+from .contract.cassette import Cassette
 from .contract.contract_plugin import ContractPlugin
+from .contract.example_corpus import CORPUS_DIRECTORY, ExampleCorpus
+from .contract.generation_stats import GenerationStats
 from .contract.interface import Action, HookInvocationPoint
+from .contract.local_handler import TRANSPORT_LAMBDA, TRANSPORTS, create_local_handler
 from .contract.resource_client import ResourceClient
+from .contract.target_examples import TARGET_EXAMPLES_DIRECTORY, TargetExampleCache
 from .data_loaders import copy_resource
 from .exceptions import SysExitRecommendedError
 from .project import ARTIFACT_TYPE_HOOK, ARTIFACT_TYPE_MODULE, Project
@@ -361,7 +366,50 @@ def get_marker_options(schema):
     return " and ".join(marker_list)
 
 
-def get_contract_plugin_client(args, project, overrides, inputs):
+def get_cassette(args):
+    if args.record:
+        return Cassette(args.record, Cassette.RECORD)
+    if args.replay:
+        return Cassette(args.replay, Cassette.REPLAY)
+    return None
+
+
+def get_corpus(args, project):
+    if args.corpus:
+        return ExampleCorpus.for_schema(project.root, project.schema)
+    return None
+
+
+def get_target_example_cache(args, project):
+    if not args.target_example_cache:
+        return None
+    if args.seed is None:
+        # a random seed would never be used again
+        LOG.warning("--target-example-cache requires --seed, not caching examples")
+        return None
+    return TargetExampleCache(Path(project.root) / TARGET_EXAMPLES_DIRECTORY)
+
+
+def get_generation_stats(args):
+    # only measured when asked for, since it slows generation down
+    if args.verbose:
+        return GenerationStats()
+    return None
+
+
+def get_local_handler(args, project):
+    return create_local_handler(
+        args.transport,
+        project,
+        args.function_name,
+        timeout=int(args.enforce_timeout) * 2,
+    )
+
+
+# pylint: disable=too-many-arguments
+def get_contract_plugin_client(
+    args, project, overrides, inputs, cassette=None, local_handler=None
+):
     plugin_clients = {}
     if project.artifact_type == ARTIFACT_TYPE_HOOK:
         plugin_clients["hook_client"] = HookClient(
@@ -381,9 +429,18 @@ def get_contract_plugin_client(args, project, overrides, inputs):
             docker_image=args.docker_image,
             typeconfig=args.typeconfig,
             target_info=project._load_target_info(  # pylint: disable=protected-access
-                args.cloudformation_endpoint_url, args.region
+                args.cloudformation_endpoint_url,
+                args.region,
+                local_only=bool(cassette and cassette.replaying),
             ),
             profile=args.profile,
+            max_callback_delay=args.max_callback_delay,
+            cassette=cassette,
+            local_handler=local_handler,
+            seed=args.seed,
+            generation_stats=get_generation_stats(args),
+            target_example_cache=get_target_example_cache(args, project),
+            target_sample=None if args.full else args.target_sample,
         )
         LOG.debug("Setup plugin for HOOK type")
         return plugin_clients
@@ -405,6 +462,13 @@ def get_contract_plugin_client(args, project, overrides, inputs):
         executable_entrypoint=project.executable_entrypoint,
         docker_image=args.docker_image,
         profile=args.profile,
+        max_callback_delay=args.max_callback_delay,
+        cassette=cassette,
+        local_handler=local_handler,
+        seed=args.seed,
+        coverage_candidates=args.coverage_candidates,
+        generation_stats=get_generation_stats(args),
+        corpus=get_corpus(args, project),
     )
     LOG.debug("Setup plugin for RESOURCE type")
     return plugin_clients
@@ -438,28 +502,40 @@ def test(args):
         )
         filter_overrides(overrides, project)
 
-    index = 1
-    while True:
-        inputs = get_inputs(
-            project.root,
-            args.region,
-            args.cloudformation_endpoint_url,
-            index,
-            args.role_arn,
-            args.profile,
-            headers={"account_id": args.source_account, "source_arn": args.source_arn},
-        )
-        if not inputs:
-            break
-        invoke_test(args, project, overrides, inputs)
-        index = index + 1
-
-    if index == 1:
-        invoke_test(args, project, overrides, None)
-
-
-def invoke_test(args, project, overrides, inputs):
-    plugin_clients = get_contract_plugin_client(args, project, overrides, inputs)
+    cassette = get_cassette(args)
+    local_handler = get_local_handler(args, project)
+    try:
+        index = 1
+        while True:
+            inputs = get_inputs(
+                project.root,
+                args.region,
+                args.cloudformation_endpoint_url,
+                index,
+                args.role_arn,
+                args.profile,
+                headers={
+                    "account_id": args.source_account,
+                    "source_arn": args.source_arn,
+                },
+            )
+            if not inputs:
+                break
+            invoke_test(args, project, overrides, inputs, cassette, local_handler)
+            index = index + 1
+
+        if index == 1:
+            invoke_test(args, project, overrides, None, cassette, local_handler)
+    finally:
+        if local_handler:
+            local_handler.close()
+
+
+# pylint: disable=too-many-arguments
+def invoke_test(args, project, overrides, inputs, cassette=None, local_handler=None):
+    plugin_clients = get_contract_plugin_client(
+        args, project, overrides, inputs, cassette, local_handler
+    )
     plugin = ContractPlugin(plugin_clients)
     with temporary_ini_file() as path:
         pytest_args = ["-c", path, "-m", get_marker_options(project.schema)]
@@ -477,6 +553,13 @@ def invoke_test(args, project, overrides, inputs):
             raise SysExitRecommendedError("One or more contract tests failed")
 
 
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
 def setup_subparser(subparsers, parents):
     # see docstring of this file
     parser = subparsers.add_parser("test", description=__doc__, parents=parents)
@@ -500,6 +583,97 @@ def setup_subparser(subparsers, parents):
         help="Enforce a different timeout for handlers",
     )
 
+    parser.add_argument(
+        "--max-callback-delay",
+        type=float,
+        help=(
+            "Fast-forward IN_PROGRESS callbacks by sleeping at most this many"
+            " seconds between re-invocations (0 skips the wait). Requested delays"
+            " are still recorded, and counted in the durations of operations."
+            " Intended for handlers talking to local services."
+        ),
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help=(
+            "Seed for generating example models, to reproduce the examples of a"
+            " previous run. The seed of a run is shown in the pytest header."
+        ),
+    )
+
+    parser.add_argument(
+        "--coverage-candidates",
+        type=positive_int,
+        metavar="N",
+        help=(
+            "Draw N candidate models for each generated CREATE/UPDATE example and"
+            " use the one that exercises the most schema features not exercised"
+            " yet (properties, enum values, oneOf/anyOf branches, array sizes)."
+            " The schema coverage is reported at the end of the run."
+        ),
+    )
+
+    parser.add_argument(
+        "--corpus",
+        action="store_true",
+        help=(
+            "Store the create and update models the handlers succeeded with in"
+            f" {CORPUS_DIRECTORY}/ in the project, and try them again before"
+            " generating new ones in later runs with the same schema. The values"
+            " of write-only and overridden properties are not stored."
+        ),
+    )
+
+    parser.add_argument(
+        "--target-example-cache",
+        action="store_true",
+        help=(
+            "Hooks only: store the examples generated for the targets in"
+            f" {TARGET_EXAMPLES_DIRECTORY}/ in the project, and reuse them in later"
+            " runs with the same --seed. Requires --seed."
+        ),
+    )
+
+    target_sample_group = parser.add_mutually_exclusive_group()
+    target_sample_group.add_argument(
+        "--target-sample",
+        type=positive_int,
+        metavar="N",
+        help=(
+            "Hooks only: test at most N of the targets each wildcard target name"
+            " matches, spread across service namespaces and schema shapes. The"
+            " sample is chosen with the example seed, see --seed."
+        ),
+    )
+    target_sample_group.add_argument(
+        "--full",
+        action="store_true",
+        help="Hooks only: test every target wildcard target names match (default).",
+    )
+
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help=(
+            "Record every handler request and response to the cassette directory"
+            " DIR. Credentials, tokens, and the values of write-only and overridden"
+            " resource properties are redacted. Other values, such as hook target"
+            " models and callback contexts, are saved in plain text."
+        ),
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help=(
+            "Serve handler responses from the cassette directory DIR instead of"
+            " invoking the handler. Requests must match the recorded ones, e.g."
+            " by using the same inputs files."
+        ),
+    )
+
     parser.add_argument(
         "--log-group-name",
         help=(
@@ -573,6 +747,16 @@ def _sam_arguments(parser):
         default=DEFAULT_PROFILE,
         help=f"The profile used for temporary credentials (Default: {DEFAULT_PROFILE})",
     )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=TRANSPORT_LAMBDA,
+        help=(
+            "How the handler is invoked. 'in-process' and 'subprocess' import the"
+            " entrypoint of a Python project and call it directly, instead of"
+            f" going through the Lambda API or Docker (Default: {TRANSPORT_LAMBDA})"
+        ),
+    )
 
 
 def _validate_sam_args(args):
@@ -582,3 +766,7 @@ def _validate_sam_args(args):
         raise SysExitRecommendedError(
             "Cannot specify both --docker-image and --endpoint or --function-name"
         )
+    if args.docker_image and args.transport != TRANSPORT_LAMBDA:
+        raise SysExitRecommendedError(
+            f"Cannot specify both --docker-image and --transport {args.transport}"
+        )
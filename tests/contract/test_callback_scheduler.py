@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+import pytest
+
+from rpdk.core.contract.callback_scheduler import CallbackScheduler
+
+
+def test_sleep_full_delay_by_default():
+    scheduler = CallbackScheduler()
+    with patch("rpdk.core.contract.callback_scheduler.time.sleep") as mock_sleep:
+        scheduler.sleep(30)
+
+    mock_sleep.assert_called_once_with(30)
+    assert not scheduler.fast_forward
+    assert scheduler.requested_delays == [30]
+    assert scheduler.skipped_seconds == 0
+
+
+def test_sleep_capped_delay_advances_virtual_clock():
+    scheduler = CallbackScheduler(max_delay=2)
+    with patch("rpdk.core.contract.callback_scheduler.time.sleep") as mock_sleep:
+        scheduler.sleep(30)
+        scheduler.sleep(1)
+
+    assert [call.args for call in mock_sleep.call_args_list] == [(2,), (1,)]
+    assert scheduler.fast_forward
+    assert scheduler.requested_delays == [30, 1]
+    assert scheduler.skipped_seconds == 28
+
+
+def test_time_includes_skipped_delays():
+    scheduler = CallbackScheduler(max_delay=0)
+    with patch("rpdk.core.contract.callback_scheduler.time") as mock_time:
+        mock_time.time.return_value = 100
+        scheduler.sleep(60)
+        assert scheduler.time() == 160
+    mock_time.sleep.assert_called_once_with(0)
+
+
+def test_negative_max_delay_rejected():
+    with pytest.raises(ValueError):
+        CallbackScheduler(max_delay=-1)
@@ -0,0 +1,237 @@
+# fixture and parameter have the same name
+# pylint: disable=redefined-outer-name,protected-access
+import json
+from unittest.mock import patch
+
+import pytest
+
+from rpdk.core.contract.cassette import (
+    METADATA_FILE,
+    REDACTED,
+    Cassette,
+    normalize_request,
+    request_key,
+)
+from rpdk.core.contract.interface import Action, OperationStatus
+from rpdk.core.contract.resource_client import ResourceClient
+from rpdk.core.exceptions import CassetteError
+from rpdk.core.test import DEFAULT_FUNCTION, DEFAULT_REGION, empty_override
+
+SCHEMA = {
+    "properties": {"a": {"type": "string"}},
+    "primaryIdentifier": ["/properties/a"],
+    "handlers": {"create": {}, "delete": {}, "read": {}},
+}
+
+
+def make_request(token, model):
+    return {
+        "requestData": {
+            "callerCredentials": {"accessKeyId": "AKIA", "sessionToken": token},
+            "resourceProperties": model,
+            "previousResourceProperties": None,
+            "logicalResourceId": token,
+        },
+        "action": "CREATE",
+        "bearerToken": token,
+        "callbackContext": None,
+    }
+
+
+@pytest.fixture
+def cassette_dir(tmp_path):
+    return tmp_path / "cassette"
+
+
+def test_normalize_request_redacts_credentials_and_tokens():
+    normalized = normalize_request(make_request("token", {"a": "b"}))
+
+    assert normalized["requestData"]["callerCredentials"] == REDACTED
+    assert normalized["requestData"]["logicalResourceId"] == REDACTED
+    assert normalized["requestData"]["resourceProperties"] == {"a": "b"}
+    assert normalized["requestData"]["previousResourceProperties"] is None
+    assert normalized["bearerToken"] == REDACTED
+
+
+def test_request_key_ignores_tokens_but_not_models():
+    assert request_key(make_request("one", {"a": "b"})) == request_key(
+        make_request("two", {"a": "b"})
+    )
+    assert request_key(make_request("one", {"a": "b"})) != request_key(
+        make_request("one", {"a": "c"})
+    )
+
+
+def test_record_then_replay(cassette_dir):
+    recorder = Cassette(cassette_dir, Cassette.RECORD)
+    recorder.account = "123456789012"
+    recorder.record(make_request("one", {"a": "b"}), {"status": "IN_PROGRESS"})
+    recorder.record(make_request("two", {"a": "b"}), {"status": "SUCCESS"})
+
+    written = "\n".join(path.read_text() for path in cassette_dir.iterdir())
+    assert "AKIA" not in written
+
+    player = Cassette(cassette_dir, Cassette.REPLAY)
+    assert player.account == "123456789012"
+    request = make_request("three", {"a": "b"})
+    assert player.replay(request) == {"status": "IN_PROGRESS"}
+    assert player.replay(request) == {"status": "SUCCESS"}
+    # repeated more often than recorded
+    assert player.replay(request) == {"status": "SUCCESS"}
+
+
+def test_replay_unknown_request(cassette_dir):
+    Cassette(cassette_dir, Cassette.RECORD).account = "123456789012"
+    player = Cassette(cassette_dir, Cassette.REPLAY)
+
+    with pytest.raises(CassetteError):
+        player.replay(make_request("one", {"a": "b"}))
+
+
+def test_replay_not_a_cassette(tmp_path):
+    with pytest.raises(CassetteError):
+        Cassette(tmp_path, Cassette.REPLAY)
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path, "rewind")
+
+
+def test_resource_client_replay_does_not_reach_aws(cassette_dir):
+    cassette_dir.mkdir()
+    (cassette_dir / METADATA_FILE).write_text(json.dumps({"account": "1234"}))
+    cassette = Cassette(cassette_dir, Cassette.REPLAY)
+
+    patch_sesh = patch(
+        "rpdk.core.contract.resource_client.create_sdk_session", autospec=True
+    )
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials", autospec=True
+    )
+    with patch_sesh as mock_sesh, patch_creds as mock_creds:
+        client = ResourceClient(
+            DEFAULT_FUNCTION,
+            "http://127.0.0.1:3001",
+            DEFAULT_REGION,
+            SCHEMA,
+            empty_override(),
+            cassette=cassette,
+        )
+        request = client._make_payload(Action.CREATE, {"a": "b"})
+        cassette._interactions[request_key(request)] = {
+            "request": normalize_request(request),
+            "responses": [{"status": "SUCCESS", "resourceModel": {"a": "b"}}],
+        }
+        status, response = client.call(Action.CREATE, {"a": "b"})
+
+    mock_sesh.assert_not_called()
+    mock_creds.assert_not_called()
+    assert client.account == "1234"
+    assert status == OperationStatus.SUCCESS
+    assert response["resourceModel"] == {"a": "b"}
+
+
+def test_resource_client_records_responses(cassette_dir):
+    cassette = Cassette(cassette_dir, Cassette.RECORD)
+    patch_sesh = patch(
+        "rpdk.core.contract.resource_client.create_sdk_session", autospec=True
+    )
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    patch_account = patch(
+        "rpdk.core.contract.resource_client.get_account",
+        autospec=True,
+        return_value="1234",
+    )
+    with patch_sesh, patch_creds, patch_account:
+        client = ResourceClient(
+            DEFAULT_FUNCTION,
+            "https://",
+            DEFAULT_REGION,
+            SCHEMA,
+            empty_override(),
+            cassette=cassette,
+        )
+        with patch.object(
+            client, "_invoke_handler", return_value={"status": "SUCCESS"}
+        ):
+            client.call(Action.READ, {"a": "b"})
+
+    replayed = Cassette(cassette_dir, Cassette.REPLAY)
+    assert replayed.account == "1234"
+    assert len(replayed._interactions) == 1
+
+
+def test_resource_client_records_without_secrets(cassette_dir):
+    schema = {
+        "properties": {
+            "a": {"type": "string"},
+            "Password": {"type": "string"},
+            "Token": {"type": "string"},
+        },
+        "primaryIdentifier": ["/properties/a"],
+        "writeOnlyProperties": ["/properties/Password"],
+        "handlers": {"create": {}, "delete": {}, "read": {}},
+    }
+    overrides = {"CREATE": {("Token",): "t0k3n"}}
+    model = {"a": "b", "Password": "hunter2", "Token": "t0k3n"}
+    patch_sesh = patch(
+        "rpdk.core.contract.resource_client.create_sdk_session", autospec=True
+    )
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    patch_account = patch(
+        "rpdk.core.contract.resource_client.get_account",
+        autospec=True,
+        return_value="1234",
+    )
+    with patch_sesh, patch_creds, patch_account:
+        client = ResourceClient(
+            DEFAULT_FUNCTION,
+            "https://",
+            DEFAULT_REGION,
+            schema,
+            overrides,
+            cassette=Cassette(cassette_dir, Cassette.RECORD),
+        )
+        with patch.object(
+            client,
+            "_invoke_handler",
+            return_value={
+                "status": "SUCCESS",
+                "resourceModel": {"a": "b", "Token": "t0k3n"},
+            },
+        ):
+            client.call(Action.CREATE, model)
+
+    recorded = "".join(
+        path.read_text(encoding="utf-8") for path in cassette_dir.glob("*.json")
+    )
+    assert "hunter2" not in recorded
+    # overridden values are only redacted from requests
+    (interaction,) = Cassette(cassette_dir, Cassette.REPLAY)._interactions.values()
+    assert interaction["request"]["requestData"]["resourceProperties"] == {
+        "a": "b",
+        "Password": REDACTED,
+        "Token": REDACTED,
+    }
+    assert interaction["responses"][0]["resourceModel"]["Token"] == "t0k3n"
+
+    with patch_sesh, patch_creds:
+        client = ResourceClient(
+            DEFAULT_FUNCTION,
+            "https://",
+            DEFAULT_REGION,
+            schema,
+            overrides,
+            cassette=Cassette(cassette_dir, Cassette.REPLAY),
+        )
+        status, _response = client.call(Action.CREATE, model)
+    assert status == OperationStatus.SUCCESS
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
@@ -62,3 +62,36 @@ def test_contract_plugin_fixture_hook_client_invalid():
     with pytest.raises(ValueError) as excinfo:
         plugin.hook_client.__wrapped__(plugin)
     assert "Contract plugin client not setup for HOOK type" in str(excinfo.value)
+
+
+def test_contract_plugin_report_header():
+    resource_client = MagicMock(spec=ResourceClient)
+    resource_client.seed = 42
+    plugin = ContractPlugin({"resource_client": resource_client})
+    assert plugin.pytest_report_header() == [
+        "example seed: 42 (reproduce with --seed 42)"
+    ]
+
+
+def test_contract_plugin_terminal_summary():
+    resource_client = MagicMock(spec=ResourceClient)
+    resource_client.coverage = Mock()
+    resource_client.coverage.summary.return_value = "schema coverage: 50.0%"
+    terminalreporter = MagicMock()
+    plugin = ContractPlugin({"resource_client": resource_client})
+
+    plugin.pytest_terminal_summary(terminalreporter)
+
+    terminalreporter.write_line.assert_called_once_with("schema coverage: 50.0%")
+
+
+def test_contract_plugin_terminal_summary_generation_stats():
+    hook_client = MagicMock(spec=HookClient)
+    hook_client.generation_stats = Mock()
+    hook_client.generation_stats.table.return_value = "generation cost"
+    terminalreporter = MagicMock()
+    plugin = ContractPlugin({"hook_client": hook_client})
+
+    plugin.pytest_terminal_summary(terminalreporter)
+
+    terminalreporter.write_line.assert_called_once_with("generation cost")
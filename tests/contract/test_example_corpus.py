@@ -0,0 +1,79 @@
+import json
+import logging
+import random
+
+from rpdk.core.contract.example_corpus import CORPUS_DIRECTORY, ExampleCorpus
+from rpdk.core.contract.interface import Action, OperationStatus
+from rpdk.core.jsonutils.utils import schema_hash
+
+SUCCESS = OperationStatus.SUCCESS
+
+
+def test_new_corpus(tmp_path):
+    corpus = ExampleCorpus(tmp_path / "corpus.json")
+    assert corpus.replay(Action.CREATE) is None
+    assert not (tmp_path / "corpus.json").exists()
+
+
+def test_for_schema(tmp_path):
+    schema = {"properties": {"a": {"type": "string"}}}
+    corpus = ExampleCorpus.for_schema(tmp_path, schema)
+    assert corpus.path == tmp_path / CORPUS_DIRECTORY / f"{schema_hash(schema)}.json"
+
+
+def test_record_and_replay_across_runs(tmp_path):
+    path = tmp_path / "nested" / "corpus.json"
+    corpus = ExampleCorpus(path)
+    model = {"a": [1]}
+    corpus.record(Action.CREATE, model, SUCCESS, 2.0)
+    corpus.record(Action.CREATE, {"a": [2]}, SUCCESS, 1.0)
+    corpus.record(Action.UPDATE, {"a": [3]}, SUCCESS, 1.0)
+    model["a"].append(2)
+
+    # models recorded in this run are not replayed in it
+    assert corpus.replay(Action.CREATE) is None
+    assert json.loads(path.read_text(encoding="utf-8"))["CREATE"] == [
+        {"model": {"a": [2]}, "status": "SUCCESS", "duration": 1.0},
+        {"model": {"a": [1]}, "status": "SUCCESS", "duration": 2.0},
+    ]
+
+    corpus = ExampleCorpus(path)
+    # fastest first, each model once per run
+    assert corpus.replay(Action.CREATE) == {"a": [2]}
+    assert corpus.replay(Action.CREATE) == {"a": [1]}
+    assert corpus.replay(Action.CREATE) is None
+    assert corpus.replay(Action.UPDATE) == {"a": [3]}
+
+
+def test_sample(tmp_path):
+    corpus = ExampleCorpus(tmp_path / "corpus.json")
+    assert corpus.sample(Action.CREATE, random.Random(0)) is None
+
+    corpus.record(Action.CREATE, {"a": 1}, SUCCESS, 1.0)
+    sampled = corpus.sample(Action.CREATE, random.Random(0))
+    assert sampled == {"a": 1}
+    sampled["a"] = 2
+    assert corpus.entries[Action.CREATE][0]["model"] == {"a": 1}
+
+
+def test_record_replaces_and_limits_entries(tmp_path):
+    corpus = ExampleCorpus(tmp_path / "corpus.json", max_entries=2)
+    corpus.record(Action.CREATE, {"a": 1}, SUCCESS, 1.0)
+    corpus.record(Action.CREATE, {"a": 1}, SUCCESS, 3.0)
+    corpus.record(Action.CREATE, {"a": 2}, SUCCESS, 2.0)
+    corpus.record(Action.CREATE, {"a": 3}, SUCCESS, 4.0)
+
+    assert [entry["model"] for entry in corpus.entries[Action.CREATE]] == [
+        {"a": 2},
+        {"a": 1},
+    ]
+
+
+def test_invalid_corpus_is_ignored(tmp_path, caplog):
+    path = tmp_path / "corpus.json"
+    path.write_text("{", encoding="utf-8")
+    with caplog.at_level(logging.WARNING):
+        corpus = ExampleCorpus(path)
+
+    assert corpus.replay(Action.CREATE) is None
+    assert "Ignoring invalid example corpus" in caplog.text
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+
+from rpdk.core.contract.generation_stats import GenerationStats
+
+NAME = ("properties", "Name")
+RULE = ("definitions", "Rule")
+
+
+def test_measure_excludes_nested_time():
+    stats = GenerationStats()
+    times = iter([0.0, 1.0, 3.0, 10.0])
+    with patch(
+        "rpdk.core.contract.generation_stats.perf_counter", side_effect=times.__next__
+    ):
+        value = stats.measure(
+            RULE, lambda: {"Name": stats.measure(NAME, lambda: "abc")}
+        )
+
+    assert value == {"Name": "abc"}
+    assert stats[NAME].time == 2.0
+    assert stats[RULE].time == 8.0
+    assert stats[NAME].average_size == len('"abc"')
+    assert [path for path, _ in stats.ranked()] == [RULE, NAME]
+
+
+def test_measure_counts_rejections():
+    stats = GenerationStats()
+
+    def reject():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        stats.measure(NAME, reject)
+    stats.measure(NAME, lambda: 1)
+
+    assert stats[NAME].draws == 2
+    assert stats[NAME].rejections == 1
+    assert stats[NAME].rejection_rate == 0.5
+    assert stats[NAME].average_size == 1
+
+
+def test_empty_path_stats():
+    stats = GenerationStats()[NAME]
+    assert stats.rejection_rate == 0.0
+    assert stats.average_size == 0.0
+
+
+def test_table_is_limited_to_top_paths():
+    stats = GenerationStats()
+    for index in range(3):
+        stats.measure(("properties", f"P{index}"), lambda: 1)
+
+    lines = stats.table(top=2).splitlines()
+
+    assert lines[0] == "generation cost by schema path (top 2 of 3)"
+    assert lines[1].split() == [
+        "path",
+        "draws",
+        "rejected",
+        "time",
+        "(ms)",
+        "avg",
+        "size",
+    ]
+    assert len(lines) == 4
@@ -2,10 +2,11 @@
 # pylint: disable=redefined-outer-name,protected-access
 import json
 import logging
+import random
 import time
 from io import StringIO
 from unittest import TestCase
-from unittest.mock import ANY, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -16,6 +17,7 @@ from rpdk.core.contract.interface import (
     HookInvocationPoint,
     HookStatus,
 )
+from rpdk.core.contract.lambda_http_client import LambdaHttpClient
 from rpdk.core.contract.type_configuration import TypeConfiguration
 from rpdk.core.exceptions import InvalidProjectError
 from rpdk.core.test import DEFAULT_ENDPOINT, DEFAULT_FUNCTION, DEFAULT_REGION
@@ -212,9 +214,8 @@ def test_init_sam_cli_client():
                 DEFAULT_FUNCTION, DEFAULT_ENDPOINT, DEFAULT_REGION, {}, EMPTY_OVERRIDE
             )
 
-    mock_sesh.client.assert_called_once_with(
-        "lambda", endpoint_url=DEFAULT_ENDPOINT, use_ssl=False, verify=False, config=ANY
-    )
+    mock_sesh.client.assert_not_called()
+    assert isinstance(client._client, LambdaHttpClient)
     mock_creds.assert_called_once_with(mock_sesh, LOWER_CAMEL_CRED_KEYS, None, None)
     mock_account.assert_called_once_with(mock_sesh, {})
     assert client.account == ACCOUNT
@@ -356,6 +357,31 @@ def test_get_handler_target_no_targets(hook_client):
     )
 
 
+def test_get_handler_targets_sampled(hook_client):
+    hook_client._target_info = {
+        f"AWS::{service}::{resource}": {"Schema": {"properties": {}}}
+        for service in ("S3", "EC2", "IAM")
+        for resource in ("A", "B", "C")
+    }
+    hook_client._target_sample = 3
+    schema = {
+        "handlers": {
+            "preCreate": {"targetNames": ["AWS::*"], "permissions": []},
+            "preUpdate": {"targetNames": ["AWS::*"], "permissions": []},
+        }
+    }
+    hook_client._update_schema(schema)
+
+    targets = hook_client.get_handler_targets(HookInvocationPoint.CREATE_PRE_PROVISION)
+
+    # one target of each service
+    assert len(targets) == 3
+    assert {target.split("::")[1] for target in targets} == {"S3", "EC2", "IAM"}
+    assert targets == hook_client.get_handler_targets(
+        HookInvocationPoint.UPDATE_PRE_PROVISION
+    )
+
+
 def test_generate_example(hook_client):
     hook_target_info = {
         "AWS::Example::Target": {
@@ -404,6 +430,75 @@ def test_generate_update_example(hook_client):
     assert hook_client._target_info["AWS::Example::Target"]["UpdateSchemaStrategy"]
 
 
+def test_prepare_target_examples(hook_client):
+    schema = {
+        "properties": {
+            "a": {"type": "number", "const": 1},
+            "b": {"type": "number", "const": 2},
+            "c": {"type": "number", "const": 3},
+        },
+        "readOnlyProperties": ["/properties/b"],
+        "createOnlyProperties": ["/properties/c"],
+    }
+    hook_target_info = {
+        "AWS::Example::Target": {"TypeName": "AWS::Example::Target", "Schema": schema}
+    }
+    hook_client._target_info = HookClient._setup_target_info(hook_target_info)
+    cache = Mock()
+    cache.get.return_value = None
+    hook_client._target_example_cache = cache
+
+    hook_client.prepare_target_examples(["AWS::Example::Target", "AWS::Unknown"])
+
+    info = hook_client._target_info["AWS::Example::Target"]
+    assert info["Examples"]["create"][0] == {"a": 1, "c": 3}
+    # cached by the seed of the examples, so the cache does not change them
+    seed = cache.get.call_args.args[1]
+    cache.put.assert_called_once_with(schema, seed, info["Examples"])
+    assert hook_client._generate_target_example("AWS::Example::Target") == {
+        "a": 1,
+        "c": 3,
+    }
+    assert hook_client._generate_target_update_example(
+        "AWS::Example::Target", {"b": 2, "a": 4}
+    ) == {"a": 1, "b": 2}
+    # examples are only prepared once
+    hook_client.prepare_target_examples(["AWS::Example::Target"])
+    cache.get.assert_called_once_with(schema, seed)
+    assert not info.get("SchemaStrategy")
+
+
+def test_prepare_target_examples_seeds_do_not_depend_on_order(hook_client):
+    targets = ["AWS::Example::A", "AWS::Example::B", "AWS::Example::C"]
+    hook_client._target_info = HookClient._setup_target_info(
+        {target: {"Schema": {"properties": {}}} for target in targets}
+    )
+
+    def prepared_seeds(ordered_targets):
+        hook_client._example_random = random.Random(1)
+        with patch(
+            "rpdk.core.contract.target_examples.prepare_target_examples",
+            return_value={},
+        ) as mock_prepare:
+            hook_client.prepare_target_examples(ordered_targets)
+        jobs = mock_prepare.call_args.args[0]
+        return {target: job[-1] for target, job in jobs.items()}
+
+    assert prepared_seeds(targets) == prepared_seeds(targets[::-1])
+
+
+def test_prepare_target_examples_skipped(hook_client):
+    hook_client._target_info = HookClient._setup_target_info(
+        {"AWS::Example::Target": {"Schema": {"properties": {}}}}
+    )
+    hook_client.generation_stats = Mock()
+    with patch(
+        "rpdk.core.contract.target_examples.prepare_target_examples"
+    ) as mock_prepare:
+        hook_client.prepare_target_examples(["AWS::Example::Target"])
+    mock_prepare.assert_not_called()
+
+
 def test_make_payload(hook_client):
     patch_creds = patch(
         "rpdk.core.contract.hook_client.get_temporary_credentials",
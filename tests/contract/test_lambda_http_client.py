@@ -0,0 +1,108 @@
+# fixture and parameter have the same name
+# pylint: disable=redefined-outer-name,protected-access
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from rpdk.core.contract.lambda_http_client import LambdaHttpClient
+from rpdk.core.serve import LambdaInvokeServer
+
+FUNCTION = "TypeFunction"
+
+
+@pytest.fixture
+def backend():
+    return Mock(spec=["invoke", "close"])
+
+
+@pytest.fixture
+def server(backend):
+    server = LambdaInvokeServer(("127.0.0.1", 0), backend, FUNCTION, 2, 10)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = LambdaHttpClient(f"http://127.0.0.1:{server.server_address[1]}", 10)
+    yield client
+    client.close()
+
+
+def test_init_requires_http_endpoint():
+    with pytest.raises(ValueError):
+        LambdaHttpClient("https://lambda.us-east-1.amazonaws.com", 10)
+
+
+def test_invoke(client, backend):
+    backend.invoke.return_value = {"status": "SUCCESS"}
+
+    result = client.invoke(FunctionName=FUNCTION, Payload=b'{"action": "CREATE"}')
+
+    assert result["StatusCode"] == 200
+    assert "FunctionError" not in result
+    assert json.load(result["Payload"]) == {"status": "SUCCESS"}
+    backend.invoke.assert_called_once_with({"action": "CREATE"})
+
+
+def test_invoke_reuses_connection(client, backend):
+    backend.invoke.return_value = {"status": "SUCCESS"}
+
+    client.invoke(FunctionName=FUNCTION, Payload=b"{}")
+    connection = client._connections.queue[0]
+    sock = connection.sock
+    client.invoke(FunctionName=FUNCTION, Payload=b"{}")
+
+    assert client._connections.qsize() == 1
+    assert client._connections.queue[0] is connection
+    assert connection.sock is sock
+
+
+def test_invoke_reconnects_dropped_connection(client, backend):
+    backend.invoke.return_value = {"status": "SUCCESS"}
+    client.invoke(FunctionName=FUNCTION, Payload=b"{}")
+    connection = client._connections.queue[0]
+    # simulate the server closing the idle connection
+    connection.sock.close()
+
+    result = client.invoke(FunctionName=FUNCTION, Payload=b"{}")
+
+    assert json.load(result["Payload"]) == {"status": "SUCCESS"}
+    assert backend.invoke.call_count == 2
+
+
+def test_invoke_function_error(client, backend):
+    backend.invoke.side_effect = ValueError("boom")
+
+    result = client.invoke(FunctionName=FUNCTION, Payload=b"{}")
+
+    assert result["FunctionError"] == "Unhandled"
+    assert json.load(result["Payload"])["errorMessage"] == "boom"
+
+
+def test_invoke_unknown_function(client, backend):
+    with pytest.raises(ClientError) as excinfo:
+        client.invoke(FunctionName="Unknown", Payload=b"{}")
+
+    assert excinfo.value.response["Error"]["Code"] == "ResourceNotFoundException"
+    assert "Unknown" in excinfo.value.response["Error"]["Message"]
+    backend.invoke.assert_not_called()
+
+
+def test_pool_size():
+    client = LambdaHttpClient("http://127.0.0.1:3001", 10, max_connections=1)
+    first, second = Mock(), Mock()
+
+    client._put_connection(first)
+    client._put_connection(second)
+
+    assert client._connections.qsize() == 1
+    second.close.assert_called_once_with()
+    client.close()
+    first.close.assert_called_once_with()
@@ -0,0 +1,120 @@
+# fixture and parameter have the same name
+# pylint: disable=redefined-outer-name
+from unittest.mock import Mock
+
+import pytest
+
+from rpdk.core.contract.local_handler import (
+    TRANSPORT_IN_PROCESS,
+    TRANSPORT_LAMBDA,
+    TRANSPORT_SUBPROCESS,
+    InProcessHandler,
+    SubprocessHandler,
+    create_local_handler,
+    load_handler,
+)
+from rpdk.core.exceptions import InvalidProjectError
+from rpdk.core.project import Project
+
+HANDLERS = """
+import time
+
+
+def resource(event, context):
+    time.sleep(event.get("sleep", 0))
+    event["requestData"]["resourceProperties"]["seen"] = True
+    return {
+        "status": "SUCCESS",
+        "resourceModel": event["requestData"]["resourceProperties"],
+        "functionName": context.function_name,
+    }
+"""
+
+PAYLOAD = {"requestData": {"resourceProperties": {"a": 1}}}
+
+
+@pytest.fixture
+def project(tmp_path, request):
+    # a unique package name per test, so imports don't leak between tests
+    package = f"local_handler_{request.node.name}".replace("[", "_").replace("]", "")
+    package_dir = tmp_path / "src" / package
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "handlers.py").write_text(HANDLERS)
+
+    project = Mock(spec=Project)
+    project.root = tmp_path
+    project.runtime = "python3.9"
+    project.entrypoint = f"{package}.handlers.resource"
+    return project
+
+
+def test_in_process_handler(project):
+    handler = create_local_handler(TRANSPORT_IN_PROCESS, project, "TypeFunction")
+    assert isinstance(handler, InProcessHandler)
+
+    payload = {"requestData": {"resourceProperties": {"a": 1}}}
+    response = handler.invoke(payload)
+    handler.close()
+
+    assert response == {
+        "status": "SUCCESS",
+        "resourceModel": {"a": 1, "seen": True},
+        "functionName": "TypeFunction",
+    }
+    # the request is not modified by the handler
+    assert payload == PAYLOAD
+
+
+def test_subprocess_handler(project):
+    handler = create_local_handler(
+        TRANSPORT_SUBPROCESS, project, "TypeFunction", timeout=60
+    )
+    assert isinstance(handler, SubprocessHandler)
+    try:
+        response = handler.invoke(PAYLOAD)
+    finally:
+        handler.close()
+
+    assert response["resourceModel"] == {"a": 1, "seen": True}
+
+
+def test_subprocess_handler_replaces_timed_out_worker(project):
+    handler = create_local_handler(
+        TRANSPORT_SUBPROCESS, project, "TypeFunction", timeout=5
+    )
+    try:
+        with pytest.raises(TimeoutError):
+            handler.invoke(dict(PAYLOAD, sleep=600))
+        # the only worker was still sleeping, so this needs a new one
+        response = handler.invoke(PAYLOAD)
+    finally:
+        handler.close()
+
+    assert response["resourceModel"] == {"a": 1, "seen": True}
+
+
+def test_lambda_transport_has_no_local_handler(project):
+    assert create_local_handler(TRANSPORT_LAMBDA, project, "TypeFunction") is None
+
+
+def test_local_handler_requires_python_runtime(project):
+    project.runtime = "java8"
+    with pytest.raises(InvalidProjectError):
+        create_local_handler(TRANSPORT_IN_PROCESS, project, "TypeFunction")
+
+
+def test_local_handler_requires_entrypoint(project):
+    project.entrypoint = None
+    with pytest.raises(InvalidProjectError):
+        create_local_handler(TRANSPORT_IN_PROCESS, project, "TypeFunction")
+
+
+def test_load_handler_not_found(tmp_path):
+    with pytest.raises(InvalidProjectError):
+        load_handler("does_not_exist_anywhere.handlers.resource", [tmp_path])
+
+
+def test_load_handler_invalid_entrypoint():
+    with pytest.raises(InvalidProjectError):
+        load_handler("resource")
@@ -0,0 +1,113 @@
+import pytest
+
+from rpdk.core.contract.model_diff import (
+    LENGTH,
+    MISMATCH,
+    MISSING,
+    UNORDERED,
+    Difference,
+    list_differences,
+    model_differences,
+    render_differences,
+)
+from rpdk.core.jsonutils.diff import make_patch
+
+
+def ordered(_path):
+    return True
+
+
+def test_model_differences_match():
+    inputs = {"a": {"b": [1, {"c": [2]}]}, "d": "e"}
+    outputs = {"a": {"b": [1, {"c": [2], "x": 1}]}, "d": "e", "extra": 1}
+
+    assert not list(model_differences(inputs, outputs, ordered))
+
+
+def test_model_differences_kinds():
+    inputs = {"a": 1, "b": {"c": 2}, "d": [1, 2], "e": {"f": 1}, "g": [[1]]}
+    outputs = {"b": {"c": 3}, "d": [1], "e": "f", "g": [[2]]}
+
+    assert list(model_differences(inputs, outputs, ordered)) == [
+        Difference(MISSING, ("a",), 1, None),
+        Difference(MISMATCH, ("b", "c"), 2, 3),
+        Difference(LENGTH, ("d",), 2, 1),
+        Difference(MISMATCH, ("e",), {"f": 1}, "f"),
+        Difference(MISMATCH, ("g", 0), [1], [2]),
+    ]
+
+
+def test_model_differences_schema_path_excludes_indices():
+    paths = []
+
+    def is_ordered(path):
+        paths.append(path)
+        return True
+
+    list(model_differences({"a": [{"b": [1]}]}, {"a": [{"b": [2]}]}, is_ordered))
+
+    assert paths == [("a",), ("a", "b")]
+
+
+def test_list_differences_unordered_delta():
+    differences = list(
+        list_differences(["a", "a", "b"], ["b", "a", "c"], lambda _path: False)
+    )
+
+    assert differences == [Difference(UNORDERED, (), ["a"], ["c"])]
+
+
+def test_list_differences_not_a_list():
+    assert list(list_differences([1], {"a": 1}, ordered, ("a",))) == [
+        Difference(MISMATCH, ("a",), [1], {"a": 1})
+    ]
+
+
+def test_model_differences_booleans_are_not_numbers():
+    assert list(
+        model_differences({"a": 1, "b": [0]}, {"a": True, "b": [False]}, ordered)
+    ) == [
+        Difference(MISMATCH, ("a",), 1, True),
+        Difference(MISMATCH, ("b", 0), 0, False),
+    ]
+
+
+@pytest.mark.parametrize(
+    "inputs,outputs",
+    [
+        ({"Tags": [1, 2, 2]}, {"Tags": [2, 1, 2]}),
+        ({"Tags": [1, 2, 2]}, {"Tags": [2, 1, 1]}),
+        ({"Tags": [{"a": 1}]}, {"Tags": [{"a": True}]}),
+        ({"Tags": [{"a": [1, 2]}]}, {"Tags": [{"a": [2, 1]}]}),
+        ({"Ordered": [1, 2]}, {"Ordered": [2, 1]}),
+        ({"Ordered": [1.0]}, {"Ordered": [1]}),
+        ({"Ordered": [1]}, {"Ordered": [True]}),
+    ],
+)
+def test_model_differences_agree_with_patch(inputs, outputs):
+    def is_ordered(path):
+        return path == ("Ordered",)
+
+    differences = list(model_differences(inputs, outputs, is_ordered))
+    patch = make_patch(inputs, outputs, is_ordered=is_ordered)
+
+    assert bool(differences) == bool(patch)
+
+
+def test_render_differences():
+    differences = [
+        Difference(MISSING, ("a",), 1, None),
+        Difference(LENGTH, ("d",), 2, 1),
+        Difference(UNORDERED, ("t", "~/"), ["a"], []),
+    ]
+
+    message = render_differences(differences, {"a": 1}, {})
+
+    assert message.splitlines()[1:] == [
+        "  Property /a in Request Model (1) is missing from Response Model",
+        "  Property /d has 2 members in Request Model, but 1 in Response Model",
+        "  Members of property /t/~0~1 do not match, missing from Response Model:"
+        ' ["a"], not in Request Model: []',
+        'Request Model : {"a": 1}',
+        "Returned Model : {}",
+    ]
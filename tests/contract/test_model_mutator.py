@@ -0,0 +1,140 @@
+import random
+from unittest.mock import Mock
+
+import pytest
+from jsonschema import Draft7Validator
+
+from rpdk.core.contract.model_mutator import (
+    UNKNOWN_PROPERTY,
+    CannotTweak,
+    ModelMutator,
+    tweak,
+)
+
+SCHEMA = {
+    "definitions": {
+        "Name": {"type": "string", "minLength": 1, "maxLength": 4},
+    },
+    "properties": {
+        "Name": {"$ref": "#/definitions/Name"},
+        "Size": {"type": "integer", "minimum": 1, "maximum": 2},
+        "Kind": {"type": "string", "enum": ["A", "B"]},
+        "Tags": {"type": "array", "maxItems": 2, "items": {"type": "string"}},
+        "Arn": {"type": "string"},
+    },
+    "required": ["Name"],
+    "additionalProperties": False,
+}
+MODEL = {"Name": "abcd", "Size": 2, "Kind": "A", "Tags": ["x"]}
+
+
+@pytest.mark.parametrize(
+    "schema,value,expected",
+    [
+        ({"type": "boolean"}, False, True),
+        ({"enum": [1, 2]}, 2, 1),
+        ({"type": "integer", "minimum": 1, "maximum": 2}, 1, 2),
+        ({"type": "integer", "exclusiveMaximum": 2}, 1, 0),
+        ({"type": "string"}, "", "x"),
+        ({"type": "string", "maxLength": 1}, "x", "y"),
+    ],
+)
+def test_tweak(schema, value, expected):
+    assert tweak(schema, value) == expected
+
+
+@pytest.mark.parametrize(
+    "schema,value",
+    [
+        ({"const": 1}, 1),
+        ({"enum": ["A"]}, "A"),
+        ({"minimum": 1, "maximum": 1}, 1),
+        ({"type": "string", "maxLength": 0}, ""),
+        ({"type": "string", "pattern": "^a$"}, "a"),
+        ({"type": "number"}, 0.5),
+        ({"type": "object"}, {}),
+    ],
+)
+def test_tweak_not_possible(schema, value):
+    with pytest.raises(CannotTweak):
+        tweak(schema, value)
+
+
+def test_property_schema_resolves_refs():
+    mutator = ModelMutator(SCHEMA, Mock(), random.Random(0))
+    assert mutator.property_schema("Name") == SCHEMA["definitions"]["Name"]
+    assert mutator.property_schema("Unknown") == {}
+
+
+@pytest.mark.parametrize("prop", ["Name", "Size", "Kind"])
+def test_mutate_tweaks_one_property(prop):
+    draw = Mock()
+    mutator = ModelMutator(SCHEMA, draw, random.Random(0))
+
+    mutated = mutator.mutate(MODEL, [prop])
+
+    assert mutated[prop] != MODEL[prop]
+    assert {k: v for k, v in mutated.items() if k != prop} == {
+        k: v for k, v in MODEL.items() if k != prop
+    }
+    assert Draft7Validator(SCHEMA).is_valid(mutated)
+    draw.assert_not_called()
+
+
+def test_mutate_draws_other_values():
+    draw = Mock(return_value=["y", "z"])
+    mutator = ModelMutator(SCHEMA, draw, random.Random(0))
+
+    assert mutator.mutate(MODEL, ["Tags"]) == {**MODEL, "Tags": ["y", "z"]}
+    assert mutator.mutate(MODEL, ["Arn"]) == {**MODEL, "Arn": ["y", "z"]}
+    assert mutator.mutate(MODEL, []) == MODEL
+    draw.assert_called_with("Arn")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_violate_adds_exactly_one_error(seed):
+    mutator = ModelMutator(SCHEMA, Mock(), random.Random(seed))
+
+    violated, constraint = mutator.violate(MODEL, ["Name", "Size", "Kind", "Tags"])
+
+    errors = list(Draft7Validator(SCHEMA).iter_errors(violated))
+    assert len(errors) == 1
+    assert errors[0].validator in constraint
+
+
+def test_violate_schema_constraints():
+    mutator = ModelMutator(SCHEMA, Mock(), random.Random(0))
+    violations = {
+        constraint: violated
+        for constraint, _prop, violated in mutator._violations(MODEL, ["Size"])
+    }
+    assert violations == {
+        "type of 'Size'": "",
+        "maximum of 'Size'": 3,
+        "minimum of 'Size'": 0,
+        "required 'Name'": violations["required 'Name'"],
+        "additionalProperties": "",
+    }
+    violated, _constraint = ModelMutator(
+        {"additionalProperties": False}, Mock(), random.Random(0)
+    ).violate({}, [])
+    assert violated == {UNKNOWN_PROPERTY: ""}
+
+
+def test_violate_sets_read_only_property():
+    draw = Mock(return_value="arn")
+    mutator = ModelMutator(SCHEMA, draw, random.Random(0))
+
+    violated, constraint = mutator.violate(MODEL, [], read_only_properties=["Arn"])
+
+    assert violated == {**MODEL, "Arn": "arn"}
+    assert constraint == "readOnlyProperties 'Arn'"
+    # present read-only properties are returned by read handlers, so are valid
+    violated, constraint = mutator.violate(violated, [], read_only_properties=["Arn"])
+    assert constraint in ("required 'Name'", "additionalProperties")
+    draw.assert_called_once_with("Arn")
+
+
+def test_violate_not_possible():
+    mutator = ModelMutator({"properties": {"a": {}}}, Mock(), random.Random(0))
+    assert mutator.violate({"a": 1}, ["a"]) == (None, None)
@@ -0,0 +1,71 @@
+# pylint: disable=protected-access
+import re
+
+import pytest
+
+from rpdk.core.contract.regex_strategy import (
+    UnsupportedPattern,
+    _direct_strategy,
+    regex_strategy,
+)
+from rpdk.core.contract.resource_generator import (
+    STRING_FORMATS,
+    generate_examples,
+    terminate_regex,
+)
+
+DIRECT_PATTERNS = [
+    r"^[a-zA-Z0-9-]{1,64}$",
+    r"^(GET|PUT|POST)$",
+    r"^[^,]*$",
+    r"^[^a-z]{2}$",
+    r"^\w+\s?\S*\D{2}\W\d$",
+    r"^(a|bc)*x?$",
+    r"^arn:(aws[a-zA-Z-]*)?:iam::\d{12}:role/[\w+=,.@-]{1,64}$",
+    r"^sg-[0-9a-f]{8}(?:[0-9a-f]{9})?$",
+    r"^[a-z]*a$",
+    r"^.{1,3}$",
+    r"^$",
+]
+
+
+@pytest.mark.parametrize(
+    "regex",
+    [terminate_regex(pattern) for pattern in DIRECT_PATTERNS]
+    + list(STRING_FORMATS.values()),
+)
+def test_regex_strategy_direct(regex):
+    pattern = re.compile(regex, re.ASCII)
+    # supported by the direct sampler
+    _direct_strategy(pattern)
+
+    for example in generate_examples(regex_strategy(regex), 50, seed=1):
+        assert pattern.search(example), example
+
+
+@pytest.mark.parametrize(
+    "regex",
+    [
+        r"[a-z]{3}",  # not anchored
+        r"\A(?i:abc)\Z",
+        r"\A(a)\1\Z",
+        r"\A(?>ab)c\Z",
+        r"\A[a-z]++\Z",
+    ],
+)
+def test_regex_strategy_from_regex(regex):
+    pattern = re.compile(regex, re.ASCII)
+    with pytest.raises(UnsupportedPattern):
+        _direct_strategy(pattern)
+
+    for example in generate_examples(regex_strategy(regex), 10, seed=1):
+        assert pattern.search(example), example
+
+
+def test_regex_strategy_flags():
+    with pytest.raises(UnsupportedPattern):
+        _direct_strategy(re.compile(r"\Aabc\Z", re.IGNORECASE))
+
+
+def test_regex_strategy_cached():
+    assert regex_strategy(r"\A[a-z]\Z") is regex_strategy(r"\A[a-z]\Z")
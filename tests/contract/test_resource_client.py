@@ -1,15 +1,21 @@
 # fixture and parameter have the same name
 # pylint: disable=redefined-outer-name,protected-access
+import copy
+import json
 import logging
+import random
 import time
 from io import StringIO
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, Mock, call, patch
 
 import pytest
+from jsonschema import Draft7Validator
 
 import rpdk.core.contract.resource_client as rclient
 from rpdk.core.boto_helpers import LOWER_CAMEL_CRED_KEYS
+from rpdk.core.contract.callback_scheduler import CallbackScheduler
 from rpdk.core.contract.interface import Action, HandlerErrorCode, OperationStatus
+from rpdk.core.contract.lambda_http_client import LambdaHttpClient
 from rpdk.core.contract.resource_client import (
     ResourceClient,
     override_properties,
@@ -20,6 +26,7 @@ from rpdk.core.contract.resource_client import (
 )
 from rpdk.core.contract.suite.resource.handler_commons import error_test_model_in_list
 from rpdk.core.exceptions import InvalidProjectError
+from rpdk.core.jsonutils.diff import IdentifierChangedError
 from rpdk.core.test import (
     DEFAULT_ENDPOINT,
     DEFAULT_FUNCTION,
@@ -690,9 +697,8 @@ def test_init_sam_cli_client():
                 DEFAULT_FUNCTION, DEFAULT_ENDPOINT, DEFAULT_REGION, {}, EMPTY_OVERRIDE
             )
 
-    mock_sesh.client.assert_called_once_with(
-        "lambda", endpoint_url=DEFAULT_ENDPOINT, use_ssl=False, verify=False, config=ANY
-    )
+    mock_sesh.client.assert_not_called()
+    assert isinstance(client._client, LambdaHttpClient)
     mock_creds.assert_called_once_with(mock_sesh, LOWER_CAMEL_CRED_KEYS, None, None)
     mock_account.assert_called_once_with(mock_sesh, {})
     assert client.account == ACCOUNT
@@ -799,6 +805,48 @@ def test_transform_model(resource_client_inputs_property_transform):
     assert transformed_inputs == expected_inputs
 
 
+def test_transform_helpers_are_deprecated(resource_client_inputs_property_transform):
+    client = resource_client_inputs_property_transform
+
+    with pytest.deprecated_call():
+        assert client.property_transform_keys == {("properties", "b", "c", "d")}
+    with pytest.deprecated_call():
+        model = client.update_property({"b": {"c": {"d": 1}}}, 2, ("b", "c", "d"))
+    assert model == {"b": {"c": {"d": 2}}}
+
+
+def test_transform_model_compiles_once(resource_client_inputs_property_transform):
+    pyjq = pytest.importorskip("pyjq")
+    client = resource_client_inputs_property_transform
+    schema = dict(
+        SCHEMA_WITH_PROPERTY_TRANSFORM,
+        propertyTransform={
+            "/properties/b/c/d": '.b.c.d + "Test"',
+            "/properties/a": '.b.c.d + "A"',
+            "/properties/b/c/e": "empty",
+        },
+    )
+    client._update_schema(schema)
+    inputs = {"a": "ValueA", "b": {"c": {"d": "ValueD", "e": 1}}}
+
+    with patch.object(pyjq, "compile", wraps=pyjq.compile) as mock_compile:
+        first = client.transform_model(inputs)
+        second = client.transform_model(inputs)
+
+    mock_compile.assert_called_once()
+    # transforms apply in order, an empty result is null, and the input model
+    # is not modified
+    assert (
+        first
+        == second
+        == {
+            "a": "ValueDTestA",
+            "b": {"c": {"d": "ValueDTest", "e": None}},
+        }
+    )
+    assert inputs == {"a": "ValueA", "b": {"c": {"d": "ValueD", "e": 1}}}
+
+
 def test_compare_with_transform_should_pass(resource_client_inputs_property_transform):
     inputs = {"a": "ValueA", "b": {"c": {"d": "ValueD", "e": 1}}}
     # transformed_inputs = {"a": "ValueA", "b": {"c": {"d": "ValueDTest", "e": 1}}}
@@ -900,6 +948,24 @@ def test_update_strategy(resource_client):
     assert resource_client._update_strategy is update_strategy
 
 
+def test_strategy_shared_between_clients(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "number", "const": 1},
+            "c": {"type": "number", "const": 3},
+        },
+        "readOnlyProperties": ["/properties/c"],
+    }
+    resource_client._update_schema(schema)
+    strategy = resource_client.strategy
+
+    # e.g. a new client per inputs set in the same run
+    resource_client._update_schema(copy.deepcopy(schema))
+
+    assert resource_client._strategy is None
+    assert resource_client.strategy is strategy
+
+
 def test_generate_create_example(resource_client):
     schema = {
         "properties": {
@@ -913,6 +979,36 @@ def test_generate_create_example(resource_client):
     assert example == {"a": 1}
 
 
+def test_generate_create_example_seeded(resource_client):
+    schema = {"properties": {"a": {"type": "integer"}, "b": {"type": "string"}}}
+    resource_client._update_schema(schema)
+    resource_client._example_random = random.Random(1234)
+    examples = [resource_client.generate_create_example() for _ in range(3)]
+
+    resource_client._example_random = random.Random(1234)
+
+    assert [resource_client.generate_create_example() for _ in range(3)] == examples
+
+
+def test_generate_create_example_coverage_guided(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "string", "enum": ["x", "y", "z"]},
+            "b": {"type": "number", "const": 2},
+        },
+        "readOnlyProperties": ["/properties/b"],
+    }
+    resource_client._coverage_candidates = 5
+    resource_client._update_schema(schema)
+
+    examples = [resource_client.generate_create_example() for _ in range(3)]
+
+    # read-only properties are never generated, so they are not counted
+    assert ("property", ("b",)) not in resource_client.coverage.features
+    assert {example["a"] for example in examples} == {"x", "y", "z"}
+    assert resource_client.coverage.percent == 100
+
+
 def test_generate_invalid_create_example(resource_client):
     schema = {
         "properties": {
@@ -923,7 +1019,140 @@ def test_generate_invalid_create_example(resource_client):
     }
     resource_client._update_schema(schema)
     example = resource_client.generate_invalid_create_example()
-    assert example == {"a": 1, "b": 2}
+    # either sets the read-only property, or violates the type of the other
+    assert example in ({"a": 1, "b": 2}, {"a": ""})
+
+
+def test_generate_create_example_mutates_corpus(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "string", "enum": ["x", "y"]},
+            "b": {"type": "boolean"},
+        },
+        "primaryIdentifier": ["/properties/a"],
+    }
+    resource_client._update_schema(schema)
+    corpus = Mock()
+    corpus.replay.return_value = None
+    corpus.sample.return_value = {"a": "x", "b": True}
+    resource_client._corpus = corpus
+
+    # the identifier is changed, so the model is of a different resource
+    assert resource_client.generate_create_example() == {"a": "y", "b": True}
+    corpus.sample.assert_called_once_with(
+        Action.CREATE, resource_client._example_random
+    )
+
+
+def test_draw_property(resource_client):
+    schema = {
+        "properties": {
+            "a": {
+                "type": "object",
+                "properties": {
+                    "x": {"type": "number", "const": 1},
+                    "y": {"type": "number", "const": 2},
+                },
+            },
+            "b": {"type": "number", "const": 2},
+        },
+        "readOnlyProperties": ["/properties/b"],
+    }
+    resource_client._update_schema(schema)
+
+    assert resource_client._draw_property("a") == {"x": 1, "y": 2}
+    # read-only properties can be drawn, to make invalid models
+    assert resource_client._draw_property("b") == 2
+    assert list(resource_client._property_strategies) == ["a", "b"]
+
+
+def test_generate_update_example_changes_one_property(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "integer", "maximum": 5},
+            "b": {"type": "boolean"},
+            "c": {"type": "string", "enum": ["x", "y"]},
+            "d": {"type": "string"},
+        },
+        "readOnlyProperties": ["/properties/d"],
+        "createOnlyProperties": ["/properties/c"],
+    }
+    resource_client._update_schema(schema)
+    resource_client._overrides = {}
+    model_from_created_resource = {"a": 5, "b": True, "c": "x", "d": "id"}
+
+    example = resource_client.generate_update_example(model_from_created_resource)
+
+    assert example in (
+        {"a": 4, "b": True, "c": "x", "d": "id"},
+        {"a": 5, "b": False, "c": "x", "d": "id"},
+    )
+
+
+def test_generate_update_example_draws_write_only_properties(resource_client):
+    schema = {
+        "properties": {
+            "Name": {"type": "string", "enum": ["x", "y"]},
+            "Password": {"type": "string", "minLength": 8},
+            "Config": {
+                "type": "object",
+                "properties": {
+                    "Key": {"type": "string", "enum": ["k"]},
+                    "Secret": {"type": "string", "minLength": 4},
+                },
+                "required": ["Key", "Secret"],
+            },
+        },
+        "required": ["Name", "Password"],
+        "writeOnlyProperties": [
+            "/properties/Password",
+            "/properties/Config/Secret",
+        ],
+    }
+    resource_client._update_schema(schema)
+    resource_client._overrides = {}
+    # the handler does not return write-only properties
+    model_from_created_resource = {"Name": "x", "Config": {"Key": "k"}}
+
+    example = resource_client.generate_update_example(model_from_created_resource)
+
+    assert len(example["Password"]) >= 8
+    assert len(example["Config"]["Secret"]) >= 4
+    Draft7Validator(schema).validate(example)
+
+
+def test_generate_update_example_logs_patch(resource_client, caplog):
+    schema = {"properties": {"a": {"type": "boolean"}}}
+    resource_client._update_schema(schema)
+    resource_client._overrides = {}
+
+    with caplog.at_level(logging.DEBUG, logger=rclient.LOG.name):
+        resource_client.generate_update_example({"a": True})
+
+    assert '"path": "/a"' in caplog.text
+
+
+def test_update_patch(resource_client):
+    resource_client._update_schema(
+        {
+            "properties": {
+                "Id": {"type": "string"},
+                "Name": {"type": "string"},
+                "Tags": {"type": "array", "insertionOrder": False},
+            },
+            "primaryIdentifier": ["/properties/Id"],
+            "createOnlyProperties": ["/properties/Id"],
+        }
+    )
+    current_model = {"Id": "a", "Name": "x", "Tags": ["t1", "t2"]}
+
+    patch = resource_client.update_patch(
+        current_model, {"Id": "a", "Name": "y", "Tags": ["t2", "t1"]}
+    )
+
+    assert patch == [{"op": "replace", "path": "/Name", "value": "y"}]
+    with pytest.raises(IdentifierChangedError):
+        resource_client.update_patch(current_model, {"Id": "b"})
 
 
 def test_generate_update_example(resource_client):
@@ -943,23 +1172,42 @@ def test_generate_update_example(resource_client):
     assert example == {"a": 1, "b": 2}
 
 
+def test_generate_invalid_update_example_without_constraints(resource_client):
+    schema = {
+        "properties": {"a": {}, "b": {"type": "number", "const": 2}},
+        "readOnlyProperties": ["/properties/b"],
+    }
+    resource_client._update_schema(schema)
+    resource_client._overrides = {}
+    model_from_created_resource = {"b": 2, "a": 4}
+    example = resource_client.generate_invalid_update_example(
+        model_from_created_resource
+    )
+    assert example == {"a": {}, "b": 2}
+
+
 def test_generate_invalid_update_example(resource_client):
     schema = {
         "properties": {
-            "a": {"type": "number", "const": 1},
-            "b": {"type": "number", "const": 2},
-            "c": {"type": "number", "const": 3},
+            "a": {"type": "string", "maxLength": 3},
+            "b": {"type": "number"},
+            "c": {"type": "string", "maxLength": 3},
         },
         "readOnlyProperties": ["/properties/b"],
         "createOnlyProperties": ["/properties/c"],
     }
     resource_client._update_schema(schema)
     resource_client._overrides = {}
-    model_from_created_resource = {"b": 2, "a": 4}
+    model_from_created_resource = {"a": "x", "b": 2, "c": "y"}
+
     example = resource_client.generate_invalid_update_example(
         model_from_created_resource
     )
-    assert example == {"a": 1, "b": 2, "c": 3}
+
+    # only the updatable property is changed
+    assert example["b"] == 2
+    assert example["c"] == "y"
+    assert len(list(Draft7Validator(schema).iter_errors(example))) == 1
 
 
 def test_generate_update_example_update_override(resource_client):
@@ -1145,6 +1393,138 @@ def test_call_sync(resource_client, action):
     assert response == {"status": OperationStatus.SUCCESS.value}
 
 
+def test_call_records_corpus(resource_client):
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    corpus = Mock()
+    resource_client._corpus = corpus
+    mock_client = resource_client._client
+    mock_client.invoke.side_effect = [
+        {"Payload": StringIO('{"status": "SUCCESS"}')},
+        {"Payload": StringIO('{"status": "FAILED", "errorCode": "InternalFailure"}')},
+        {"Payload": StringIO('{"status": "SUCCESS"}')},
+    ]
+    with patch_creds:
+        resource_client.call(Action.CREATE, {"a": 1})
+        resource_client.call(Action.CREATE, {"a": 2})
+        resource_client.call(Action.READ, {"a": 1})
+
+    corpus.record.assert_called_once_with(
+        Action.CREATE, {"a": 1}, OperationStatus.SUCCESS, ANY
+    )
+
+
+def test_call_records_corpus_without_secrets(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "string"},
+            "b": {"type": "object"},
+            "c": {"type": "string"},
+            "d": {"type": "string"},
+        },
+        "writeOnlyProperties": ["/properties/b/Password"],
+    }
+    resource_client._update_schema(schema)
+    resource_client._overrides = {"CREATE": {("c",): "token"}, "UPDATE": {}}
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    corpus = Mock()
+    resource_client._corpus = corpus
+    resource_client._client.invoke.return_value = {
+        "Payload": StringIO('{"status": "SUCCESS"}')
+    }
+    with patch_creds:
+        resource_client.call(
+            Action.CREATE, {"a": "x", "b": {"Password": "secret"}, "c": "token"}
+        )
+
+    corpus.record.assert_called_once_with(
+        Action.CREATE,
+        {"a": "x", "b": "<redacted>", "c": "<redacted>"},
+        OperationStatus.SUCCESS,
+        ANY,
+    )
+
+
+def test_generate_create_example_restores_redacted_corpus_model(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "string", "const": "x"},
+            "b": {"type": "string", "const": "y"},
+            "c": {"type": "string", "const": "z"},
+        },
+        "writeOnlyProperties": ["/properties/b"],
+    }
+    resource_client._update_schema(schema)
+    resource_client._overrides = {"CREATE": {("c",): "token"}}
+    corpus = Mock()
+    corpus.replay.return_value = {"a": "w", "b": "<redacted>", "c": "<redacted>"}
+    resource_client._corpus = corpus
+
+    # redacted values are drawn again, and overrides applied to them
+    assert resource_client.generate_create_example() == {
+        "a": "w",
+        "b": "y",
+        "c": "token",
+    }
+
+
+def test_generate_examples_from_corpus(resource_client):
+    schema = {
+        "properties": {
+            "a": {"type": "number", "const": 1},
+            "b": {"type": "number", "const": 2},
+            "c": {"type": "number", "const": 3},
+        },
+        "readOnlyProperties": ["/properties/c"],
+        "createOnlyProperties": ["/properties/b"],
+    }
+    resource_client._update_schema(schema)
+    corpus = Mock()
+    corpus.replay.side_effect = [{"a": 4, "b": 5}, None, {"a": 6, "b": 7, "c": 8}]
+    corpus.sample.return_value = None
+    resource_client._corpus = corpus
+
+    assert resource_client.generate_create_example() == {"a": 4, "b": 5}
+    assert resource_client.generate_create_example() == {"a": 1, "b": 2}
+    # only properties that can be updated are taken from the stored model
+    assert resource_client.generate_update_example({"a": 4, "b": 5, "c": 9}) == {
+        "a": 6,
+        "b": 5,
+        "c": 9,
+    }
+    assert corpus.replay.call_args_list == [
+        call(Action.CREATE),
+        call(Action.CREATE),
+        call(Action.UPDATE),
+    ]
+
+
+def test_call_local_handler(resource_client):
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    local_handler = Mock()
+    local_handler.invoke.return_value = {"status": "SUCCESS"}
+    resource_client._local_handler = local_handler
+    with patch_creds:
+        status, response = resource_client.call(Action.READ, {"a": 1})
+
+    resource_client._client.invoke.assert_not_called()
+    payload = local_handler.invoke.call_args[0][0]
+    assert payload["requestData"]["resourceProperties"] == {"a": 1}
+    assert status == OperationStatus.SUCCESS
+    assert response == {"status": OperationStatus.SUCCESS.value}
+
+
 def test_call_docker():
     patch_sesh = patch(
         "rpdk.core.contract.resource_client.create_sdk_session", autospec=True
@@ -1244,6 +1624,70 @@ def test_call_async(resource_client, action):
     assert response == {"status": OperationStatus.SUCCESS.value}
 
 
+def test_call_async_fast_forwards_callback_delay(resource_client):
+    mock_client = resource_client._client
+    resource_client._callback_scheduler = CallbackScheduler(max_delay=0)
+
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+
+    mock_client.invoke.side_effect = [
+        {
+            "Payload": StringIO(
+                '{"status": "IN_PROGRESS", "resourceModel": {"c": 3},'
+                ' "callbackDelaySeconds": 600}'
+            )
+        },
+        {"Payload": StringIO('{"status": "SUCCESS"}')},
+    ]
+
+    start_time = time.time()
+    with patch_creds:
+        status, _response = resource_client.call(Action.CREATE, {})
+
+    assert status == OperationStatus.SUCCESS
+    assert time.time() - start_time < 600
+    assert resource_client._callback_scheduler.requested_delays == [600]
+    assert resource_client._callback_scheduler.skipped_seconds == 600
+
+
+def test_call_async_timeout_ignores_skipped_callback_delay(resource_client):
+    mock_client = resource_client._client
+    resource_client._callback_scheduler = CallbackScheduler(max_delay=0)
+    # a previous operation skipped longer than the timeout
+    resource_client._callback_scheduler.skipped_seconds = 10**6
+
+    patch_creds = patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    )
+    patch_assert_time = patch.object(
+        resource_client, "assert_time", wraps=resource_client.assert_time
+    )
+    mock_client.invoke.side_effect = [
+        {
+            "Payload": StringIO(
+                '{"status": "IN_PROGRESS", "resourceModel": {"c": 3},'
+                ' "callbackDelaySeconds": 600}'
+            )
+        },
+        {"Payload": StringIO('{"status": "SUCCESS"}')},
+    ]
+
+    with patch_creds, patch_assert_time as mock_assert_time:
+        status, _response = resource_client.call(Action.CREATE, {})
+
+    assert status == OperationStatus.SUCCESS
+    # only the first invocation is timed, against the wall clock
+    mock_assert_time.assert_called_once()
+    start_time, end_time, _action = mock_assert_time.call_args.args
+    assert 0 <= end_time - start_time < 600
+
+
 @pytest.mark.parametrize("action", [Action.CREATE, Action.UPDATE, Action.DELETE])
 def test_call_async_write_only_properties_are_removed(resource_client, action):
     mock_client = resource_client._client
@@ -1293,6 +1737,50 @@ def test_call_async_write_only_properties_are_not_removed_for_in_progress(
         resource_client.call(action, {})
 
 
+def test_call_logs_request_without_write_only_properties(resource_client, caplog):
+    resource_client._update_schema(SCHEMA)
+    resource_client._client.invoke.return_value = {
+        "Payload": StringIO('{"status": "SUCCESS"}')
+    }
+    with patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    ):
+        payload = resource_client._make_payload(
+            Action.UPDATE, {"c": 3, "d": 4}, {"d": 5}
+        )
+
+    with caplog.at_level(logging.DEBUG, logger=rclient.LOG.name):
+        resource_client._call(payload)
+
+    logged = json.loads(caplog.records[0].getMessage().split("\n", 1)[1])
+    assert logged["requestData"]["resourceProperties"] == {"c": 3}
+    assert logged["requestData"]["previousResourceProperties"] == {}
+    invoked = json.loads(resource_client._client.invoke.call_args[1]["Payload"])
+    assert invoked["requestData"]["resourceProperties"] == {"c": 3, "d": 4}
+    assert invoked["requestData"]["previousResourceProperties"] == {"d": 5}
+
+
+def test_call_skips_request_log_without_debug(resource_client, caplog):
+    resource_client._client.invoke.return_value = {
+        "Payload": StringIO('{"status": "SUCCESS"}')
+    }
+    with patch(
+        "rpdk.core.contract.resource_client.get_temporary_credentials",
+        autospec=True,
+        return_value={},
+    ):
+        payload = resource_client._make_payload(Action.CREATE, {"c": 3})
+
+    with caplog.at_level(logging.INFO, logger=rclient.LOG.name), patch.object(
+        resource_client, "_payload_to_log", autospec=True
+    ) as mock_payload_to_log:
+        resource_client._call(payload)
+
+    mock_payload_to_log.assert_not_called()
+
+
 def test_call_and_assert_success(resource_client):
     patch_creds = patch(
         "rpdk.core.contract.resource_client.get_temporary_credentials",
@@ -1654,6 +2142,40 @@ def test_get_value_by_key_path_with_string_key(resource_client):
     assert resource_client.get_value_by_key_path(model, key_path) == 1
 
 
+def test_get_unique_keys_for_model(resource_client):
+    schema = {
+        "properties": {},
+        "primaryIdentifier": ["/properties/a/b"],
+        "additionalIdentifiers": [["/properties/c"], ["/properties/d~1e"]],
+    }
+    resource_client._update_schema(schema)
+    model = {"a": {"b": 1}, "b": 2, "c": 3, "d/e": 4, "f": 5}
+
+    assert resource_client.get_unique_keys_for_model(model) == {
+        "a": {"b": 1},
+        "c": 3,
+        "d/e": 4,
+    }
+
+
+def test_validate_update_example_keys(resource_client):
+    schema = {
+        "properties": {},
+        "primaryIdentifier": ["/properties/a/b", "/properties/c"],
+        "createOnlyProperties": ["/properties/a/b"],
+    }
+    resource_client._update_schema(schema)
+    unique_identifiers = {"a": {"b": 1}, "c": 2}
+
+    resource_client.validate_update_example_keys(
+        unique_identifiers, {"a": {"b": 1}, "c": 3}
+    )
+    with pytest.raises(AssertionError):
+        resource_client.validate_update_example_keys(
+            unique_identifiers, {"a": {"b": 2}, "c": 2}
+        )
+
+
 def test_generate_create_example_with_inputs(resource_client_inputs):
     assert resource_client_inputs.generate_create_example() == {"a": 1}
 
@@ -1757,8 +2279,8 @@ def test_compare_should_throw_exception(resource_client):
                     "item1",
                     {"i": ["item2", "item1"]},
                     [
-                        {"j": {"k": ["item2", "item3", "item4"], "z": {"l": 10}}},
-                        {"j1": {"k3": ["item1", "item5", "item4"], "z": {"l": 10}}},
+                        {"k": ["item2", "item3", "item4"], "j": {"z": {"l": 10}}},
+                        {"k3": ["item1", "item5", "item4"], "j1": {"z": {"l": 10}}},
                     ],
                 ]
             },
@@ -1909,6 +2431,78 @@ def test_compare_collection(resource_client, inputs, outputs, schema_fragment):
     resource_client.compare(inputs, outputs)
 
 
+def test_compare_collection_referenced_array_of_objects(resource_client):
+    resource_client._update_schema(
+        {
+            "definitions": {
+                "Tags": {
+                    "type": "array",
+                    "insertionOrder": False,
+                    "items": {
+                        "type": "object",
+                        "properties": {"Key": {"type": "string"}},
+                    },
+                }
+            },
+            "properties": {
+                "Tags": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"Tags": {"$ref": "#/definitions/Tags"}},
+                    },
+                }
+            },
+        }
+    )
+    inputs = {"Tags": [{"Tags": [{"Key": "a"}, {"Key": "b"}]}]}
+    outputs = {"Tags": [{"Tags": [{"Key": "b"}, {"Key": "a"}]}]}
+
+    resource_client.compare(inputs, outputs)
+
+
+@pytest.mark.parametrize(
+    "inputs,outputs",
+    [
+        ({"Tags": ["a", "a", "b"]}, {"Tags": ["a", "b", "b"]}),
+        ({"Tags": [{"Values": ["a"]}]}, {"Tags": [{"Values": ["b"]}]}),
+    ],
+)
+def test_compare_unordered_collection_mismatch(resource_client, inputs, outputs):
+    resource_client._update_schema(
+        {
+            "properties": {
+                "Tags": {
+                    "type": "array",
+                    "insertionOrder": False,
+                    "items": {
+                        "type": ["object", "string"],
+                        "properties": {"Values": {"type": "array"}},
+                    },
+                }
+            }
+        }
+    )
+
+    with pytest.raises(AssertionError):
+        resource_client.compare_model(inputs, outputs)
+
+
+def test_compare_model_reports_each_difference(resource_client):
+    resource_client._update_schema(SCHEMA_WITH_NESTED_PROPERTIES)
+    inputs = {"b": {"d": 1}, "f": [{"d": 1}], "h": [{"d": 1}]}
+    outputs = {"b": {"d": 2}, "f": [{"d": 1}, {"d": 2}]}
+
+    with pytest.raises(AssertionError) as excinfo:
+        resource_client.compare_model(inputs, outputs)
+
+    message = str(excinfo.value)
+    assert "/b/d in Request Model (1) and Response Model (2)" in message
+    assert "/f has 1 members in Request Model, but 2" in message
+    assert "/h in Request Model" in message
+    assert message.count("Request Model :") == 1
+
+
 def test_compare_should_throw_key_error(resource_client):
     resource_client._update_schema(SCHEMA_WITH_NESTED_PROPERTIES)
     inputs = {"b": {"d": 1}, "f": [{"d": 1}], "h": [{"d": 1}]}
@@ -1,14 +1,18 @@
 import re
 from collections.abc import Sequence
 from math import isnan
+from unittest.mock import patch
 
 import pytest
 
+from rpdk.core.contract.generation_stats import GenerationStats
 from rpdk.core.contract.resource_generator import (
     NEG_INF,
     POS_INF,
     STRING_FORMATS,
     ResourceGenerator,
+    generate_examples,
+    get_schema_strategy,
     terminate_regex,
 )
 
@@ -233,3 +237,178 @@ def test_generate_strategy_with_refs():
     }
     example = ResourceGenerator(schema).generate_schema_strategy(schema).example()
     assert isinstance(example["foo"], int)
+
+
+def test_get_schema_strategy_is_cached():
+    schema = {
+        "properties": {
+            "a": {"type": "integer", "const": 1},
+            "b": {"type": "integer", "const": 2},
+        }
+    }
+    read_only_paths = {("properties", "b")}
+
+    strategy = get_schema_strategy(schema, read_only_paths)
+
+    assert strategy.example() == {"a": 1}
+    # the original schema is never modified
+    assert "b" in schema["properties"]
+    # same schema content and paths, in any order or container
+    assert (
+        get_schema_strategy(
+            {"properties": dict(reversed(schema["properties"].items()))},
+            [["properties", "b"]],
+        )
+        is strategy
+    )
+    assert get_schema_strategy(schema) is not strategy
+    assert get_schema_strategy(schema).example() == {"a": 1, "b": 2}
+
+
+def test_generate_examples_seeded():
+    schema = {
+        "properties": {
+            "a": {"type": "integer"},
+            "b": {"type": "string", "pattern": "^[a-z]{3}$"},
+        }
+    }
+    strategy = ResourceGenerator(schema).generate_schema_strategy(schema)
+
+    examples = generate_examples(strategy, 5, seed=1)
+
+    assert len(examples) == 5
+    assert all(re.fullmatch("[a-z]{3}", example["b"]) for example in examples)
+    assert generate_examples(strategy, 5, seed=1) == examples
+    assert generate_examples(strategy, 5, seed=2) != examples
+
+
+def _nesting(example, key):
+    depth = 0
+    while key in example:
+        example = example[key]
+        depth += 1
+    return depth
+
+
+@pytest.mark.parametrize("max_ref_depth", [1, 2, 3])
+def test_generate_strategy_with_recursive_refs(max_ref_depth):
+    schema = {
+        "properties": {"Rule": {"$ref": "#/definitions/Rule"}},
+        "definitions": {
+            "Rule": {
+                "type": "object",
+                "properties": {
+                    "Name": {"type": "string", "const": "a"},
+                    "Not": {"$ref": "#/definitions/Rule"},
+                    "And": {"type": "array", "items": {"$ref": "#/definitions/Rule"}},
+                },
+            }
+        },
+    }
+    strategy = ResourceGenerator(schema, max_ref_depth).generate_schema_strategy(schema)
+
+    for example in generate_examples(strategy, 5, seed=1):
+        assert _nesting(example, "Rule") == 1
+        assert _nesting(example["Rule"], "Not") == max_ref_depth - 1
+
+
+def test_generate_strategy_with_mutually_recursive_refs():
+    schema = {
+        "properties": {"Condition": {"$ref": "#/definitions/Condition"}},
+        "definitions": {
+            "Rule": {
+                "type": "object",
+                "properties": {"Condition": {"$ref": "#/definitions/Condition"}},
+            },
+            "Condition": {
+                "oneOf": [
+                    {"type": "object", "properties": {"Leaf": {"const": 1}}},
+                    {
+                        "type": "object",
+                        "properties": {"Rule": {"$ref": "#/definitions/Rule"}},
+                    },
+                ]
+            },
+        },
+    }
+    strategy = ResourceGenerator(schema, 2).generate_schema_strategy(schema)
+
+    for example in generate_examples(strategy, 10, seed=1):
+        assert "Condition" in example
+
+
+def test_generate_strategy_with_shared_refs():
+    definition = {
+        "oneOf": [
+            {"type": "string", "const": "a"},
+            {"type": "integer", "const": 1},
+        ]
+    }
+    schema = {
+        "properties": {
+            "First": {"$ref": "#/definitions/Shared"},
+            "Second": {"$ref": "#/definitions/Shared"},
+        },
+        "definitions": {"Shared": definition},
+    }
+    generator = ResourceGenerator(schema)
+    strategy = generator.generate_schema_strategy(schema)
+
+    # the definition is compiled once, and not modified by compiling it
+    assert list(generator._ref_strategies) == [  # pylint: disable=protected-access
+        "#/definitions/Shared"
+    ]
+    assert "oneOf" in schema["definitions"]["Shared"]
+    examples = generate_examples(strategy, 10, seed=1)
+    assert {example["Second"] for example in examples} == {"a", 1}
+
+
+def test_generate_strategy_with_stats():
+    schema = {
+        "properties": {
+            "Name": {"type": "string", "pattern": "^[a-z]{3}$"},
+            "Rules": {"type": "array", "items": {"$ref": "#/definitions/Rule"}},
+            "Pair": {"type": "array", "items": [{"const": 1}, {"const": "a"}]},
+        },
+        "definitions": {
+            "Rule": {"type": "object", "properties": {"Id": {"type": "integer"}}}
+        },
+    }
+    stats = GenerationStats()
+    strategy = get_schema_strategy(schema, stats=stats)
+
+    examples = generate_examples(strategy, 5, seed=1)
+
+    # definitions are measured where they are defined, not where they are used
+    assert set(stats.paths) == {
+        ("properties", "Name"),
+        ("properties", "Rules"),
+        ("properties", "Rules", "items"),
+        ("definitions", "Rule", "properties", "Id"),
+        ("properties", "Pair"),
+        ("properties", "Pair", "items", 0),
+        ("properties", "Pair", "items", 1),
+    }
+    assert stats[("properties", "Name")].draws >= len(examples)
+    assert get_schema_strategy(schema) is not strategy
+
+
+def test_generate_strategy_with_stats_shares_compiled_strategy():
+    schema = {"properties": {"SharedName": {"type": "string"}}}
+    first_stats, second_stats = GenerationStats(), GenerationStats()
+    with patch(
+        "rpdk.core.contract.resource_generator.ResourceGenerator",
+        wraps=ResourceGenerator,
+    ) as mock_generator:
+        first = get_schema_strategy(schema, stats=first_stats)
+        second = get_schema_strategy(schema, stats=second_stats)
+
+    # the stats are not part of the cache key
+    mock_generator.assert_called_once()
+    # each client records only its own draws
+    generate_examples(first, 3, seed=1)
+    first_draws = first_stats[("properties", "SharedName")].draws
+    assert second_stats.paths == {}
+    generate_examples(second, 2, seed=1)
+    assert second_stats[("properties", "SharedName")].draws >= 2
+    assert first_stats[("properties", "SharedName")].draws == first_draws
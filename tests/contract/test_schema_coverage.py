@@ -0,0 +1,99 @@
+from rpdk.core.contract.schema_coverage import SchemaCoverage
+
+SCHEMA = {
+    "definitions": {
+        "Rule": {
+            "type": "object",
+            "properties": {
+                "Status": {"type": "string", "enum": ["Enabled", "Disabled"]},
+                "Rules": {"type": "array", "items": {"$ref": "#/definitions/Rule"}},
+            },
+        },
+        "Target": {
+            "oneOf": [
+                {
+                    "type": "object",
+                    "properties": {"Arn": {"type": "string"}},
+                    "required": ["Arn"],
+                },
+                {
+                    "type": "object",
+                    "properties": {"Id": {"type": "integer"}},
+                    "required": ["Id"],
+                },
+            ]
+        },
+    },
+    "properties": {
+        "Rule": {"$ref": "#/definitions/Rule"},
+        "Target": {"$ref": "#/definitions/Target"},
+        "Tags": {"type": "array", "maxItems": 1, "items": {"type": "string"}},
+    },
+}
+
+
+def test_schema_features():
+    coverage = SchemaCoverage(SCHEMA)
+
+    assert coverage.features == {
+        ("property", ("Rule",)),
+        ("property", ("Rule", "Status")),
+        ("enum", ("Rule", "Status"), '"Enabled"'),
+        ("enum", ("Rule", "Status"), '"Disabled"'),
+        ("property", ("Rule", "Rules")),
+        ("array", ("Rule", "Rules"), "empty"),
+        ("array", ("Rule", "Rules"), "one"),
+        ("array", ("Rule", "Rules"), "many"),
+        ("property", ("Target",)),
+        ("branch", ("Target",), 0),
+        ("branch", ("Target",), 1),
+        ("property", ("Target", "Arn")),
+        ("property", ("Target", "Id")),
+        ("property", ("Tags",)),
+        ("array", ("Tags",), "empty"),
+        ("array", ("Tags",), "one"),
+    }
+    assert not coverage.covered
+    assert coverage.percent == 0
+
+
+def test_example_features():
+    coverage = SchemaCoverage(SCHEMA)
+    example = {
+        "Rule": {"Status": "Enabled", "Rules": [{"Status": "Disabled"}]},
+        "Target": {"Id": 1},
+        "Tags": [],
+    }
+
+    assert coverage.example_features(example) == {
+        ("property", ("Rule",)),
+        ("property", ("Rule", "Status")),
+        ("enum", ("Rule", "Status"), '"Enabled"'),
+        ("property", ("Rule", "Rules")),
+        ("array", ("Rule", "Rules"), "one"),
+        ("property", ("Target",)),
+        ("branch", ("Target",), 1),
+        ("property", ("Target", "Id")),
+        ("property", ("Tags",)),
+        ("array", ("Tags",), "empty"),
+    }
+
+
+def test_select_maximizes_new_features():
+    coverage = SchemaCoverage(SCHEMA)
+    first = {"Target": {"Arn": "a"}, "Tags": ["a"]}
+    coverage.record(first)
+
+    selected = coverage.select(
+        [
+            {"Target": {"Arn": "b"}, "Tags": ["b"]},
+            {"Target": {"Id": 1}},
+            {"Tags": []},
+        ]
+    )
+
+    assert selected == {"Target": {"Id": 1}}
+    assert coverage.gain(selected) == 0
+    assert coverage.percent == 100.0 * 7 / 16
+    assert ("property", ("Rule",)) in coverage.uncovered()
+    assert coverage.summary() == "schema coverage: 43.8% (7/16 features)"
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from rpdk.core.contract.target_examples import (
+    EXAMPLES_PER_TARGET,
+    TargetExampleCache,
+    generate_target_examples,
+    prepare_target_examples,
+)
+
+SCHEMA = {
+    "properties": {
+        "a": {"type": "number", "const": 1},
+        "b": {"type": "number", "const": 2},
+        "c": {"type": "number", "const": 3},
+    },
+}
+READ_ONLY = {("properties", "b")}
+CREATE_ONLY = {("properties", "c")}
+EXAMPLES = {
+    "create": [{"a": 1, "c": 3}] * EXAMPLES_PER_TARGET,
+    "update": [{"a": 1}] * EXAMPLES_PER_TARGET,
+}
+
+
+def test_generate_target_examples():
+    assert generate_target_examples(SCHEMA, READ_ONLY, CREATE_ONLY, 0) == EXAMPLES
+
+
+def test_cache(tmp_path):
+    cache = TargetExampleCache(tmp_path / "examples")
+    assert cache.get(SCHEMA, 0) is None
+
+    cache.put(SCHEMA, 0, EXAMPLES)
+
+    assert cache.get(SCHEMA, 0) == EXAMPLES
+    assert cache.get(SCHEMA, 1) is None
+    assert cache.get({**SCHEMA, "required": ["a"]}, 0) is None
+
+
+def test_cache_invalid(tmp_path, caplog):
+    cache = TargetExampleCache(tmp_path)
+    cache.put(SCHEMA, 0, {"create": [], "update": []})
+    assert cache.get(SCHEMA, 0) is None
+
+    cache._path(SCHEMA, 0).write_text("{", encoding="utf-8")
+    assert cache.get(SCHEMA, 0) is None
+    assert "Ignoring invalid target examples" in caplog.text
+
+
+def test_prepare_target_examples_cached(tmp_path):
+    cache = TargetExampleCache(tmp_path)
+    cache.put(SCHEMA, 0, EXAMPLES)
+    other_schema = {"properties": {"d": {"type": "string", "const": "d"}}}
+    jobs = {
+        "AWS::A::B": (SCHEMA, READ_ONLY, CREATE_ONLY, 0),
+        "AWS::C::D": (other_schema, set(), set(), 0),
+    }
+
+    examples = prepare_target_examples(jobs, cache)
+
+    assert examples["AWS::A::B"] == EXAMPLES
+    assert examples["AWS::C::D"]["create"][0] == {"d": "d"}
+    assert cache.get(other_schema, 0) == examples["AWS::C::D"]
+
+
+def test_prepare_target_examples_in_parallel():
+    jobs = {f"AWS::A::{i}": (SCHEMA, READ_ONLY, CREATE_ONLY, i) for i in range(2)}
+    with patch("rpdk.core.contract.target_examples.MIN_PARALLEL_TARGETS", 2):
+        examples = prepare_target_examples(jobs, workers=2)
+    assert examples == {target: EXAMPLES for target in jobs}
@@ -0,0 +1,61 @@
+import random
+
+from rpdk.core.contract.target_sampling import sample_targets, schema_shape
+
+SMALL = {"properties": {"a": {"type": "string"}}}
+NESTED = {"properties": {"a": {"$ref": "#/definitions/A"}}}
+LARGE = {"properties": {str(i): {"type": "string"} for i in range(30)}}
+
+
+def _target_info(targets):
+    return {target: {"Schema": schema} for target, schema in targets.items()}
+
+
+def test_schema_shape():
+    assert schema_shape(SMALL) == ("small", False)
+    assert schema_shape(NESTED) == ("small", True)
+    assert schema_shape(LARGE) == ("large", False)
+    assert schema_shape({"properties": {str(i): {} for i in range(6)}}) == (
+        "medium",
+        False,
+    )
+
+
+def test_sample_all_targets():
+    targets = ["AWS::S3::Bucket", "AWS::EC2::VPC"]
+    assert sample_targets(targets, {}, 2, random.Random(0)) == sorted(targets)
+
+
+def test_sample_spreads_over_namespaces_and_shapes():
+    target_info = _target_info(
+        {
+            "AWS::S3::Small1": SMALL,
+            "AWS::S3::Small2": SMALL,
+            "AWS::S3::Small3": SMALL,
+            "AWS::S3::Large": LARGE,
+            "AWS::EC2::Small": SMALL,
+            "AWS::EC2::Nested": NESTED,
+        }
+    )
+
+    for seed in range(10):
+        sample = sample_targets(list(target_info), target_info, 4, random.Random(seed))
+        assert len(sample) == 4
+        assert "AWS::S3::Large" in sample
+        assert {"AWS::EC2::Small", "AWS::EC2::Nested"} <= set(sample)
+
+
+def test_sample_is_seeded():
+    target_info = _target_info(
+        {f"AWS::S{i}::R{j}": SMALL for i in range(5) for j in range(5)}
+    )
+    targets = list(target_info)
+
+    first = sample_targets(targets, target_info, 5, random.Random(1))
+
+    assert first == sample_targets(targets, target_info, 5, random.Random(1))
+    assert len({target.split("::")[1] for target in first}) == 5
+    assert any(
+        first != sample_targets(targets, target_info, 5, random.Random(seed))
+        for seed in range(2, 10)
+    )
@@ -0,0 +1,81 @@
+import jsonpatch
+import pytest
+
+from rpdk.core.jsonutils.diff import IdentifierChangedError, make_patch, patched_paths
+
+
+def only_ordered(path):
+    return path == ("Ordered",)
+
+
+@pytest.mark.parametrize(
+    "source,target",
+    [
+        ({"a": 1}, {"a": 1}),
+        ({"a": 1}, {"a": 2}),
+        ({"a": 1, "b": 2}, {"c": 3}),
+        ({"a": {"b": {"c": 1}}}, {"a": {"b": {"c": 2, "d": 3}}}),
+        ({"a": [1, 2, 3]}, {"a": [0, 1, 2, 3]}),
+        ({"a": [1, 2, 3, 4]}, {"a": [1, 4]}),
+        ({"a": [1, 2, 3]}, {"a": [1, 5, 6, 7, 3]}),
+        ({"a": [{"b": 1}, {"b": 2}]}, {"a": [{"b": 1}, {"b": 3}]}),
+        ({"a": [[1], [2]]}, {"a": [[1], [2, 3]]}),
+        ({"a": 1}, {"a": True}),
+        ({"a": [1, 2]}, {"a": [True, 2]}),
+        ({"a": "~/"}, {"a/": {"~": None}}),
+        ([1], {"a": 1}),
+    ],
+)
+def test_make_patch_applies_to_target(source, target):
+    patch = make_patch(source, target)
+
+    assert jsonpatch.apply_patch(source, patch, in_place=False) == target
+
+
+def test_make_patch_is_small():
+    source = {"a": list(range(100)), "b": {"c": 1, "d": 2}}
+    target = {"a": list(range(100)), "b": {"c": 1, "d": 3}}
+    target["a"].insert(50, -1)
+
+    assert make_patch(source, target) == [
+        {"op": "add", "path": "/a/50", "value": -1},
+        {"op": "replace", "path": "/b/d", "value": 3},
+    ]
+
+
+def test_make_patch_unordered_arrays_are_multisets():
+    source = {"Tags": [{"Key": "a"}, {"Key": "b"}, {"Key": "b"}], "Ordered": [1, 2]}
+    target = {"Tags": [{"Key": "c"}, {"Key": "b"}, {"Key": "a"}], "Ordered": [2, 1]}
+
+    patch = make_patch(source, target, is_ordered=only_ordered)
+
+    assert patch == [
+        {"op": "remove", "path": "/Tags/1"},
+        {"op": "add", "path": "/Tags/-", "value": {"Key": "c"}},
+        {"op": "replace", "path": "/Ordered/0", "value": 2},
+        {"op": "replace", "path": "/Ordered/1", "value": 1},
+    ]
+    patched = jsonpatch.apply_patch(source, patch, in_place=False)
+    assert sorted(patched["Tags"], key=str) == sorted(target["Tags"], key=str)
+    assert patched["Ordered"] == target["Ordered"]
+
+
+def test_make_patch_identifiers_must_not_change():
+    source = {"Id": "a", "Nested": {"Id": 1}, "Name": "x"}
+
+    assert make_patch(source, dict(source, Name="y"), identifier_paths=[("Id",)])
+    with pytest.raises(IdentifierChangedError) as excinfo:
+        make_patch(
+            source,
+            {"Id": "b", "Nested": {}},
+            identifier_paths=[("Id",), ("Nested", "Id"), ("Missing",)],
+        )
+
+    assert excinfo.value.paths == {("Id",), ("Nested", "Id")}
+    assert "/Id, /Nested/Id" in str(excinfo.value)
+
+
+def test_patched_paths():
+    patch = make_patch({"a": {"b~": 1}, "c": [1]}, {"a": {"b~": 2}, "c": [1, 2]})
+
+    assert patched_paths(patch) == [("a", "b~"), ("c", "1")]
@@ -0,0 +1,81 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from rpdk.core.jsonutils.pointer import (
+    JsonPointer,
+    fragment_decode,
+    fragment_encode,
+    fragment_list,
+)
+
+
+def test_json_pointer_is_interned():
+    assert JsonPointer(["foo", "bar"]) is JsonPointer(("foo", "bar"))
+    assert JsonPointer.parse("#/foo/bar") is JsonPointer(("foo", "bar"))
+    assert JsonPointer.parse("/foo/bar", prefix="") is JsonPointer(("foo", "bar"))
+    assert JsonPointer.from_segments(["properties", "foo", "bar"]) is JsonPointer(
+        ("foo", "bar")
+    )
+
+
+def test_json_pointer_interned_by_type():
+    pointers = [JsonPointer((1,)), JsonPointer((1.0,)), JsonPointer((True,))]
+
+    assert [pointer.encode() for pointer in pointers] == ["#/1", "#/1.0", "#/True"]
+    assert len(set(pointers)) == 3
+    assert fragment_encode([True]) == "#/True"
+
+
+def test_json_pointer_caches_are_bounded():
+    with patch("rpdk.core.jsonutils.pointer.CACHE_SIZE", 2):
+        first = JsonPointer.parse("#/bounded/0")
+        for index in range(1, 4):
+            JsonPointer.parse(f"#/bounded/{index}")
+
+        assert len(JsonPointer._interned) <= 2
+        assert len(JsonPointer._parsed) <= 2
+    # evicted pointers are still equal to new instances
+    assert JsonPointer(("bounded", "0")) == first
+
+
+def test_json_pointer_is_hashable():
+    pointers = {JsonPointer(("foo",)), JsonPointer.parse("#/foo")}
+
+    assert pointers == {JsonPointer(("foo",))}
+    assert JsonPointer(("foo",)) != ("foo",)
+
+
+def test_json_pointer_pickle_is_interned():
+    pointer = JsonPointer(("foo", "~bar"))
+
+    assert pickle.loads(pickle.dumps(pointer)) is pointer
+
+
+def test_json_pointer_encode_is_cached():
+    pointer = JsonPointer(("foo", " ", 0))
+
+    encoded = pointer.encode()
+
+    assert encoded == "#/foo/%20/0"
+    assert pointer.encode() is encoded
+    assert pointer.encode(prefix="") == "/foo/%20/0"
+
+
+def test_json_pointer_invalid_prefix_is_not_cached():
+    with pytest.raises(ValueError):
+        JsonPointer.parse("/foo")
+    with pytest.raises(ValueError):
+        JsonPointer.parse("/foo")
+
+
+def test_fragment_functions_return_new_lists():
+    decoded = fragment_decode("#/foo/bar", output=list)
+    decoded.append("baz")
+    listed = fragment_list(["properties", "foo"])
+    listed.append("baz")
+
+    assert fragment_decode("#/foo/bar", output=list) == ["foo", "bar"]
+    assert fragment_list(["properties", "foo"]) == ["foo"]
+    assert fragment_encode(["foo", "bar"]) == "#/foo/bar"
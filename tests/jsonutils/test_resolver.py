@@ -70,6 +70,44 @@ def test_modelresolver_unique_model_name():
     }
 
 
+def test_modelresolver_duplicate_model_name_from_definitions():
+    flattened = {
+        (): {"properties": {}},
+        ("definitions", "Foo"): {"properties": {}},
+        ("properties", "foo"): {"properties": {}},
+    }
+    with pytest.raises(ModelResolverError) as excinfo:
+        ModelResolver(flattened)
+
+    assert "'Foo' found at ('definitions', 'Foo')" in str(excinfo.value)
+
+
+def test_modelresolver_shares_resolved_types():
+    unique = {"properties": {"foo": {"type": "string"}, "bar": {"type": "string"}}}
+    flattened = {
+        (): {
+            "properties": {
+                "First": {"$ref": ("definitions", "Unique")},
+                "Second": {"$ref": ("definitions", "Unique")},
+            },
+        },
+        ("definitions", "Unique"): unique,
+    }
+    resolver = ModelResolver(flattened)
+
+    models = resolver.resolve_models()
+
+    assert models["ResourceModel"]["First"] is models["ResourceModel"]["Second"]
+    assert models["Unique"]["foo"] is models["Unique"]["bar"]
+    assert models["Unique"]["foo"] is ResolvedType.primitive("string")
+    assert resolver.resolve_models()["Unique"]["foo"] is models["Unique"]["foo"]
+
+
+def test_resolved_type_slots():
+    with pytest.raises(AttributeError):
+        ResolvedType(ContainerType.PRIMITIVE, "string").extra = 1
+
+
 @pytest.mark.parametrize(
     "schema,result",
     (
@@ -0,0 +1,100 @@
+from rpdk.core.jsonutils.schema_index import SchemaIndex
+
+SCHEMA = {
+    "definitions": {
+        "Rule": {
+            "type": "object",
+            "properties": {
+                "Tags": {"$ref": "#/definitions/Tags"},
+                "Rules": {"type": "array", "items": {"$ref": "#/definitions/Rule"}},
+            },
+        },
+        "Tags": {
+            "type": "array",
+            "insertionOrder": False,
+            "uniqueItems": True,
+            "arrayType": "AttributeList",
+            "items": {"type": "object", "properties": {"Key": {"type": "string"}}},
+        },
+    },
+    "properties": {
+        "Rules": {
+            "type": "array",
+            "insertionOrder": True,
+            "items": {"$ref": "#/definitions/Rule"},
+        },
+        "Name": {"type": "string"},
+    },
+}
+
+
+def test_schema_index_metadata():
+    index = SchemaIndex(SCHEMA)
+
+    tags = index[("Rules", "Tags")]
+    assert tags.type == "array"
+    assert tags.insertion_order is False
+    assert tags.unique_items is True
+    assert tags.array_type == "AttributeList"
+    assert index[("Rules", "Tags", "Key")].type == "string"
+    assert index[("Name",)].insertion_order is True
+
+
+def test_schema_index_recursive_definition():
+    index = SchemaIndex(SCHEMA)
+
+    nested = index[("Rules", "Rules", "Rules", "Rules")]
+
+    assert nested is index[("Rules", "Rules")]
+    assert index[("Rules", "Rules", "Rules", "Tags")].insertion_order is False
+
+
+def test_schema_index_repeated_property_names():
+    schema = {
+        "properties": {
+            "Items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"Items": {"type": "array", "insertionOrder": False}},
+                },
+            }
+        }
+    }
+    index = SchemaIndex(schema)
+
+    assert index[("Items",)].insertion_order is True
+    assert index[("Items", "Items")].insertion_order is False
+
+
+def test_schema_index_combiners():
+    schema = {
+        "properties": {
+            "Value": {
+                "oneOf": [
+                    {"properties": {"A": {"type": "string"}}},
+                    {"properties": {"B": {"type": "array", "insertionOrder": False}}},
+                ]
+            }
+        }
+    }
+    index = SchemaIndex(schema)
+
+    assert index[("Value", "A")].type == "string"
+    assert index[("Value", "B")].insertion_order is False
+
+
+def test_schema_index_missing_paths():
+    schema = {
+        "properties": {
+            "Broken": {"$ref": "#/definitions/Missing"},
+            "Loop": {"$ref": "#/properties/Loop"},
+        }
+    }
+    index = SchemaIndex(schema)
+
+    assert index[("Broken",)].type is None
+    assert index[("Loop",)].type is None
+    assert index[("Missing",)] is None
+    assert index[("Missing", "Deeper")] is None
+    assert SchemaIndex([])[("Missing",)] is None
@@ -3,6 +3,8 @@ import pytest
 from rpdk.core.jsonutils.utils import (
     NON_MERGABLE_KEYS,
     ConstraintError,
+    PathTrie,
+    iter_path_for_sequence_members,
     schema_merge,
     traverse_path_for_sequence_members,
 )
@@ -188,3 +190,86 @@ def test_traverse_path_for_sequence_members_multiple_unpack():
 
     # Assert
     assert result == actual_result
+
+
+def test_path_trie_prunes_all_paths_in_one_traversal():
+    document = {
+        "array": [
+            {"inner": {"a": 1, "b": 2}, "list": [1, 2]},
+            {"inner": {"a": 3, "b": 4}, "list": [3, 4]},
+        ],
+        "foo": "bar",
+        "spam": "eggs",
+    }
+    trie = PathTrie(
+        [
+            ("array", "*", "inner", "a"),
+            ("array", "*", "list", "*"),
+            ("array", "0", "inner", "b"),
+            ("foo",),
+            ("not_found", "*", "not_found"),
+        ]
+    )
+
+    assert trie.prune(document) is document
+    assert document == {
+        "array": [{"inner": {}, "list": []}, {"inner": {"b": 4}, "list": []}],
+        "spam": "eggs",
+    }
+
+
+def test_path_trie_indices_refer_to_sequence_before_pruning():
+    document = {"array": ["a", "b", "c", "d"]}
+
+    PathTrie([("array", "0"), ("array", "1"), ("array", "-1")]).prune(document)
+
+    assert document == {"array": ["c"]}
+
+
+@pytest.mark.parametrize(
+    "path",
+    [("array", "foo"), ("array", "9"), ("foo", "bar"), ("foo", "*"), ("obj", "*")],
+)
+def test_path_trie_ignores_parts_not_in_document(path):
+    document = {"array": ["a"], "foo": "bar", "obj": {"a": 1}}
+
+    PathTrie([path]).prune(document)
+
+    assert document == {"array": ["a"], "foo": "bar", "obj": {"a": 1}}
+
+
+def test_path_trie_iterates_paths():
+    trie = PathTrie([["a", "b"], ("a", "b"), ("c",)])
+
+    assert len(trie) == 2
+    assert set(trie) == {("a", "b"), ("c",)}
+
+
+def test_traverse_path_for_sequence_members_index_then_key():
+    document = {"foo": [{"bar": 1}, {"bar": 2}]}
+
+    result = traverse_path_for_sequence_members(document, ("foo", "1", "bar"))
+
+    assert result == ([2], [("foo", 1, "bar")])
+
+
+def test_iter_path_for_sequence_members_is_lazy():
+    document = {"foo": [{"bar": 1}, {"baz": 2}]}
+
+    members = iter_path_for_sequence_members(document, ("foo", "*", "bar"), ["x"])
+
+    assert next(members) == (1, ("x", "foo", 0, "bar"))
+    with pytest.raises(KeyError):
+        next(members)
+
+
+def test_iter_path_for_sequence_members_nested_unpack_order():
+    document = {"a": [{"b": [1, 2]}, {"b": []}, {"b": [3]}]}
+
+    members = list(iter_path_for_sequence_members(document, ("a", "*", "b", "*")))
+
+    assert members == [
+        (1, ("a", 0, "b", 0)),
+        (2, ("a", 0, "b", 1)),
+        (3, ("a", 2, "b", 0)),
+    ]
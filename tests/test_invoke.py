@@ -296,13 +296,18 @@ def test_keyboard_interrupt_resource(capsys, resource_payload_path, command):
 
     patch_dumps = patch.object(json, "dumps", side_effect=KeyboardInterrupt)
 
+    patch_http_client = patch(
+        "rpdk.core.contract.resource_client.LambdaHttpClient", autospec=True
+    )
+
     # fmt: off
     with patch_project, \
          patch_creds, \
          patch_dumps, \
          patch_account, \
-         patch_session as mock_session:
-        mock_client = mock_session.return_value.client.return_value
+         patch_session, \
+         patch_http_client as mock_http_client:
+        mock_client = mock_http_client.return_value
         main(args_in=["invoke", "resource", command, str(resource_payload_path)])
     # fmt: on
 
@@ -324,14 +329,19 @@ def test_keyboard_interrupt_hook(capsys, hook_payload_path, command):
     ) = _setup_hook_test()
     patch_dumps = patch.object(json, "dumps", side_effect=KeyboardInterrupt)
 
+    patch_http_client = patch(
+        "rpdk.core.contract.hook_client.LambdaHttpClient", autospec=True
+    )
+
     # fmt: off
     with patch_project, \
          patch_creds, \
          patch_dumps, \
          patch_account, \
          patch_type_name, \
-         patch_session as mock_session:
-        mock_client = mock_session.return_value.client.return_value
+         patch_session, \
+         patch_http_client as mock_http_client:
+        mock_client = mock_http_client.return_value
         main(args_in=["invoke", "hook", command, str(hook_payload_path)])
     # fmt: on
 
@@ -386,12 +396,17 @@ def _invoke_and_expect_resource(status, resource_payload_path, command, *args):
         patch_account,
     ) = _setup_resource_test()
 
+    patch_http_client = patch(
+        "rpdk.core.contract.resource_client.LambdaHttpClient", autospec=True
+    )
+
     # fmt: off
     with patch_project, \
          patch_account, \
-         patch_session as mock_session, \
+         patch_session, \
+         patch_http_client as mock_http_client, \
             patch_creds as mock_creds:
-        mock_client = mock_session.return_value.client.return_value
+        mock_client = mock_http_client.return_value
         mock_client.invoke.side_effect = lambda **_kwargs: {
             "Payload": StringIO(json.dumps({"status": status}))
         }
@@ -412,13 +427,18 @@ def _invoke_and_expect_hook(status, hook_payload_path, command, *args):
         patch_type_name,
     ) = _setup_hook_test()
 
+    patch_http_client = patch(
+        "rpdk.core.contract.hook_client.LambdaHttpClient", autospec=True
+    )
+
     # fmt: off
     with patch_project, \
          patch_account, \
          patch_type_name, \
-         patch_session as mock_session, \
+         patch_session, \
+         patch_http_client as mock_http_client, \
             patch_creds as mock_creds:
-        mock_client = mock_session.return_value.client.return_value
+        mock_client = mock_http_client.return_value
         mock_client.invoke.side_effect = lambda **_kwargs: {
             "Payload": StringIO(json.dumps({"status": status}))
         }
@@ -0,0 +1,257 @@
+# fixture and parameter have the same name
+# pylint: disable=redefined-outer-name
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from botocore import UNSIGNED
+from botocore.config import Config
+
+from rpdk.core.cli import main
+from rpdk.core.exceptions import InvalidProjectError
+from rpdk.core.project import (
+    ARTIFACT_TYPE_HOOK,
+    ARTIFACT_TYPE_MODULE,
+    ARTIFACT_TYPE_RESOURCE,
+    Project,
+)
+from rpdk.core.serve import (
+    HOOK_RESPONSE_PATTERN,
+    RESOURCE_RESPONSE_PATTERN,
+    ContainerPool,
+    LambdaInvokeServer,
+    create_backend,
+)
+from rpdk.core.test import DEFAULT_FUNCTION
+
+
+@pytest.fixture
+def backend():
+    return Mock(spec=["invoke", "close"])
+
+
+@pytest.fixture
+def lambda_client(backend):
+    server = LambdaInvokeServer(("127.0.0.1", 0), backend, DEFAULT_FUNCTION, 2, 10)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = boto3.client(
+        "lambda",
+        endpoint_url=f"http://127.0.0.1:{server.server_address[1]}",
+        region_name="us-east-1",
+        config=Config(signature_version=UNSIGNED, retries={"max_attempts": 0}),
+    )
+    yield client
+    server.shutdown()
+    server.server_close()
+
+
+def test_invoke(lambda_client, backend):
+    backend.invoke.return_value = {"status": "SUCCESS"}
+
+    for _ in range(2):
+        result = lambda_client.invoke(
+            FunctionName=DEFAULT_FUNCTION, Payload=b'{"action": "CREATE"}'
+        )
+        assert json.load(result["Payload"]) == {"status": "SUCCESS"}
+        assert "FunctionError" not in result
+
+    backend.invoke.assert_called_with({"action": "CREATE"})
+
+
+def test_invoke_handler_error(lambda_client, backend):
+    backend.invoke.side_effect = TimeoutError("too slow")
+
+    result = lambda_client.invoke(FunctionName=DEFAULT_FUNCTION, Payload=b"{}")
+
+    assert result["FunctionError"] == "Unhandled"
+    assert json.load(result["Payload"]) == {
+        "errorType": "TimeoutError",
+        "errorMessage": "too slow",
+    }
+
+
+SLEEPING_HANDLER = """
+import time
+
+
+def resource(event, context):
+    time.sleep(event.get("sleep", 0))
+    return {"status": "SUCCESS"}
+"""
+
+
+def test_invoke_subprocess_backend_recovers_from_timeout(tmp_path):
+    package_dir = tmp_path / "src" / "serve_sleeping_handler"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "handlers.py").write_text(SLEEPING_HANDLER)
+    project = _project()
+    project.root = tmp_path
+    project.entrypoint = "serve_sleeping_handler.handlers.resource"
+    backend = create_backend(_args(workers=1, timeout="5"), project)
+    server = LambdaInvokeServer(("127.0.0.1", 0), backend, DEFAULT_FUNCTION, 1, 5)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = boto3.client(
+        "lambda",
+        endpoint_url=f"http://127.0.0.1:{server.server_address[1]}",
+        region_name="us-east-1",
+        config=Config(signature_version=UNSIGNED, retries={"max_attempts": 0}),
+    )
+    try:
+        timed_out = client.invoke(
+            FunctionName=DEFAULT_FUNCTION, Payload=b'{"sleep": 600}'
+        )
+        # the only worker is replaced, so the next invocation is handled
+        result = client.invoke(FunctionName=DEFAULT_FUNCTION, Payload=b"{}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        backend.close()
+
+    assert timed_out["FunctionError"] == "Unhandled"
+    assert json.load(timed_out["Payload"])["errorType"] == "TimeoutError"
+    assert "FunctionError" not in result
+    assert json.load(result["Payload"]) == {"status": "SUCCESS"}
+
+
+def test_invoke_unknown_function(lambda_client, backend):
+    with pytest.raises(lambda_client.exceptions.ResourceNotFoundException):
+        lambda_client.invoke(FunctionName="Unknown", Payload=b"{}")
+    backend.invoke.assert_not_called()
+
+
+def _args(**kwargs):
+    args = Mock(
+        docker_image=None,
+        workers=2,
+        timeout="60",
+        function_name=DEFAULT_FUNCTION,
+        region="us-east-1",
+    )
+    for key, value in kwargs.items():
+        setattr(args, key, value)
+    return args
+
+
+def _project(artifact_type=ARTIFACT_TYPE_RESOURCE, runtime="python3.9"):
+    project = Mock(spec=Project)
+    project.artifact_type = artifact_type
+    project.runtime = runtime
+    project.executable_entrypoint = "handler --run"
+    return project
+
+
+def test_create_backend_python():
+    project = _project()
+    with patch("rpdk.core.serve.create_local_handler", autospec=True) as mock_create:
+        backend = create_backend(_args(), project)
+
+    assert backend is mock_create.return_value
+    mock_create.assert_called_once_with(
+        "subprocess", project, DEFAULT_FUNCTION, processes=2, timeout=60
+    )
+
+
+def test_create_backend_not_python_requires_image():
+    with pytest.raises(InvalidProjectError):
+        create_backend(_args(), _project(runtime="java8"))
+
+
+def test_create_backend_image_requires_executable_entrypoint():
+    project = _project(runtime="java8")
+    project.executable_entrypoint = None
+    with pytest.raises(InvalidProjectError):
+        create_backend(_args(docker_image="image"), project)
+
+
+@pytest.mark.parametrize(
+    "artifact_type,marker,pattern",
+    [
+        (ARTIFACT_TYPE_RESOURCE, "RESOURCE", RESOURCE_RESPONSE_PATTERN),
+        (ARTIFACT_TYPE_HOOK, "HOOK", HOOK_RESPONSE_PATTERN),
+    ],
+)
+def test_container_pool(artifact_type, marker, pattern):
+    with patch("rpdk.core.serve.docker", autospec=True) as mock_docker:
+        mock_client = mock_docker.from_env.return_value
+        mock_client.images.get.return_value.attrs = {"Config": {"Entrypoint": None}}
+        mock_container = mock_client.containers.run.return_value
+        backend = create_backend(
+            _args(docker_image="image"), _project(artifact_type, runtime="java8")
+        )
+        assert isinstance(backend, ContainerPool)
+        assert backend._response_pattern is pattern  # pylint: disable=W0212
+
+        mock_container.exec_run.return_value = (
+            0,
+            f'logs\n__CFN_{marker}_START_RESPONSE__{{"status": "SUCCESS"}}'
+            f"__CFN_{marker}_END_RESPONSE__".encode(),
+        )
+        assert backend.invoke({"a": 1}) == {"status": "SUCCESS"}
+        backend.close()
+
+    # containers are started once, not per invocation
+    assert mock_docker.from_env.return_value.containers.run.call_count == 2
+    command = mock_container.exec_run.call_args[0][0]
+    assert command == ["handler", "--run", '{"a": 1}']
+
+
+def test_container_pool_keeps_image_entrypoint():
+    with patch("rpdk.core.serve.docker", autospec=True) as mock_docker:
+        mock_client = mock_docker.from_env.return_value
+        mock_client.images.get.return_value.attrs = {
+            "Config": {"Entrypoint": ["java", "-cp", "handler.jar"]}
+        }
+        mock_container = mock_client.containers.run.return_value
+        mock_container.exec_run.return_value = (
+            0,
+            b'__CFN_RESOURCE_START_RESPONSE__{"status": "SUCCESS"}'
+            b"__CFN_RESOURCE_END_RESPONSE__",
+        )
+        backend = create_backend(_args(docker_image="image"), _project(runtime="java8"))
+        assert backend.invoke({"a": 1}) == {"status": "SUCCESS"}
+        backend.close()
+
+    mock_client.images.get.assert_called_once_with("image")
+    # containers idle without the image entrypoint, each exec restores it
+    assert mock_client.containers.run.call_args[1]["entrypoint"] == ["sleep"]
+    command = mock_container.exec_run.call_args[0][0]
+    assert command == ["java", "-cp", "handler.jar", "handler", "--run", '{"a": 1}']
+
+
+def test_serve_command():
+    mock_project = _project()
+    patch_project = patch(
+        "rpdk.core.serve.Project", autospec=True, return_value=mock_project
+    )
+    patch_backend = patch("rpdk.core.serve.create_backend", autospec=True)
+    patch_server = patch("rpdk.core.serve.LambdaInvokeServer", autospec=True)
+    with patch_project, patch_backend as mock_backend, patch_server as mock_server:
+        mock_server.return_value.server_address = ("127.0.0.1", 3001)
+        mock_server.return_value.serve_forever.side_effect = KeyboardInterrupt
+        main(args_in=["serve", "--workers", "8"])
+
+    mock_server.assert_called_once_with(
+        ("127.0.0.1", 3001),
+        mock_backend.return_value,
+        DEFAULT_FUNCTION,
+        8,
+        240,
+    )
+    mock_server.return_value.server_close.assert_called_once_with()
+    mock_backend.return_value.close.assert_called_once_with()
+
+
+def test_serve_command_module_project():
+    mock_project = _project(ARTIFACT_TYPE_MODULE)
+    patch_project = patch(
+        "rpdk.core.serve.Project", autospec=True, return_value=mock_project
+    )
+    with patch_project, patch("rpdk.core.serve.create_backend") as mock_backend:
+        main(args_in=["serve"])
+
+    mock_backend.assert_not_called()
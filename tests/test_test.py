@@ -9,7 +9,10 @@ from unittest.mock import Mock, patch
 import pytest
 
 from rpdk.core.cli import EXIT_UNHANDLED_EXCEPTION, main
+from rpdk.core.contract.example_corpus import CORPUS_DIRECTORY
+from rpdk.core.contract.generation_stats import GenerationStats
 from rpdk.core.contract.interface import Action, HookInvocationPoint
+from rpdk.core.contract.target_examples import TARGET_EXAMPLES_DIRECTORY
 from rpdk.core.exceptions import SysExitRecommendedError
 from rpdk.core.project import (
     ARTIFACT_TYPE_HOOK,
@@ -26,10 +29,13 @@ from rpdk.core.test import (
     _validate_sam_args,
     empty_hook_override,
     empty_override,
+    get_corpus,
+    get_generation_stats,
     get_hook_overrides,
     get_inputs,
     get_marker_options,
     get_overrides,
+    get_target_example_cache,
     get_type,
     temporary_ini_file,
 )
@@ -272,6 +278,13 @@ def test_test_command_happy_path_resource(
         executable_entrypoint=None,
         docker_image=None,
         profile=profile,
+        max_callback_delay=None,
+        cassette=None,
+        local_handler=None,
+        seed=None,
+        coverage_candidates=None,
+        generation_stats=None,
+        corpus=None,
     )
     mock_plugin.assert_called_once_with(
         {"resource_client": mock_resource_client.return_value}
@@ -382,6 +395,13 @@ def test_test_command_happy_path_hook(
         docker_image=None,
         target_info=HOOK_TARGET_INFO,
         profile=profile,
+        max_callback_delay=None,
+        cassette=None,
+        local_handler=None,
+        seed=None,
+        generation_stats=None,
+        target_example_cache=None,
+        target_sample=None,
     )
     mock_plugin.assert_called_once_with({"hook_client": mock_hook_client.return_value})
     mock_ini.assert_called_once_with()
@@ -394,6 +414,55 @@ def test_test_command_happy_path_hook(
     assert not err
 
 
+@pytest.mark.parametrize(
+    "args_in,target_sample",
+    [([], None), (["--target-sample", "3"], 3), (["--full"], None)],
+)
+def test_test_command_hook_target_sample(base, args_in, target_sample):
+    mock_project = Mock(spec=Project)
+    mock_project.schema = HOOK_SCHEMA
+    mock_project.root = base
+    mock_project.artifact_type = ARTIFACT_TYPE_HOOK
+    mock_project.executable_entrypoint = None
+    mock_project._load_target_info.return_value = HOOK_TARGET_INFO
+
+    patch_project = patch(
+        "rpdk.core.test.Project", autospec=True, return_value=mock_project
+    )
+    patch_plugin = patch("rpdk.core.test.ContractPlugin", autospec=True)
+    patch_hook_client = patch("rpdk.core.test.HookClient", autospec=True)
+    patch_pytest = patch("rpdk.core.test.pytest.main", autospec=True, return_value=0)
+    patch_ini = patch(
+        "rpdk.core.test.temporary_ini_file", side_effect=mock_temporary_ini_file
+    )
+    # fmt: off
+    with patch_project, \
+            patch_plugin, \
+            patch_hook_client as mock_hook_client, \
+            patch_pytest, \
+            patch_ini:
+        main(args_in=["test"] + args_in)
+    # fmt: on
+
+    assert mock_hook_client.call_args.kwargs["target_sample"] == target_sample
+
+
+def test_test_command_target_sample_and_full_are_exclusive(capsys):
+    with pytest.raises(SystemExit):
+        main(args_in=["test", "--target-sample", "3", "--full"])
+    _out, err = capsys.readouterr()
+    assert "not allowed with argument" in err
+
+
+@pytest.mark.parametrize("option", ["--coverage-candidates", "--target-sample"])
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_test_command_rejects_counts_below_one(capsys, option, value):
+    with pytest.raises(SystemExit):
+        main(args_in=["test", option, value])
+    _out, err = capsys.readouterr()
+    assert "must be at least 1" in err
+
+
 def test_test_command_return_code_on_error():
     mock_project = Mock(spec=Project)
 
@@ -441,6 +510,34 @@ def test_temporary_ini_file():
             pass
 
 
+def test_get_corpus(tmp_path):
+    project = Mock(root=tmp_path, schema={})
+    assert get_corpus(Mock(corpus=False), project) is None
+    corpus = get_corpus(Mock(corpus=True), project)
+    assert corpus.path.parent == tmp_path / CORPUS_DIRECTORY
+
+
+def test_get_target_example_cache(tmp_path):
+    project = Mock(root=tmp_path)
+    args = Mock(target_example_cache=False, seed=1)
+    assert get_target_example_cache(args, project) is None
+    args = Mock(target_example_cache=True, seed=1)
+    cache = get_target_example_cache(args, project)
+    assert cache.directory == tmp_path / TARGET_EXAMPLES_DIRECTORY
+
+
+def test_get_target_example_cache_without_seed(tmp_path, caplog):
+    args = Mock(target_example_cache=True, seed=None)
+    assert get_target_example_cache(args, Mock(root=tmp_path)) is None
+    assert "requires --seed" in caplog.text
+
+
+@pytest.mark.parametrize("verbose,measured", [(0, False), (1, True)])
+def test_get_generation_stats(verbose, measured):
+    args = Mock(spec_set=["verbose"], verbose=verbose)
+    assert isinstance(get_generation_stats(args), GenerationStats) is measured
+
+
 def test_get_overrides_no_root():
     assert (
         get_overrides(None, DEFAULT_REGION, "", None, DEFAULT_PROFILE, None)
@@ -722,6 +819,16 @@ def test_use_both_sam_and_docker_arguments():
         )
 
 
+def test_use_both_docker_and_local_transport():
+    args = Mock(spec_set=["docker_image", "endpoint", "function_name", "transport"])
+    args.docker_image = "image"
+    args.endpoint = DEFAULT_ENDPOINT
+    args.function_name = DEFAULT_FUNCTION
+    args.transport = "in-process"
+    with pytest.raises(SysExitRecommendedError):
+        _validate_sam_args(args)
+
+
 # Security Tests - Aligned with Aristotle Recommendation #95
 # "Build integration and unit tests for security"
 # These tests verify security controls are working as expected